@@ -173,12 +173,18 @@ def fetch_history(symbol):
     base = api_base()
     to_date = datetime.now().strftime("%Y-%m-%d")
     from_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-    url = f"{base}/yahoo-finance-historical?ticker={symbol}&from={from_date}&to={to_date}&interval=1d"
-    data = http_get_json(url, timeout=45)
-    if isinstance(data, dict):
-        quotes = data.get("quotes") or data.get("prices") or []
-    else:
-        quotes = data or []
+    from options_wheel.bar_store import DailyBarStore, quotes_from_payload
+
+    def fetch(fetch_from, fetch_to):
+        url = f"{base}/yahoo-finance-historical?ticker={symbol}&from={fetch_from}&to={fetch_to}&interval=1d"
+        return quotes_from_payload(http_get_json(url, timeout=45))
+
+    # Closed bars are shared with the screener's local store; only new ones are downloaded.
+    store = DailyBarStore()
+    try:
+        quotes = store.load(symbol, from_date, to_date, fetch)
+    finally:
+        store.close()
     if len(quotes) < 50:
         raise RuntimeError(f"Insufficient historical data for {symbol}: {len(quotes)} bars")
     return quotes
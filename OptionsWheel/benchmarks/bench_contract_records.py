@@ -0,0 +1,112 @@
+"""Memory held by scan rows: ContractRecord vs the 50-key dicts it replaced.
+
+A full-universe scan keeps every first-pass survivor until Phase 4. This
+builds ``--symbols * --rows`` rows both ways with the same field values,
+filling the second-pass fields afterwards like ``_second_pass`` does, and
+reports the traced allocation.
+
+    python benchmarks/bench_contract_records.py [--symbols 4000] [--rows 25]
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from options_wheel.records import CONTRACT_FIELDS, ContractRecord  # noqa: E402
+
+# Filled in by the second pass; the dict rows gained five of them as new keys.
+SECOND_PASS = (
+    "ema50", "adx", "rsi", "rvi", "macd", "signal", "diff_pct", "forecast_vol", "vrp_ratio",
+    "sigma_distance", "credit_risk_ratio", "pop", "ev", "expected_assignment_loss", "score",
+    "iv_hv_percentile", "atm_implied_volatility", "iv_rank", "iv_percentile",
+    "iv_rank_observation_count",
+)
+APPENDED = (
+    "IVHVPercentile", "ATMImpliedVolatility", "IVRank", "IVPercentile", "IVRankObservationCount",
+)
+_KEY = dict((attr, key) for key, attr in CONTRACT_FIELDS)
+
+
+def first_pass_values(rng, symbol):
+    strike = round(rng.uniform(5, 400), 2)
+    return {
+        "symbol": symbol,
+        "name": f"{symbol} Inc.",
+        "price": round(strike * 1.1, 2),
+        "status": "NEAR",
+        "failed_criterion": "Delta",
+        "strike": strike,
+        "expiration": "2026-11-20",
+        "earnings_before_expiry": False,
+        "dte": rng.randint(20, 60),
+        "premium": round(rng.uniform(0.1, 5), 2),
+        "net_premium": round(rng.uniform(0.1, 5), 2),
+        "bid": round(rng.uniform(0.1, 5), 2),
+        "ask": round(rng.uniform(0.1, 5), 2),
+        "spread_abs": round(rng.uniform(0, 0.3), 2),
+        "spread_pct": round(rng.uniform(0, 10), 2),
+        "monthly_yield_pct": round(rng.uniform(0, 4), 2),
+        "annualized_yield_pct": round(rng.uniform(0, 50), 2),
+        "otm_pct": round(rng.uniform(0, 20), 2),
+        "open_interest": rng.randint(0, 5000),
+        "volume": rng.randint(0, 500),
+        "delta": round(rng.uniform(-0.4, 0), 3),
+        "implied_volatility": round(rng.uniform(0.2, 1), 3),
+    }
+
+
+def second_pass_values(rng):
+    return {attr: round(rng.uniform(0, 100), 2) for attr in SECOND_PASS}
+
+
+def as_record(first, second):
+    row = ContractRecord(**first)
+    for attr, value in second.items():
+        setattr(row, attr, value)
+    return row
+
+
+def as_dict(first, second):
+    row = {key: first.get(attr) for key, attr in CONTRACT_FIELDS if key not in APPENDED}
+    row["PricingSource"] = "mid"
+    row["Score"] = 0.0
+    for attr, value in second.items():
+        row[_KEY[attr]] = value
+    return row
+
+
+def measure(build, symbols, rows):
+    rng = random.Random(7)
+    tracemalloc.start()
+    held = [
+        build(first_pass_values(rng, f"S{s:04d}"), second_pass_values(rng))
+        for s in range(symbols)
+        for _ in range(rows)
+    ]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=4000)
+    parser.add_argument("--rows", type=int, default=25, help="first-pass survivors per symbol")
+    args = parser.parse_args()
+    count = args.symbols * args.rows
+
+    records, record_bytes = measure(as_record, args.symbols, args.rows)
+    dicts, dict_bytes = measure(as_dict, args.symbols, args.rows)
+    assert all(record == row for record, row in zip(records, dicts))
+
+    print(f"{count:,} rows ({args.symbols} symbols x {args.rows})")
+    print(f"  dict rows      : {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / count:6.0f} B/row)")
+    print(f"  ContractRecord : {record_bytes / 2**20:8.1f} MiB ({record_bytes / count:6.0f} B/row)")
+    print(f"  saved          : {(1 - record_bytes / dict_bytes) * 100:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Indicator engine vs the pandas pipeline it replaced.
+
+    python benchmarks/bench_indicators.py [--bars 252] [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from options_wheel import analysis  # noqa: E402
+from options_wheel.indicators import compute_indicators  # noqa: E402
+
+
+def pandas_indicators(high, low, close):
+    df = pd.DataFrame({"high": high, "low": low, "close": close})
+    close = df["close"]
+    macd_line, signal_line = analysis.calculate_macd(close)
+    log_returns = np.log(close / close.shift(1)).dropna()
+    return {
+        "ema50": analysis.calculate_ema(close, 50).iloc[-1],
+        "rsi": analysis.calculate_rsi(close, 14).iloc[-1],
+        "adx": analysis.calculate_adx(df, 14).iloc[-1],
+        "rvi": analysis.calculate_rvi(close).iloc[-1],
+        "macd": macd_line.iloc[-1],
+        "signal": signal_line.iloc[-1],
+        "hv_current": log_returns[-20:].std() * np.sqrt(252),
+        "hv_long": log_returns[-60:].std() * np.sqrt(252),
+        "hv_high": log_returns.rolling(20).std().max() * np.sqrt(252),
+        "hv_low": log_returns.rolling(20).std().min() * np.sqrt(252),
+        "realized_drift": float(np.clip(log_returns.mean() * 252, -0.25, 0.25)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=252)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, args.bars)))
+    high = close * (1.0 + rng.uniform(0.0, 0.02, args.bars))
+    low = close * (1.0 - rng.uniform(0.0, 0.02, args.bars))
+
+    reference = pandas_indicators(high, low, close)
+    engine = compute_indicators(high, low, close)
+    worst = max(
+        abs(engine[key] - float(value)) / max(abs(float(value)), 1e-12)
+        for key, value in reference.items()
+    )
+
+    pandas_s = timeit.timeit(lambda: pandas_indicators(high, low, close), number=args.repeat)
+    engine_s = timeit.timeit(lambda: compute_indicators(high, low, close), number=args.repeat)
+    print(f"{args.bars} bars, {args.repeat} runs")
+    print(f"  pandas pipeline : {pandas_s / args.repeat * 1e3:8.3f} ms/symbol")
+    print(f"  numpy engine    : {engine_s / args.repeat * 1e3:8.3f} ms/symbol")
+    print(f"  speed-up        : {pandas_s / engine_s:8.1f}x")
+    print(f"  max rel. diff   : {worst:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""IV history load/save: the JSON store vs the columnar memory-mapped store.
+
+Writes ``--series`` synthetic series of ``--observations`` daily ATM IVs in
+both formats, then times a cold load, ranking ``--touched`` of the series (the
+columnar store reads only those) and saving after recording one new
+observation for each of them. Then, after recording the next day for every
+touched series, times ranking them with ``rank``, with ``rank_many`` and with
+the linear recount ``rank`` used to do (sort the series, scan the window).
+
+    python benchmarks/bench_iv_history.py [--series 4000] [--observations 400] [--touched 4000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from options_wheel.iv_history import (  # noqa: E402
+    ColumnarIVHistoryStore,
+    IVHistoryStore,
+    migrate_json,
+)
+
+
+def write_json_history(path, series, observations):
+    rng = np.random.default_rng(5)
+    start = date(2025, 1, 1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(observations)]
+    payload = {}
+    for i in range(series):
+        ivs = np.round(rng.uniform(0.1, 1.2) * np.exp(np.cumsum(rng.normal(0, 0.03, observations))), 4)
+        payload[f"S{i:05d}|put"] = dict(zip(dates, ivs.tolist()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), sort_keys=True)
+    return (start + timedelta(days=observations)).isoformat()
+
+
+def run(store_cls, path, symbols, next_date):
+    start = time.perf_counter()
+    store = store_cls(path).load()
+    loaded = time.perf_counter()
+    for symbol in symbols:
+        store.rank(symbol, 0.5)
+    ranked = time.perf_counter()
+    for symbol in symbols:
+        store.record(symbol, next_date, 0.5)
+    store.save()
+    saved = time.perf_counter()
+    if hasattr(store, "close"):
+        store.close()
+    return loaded - start, ranked - loaded, saved - ranked
+
+
+def linear_rank(store, symbol, current_iv):
+    if isinstance(store, ColumnarIVHistoryStore):
+        values = store._series[symbol][1][-store.lookback :].tolist()
+    else:
+        values = [iv for _, iv in sorted(store._data[symbol].items())[-store.lookback :]]
+    low, high = min(values), max(values)
+    iv_rank = max(0.0, min(1.0, (current_iv - low) / (high - low)))
+    return iv_rank, sum(1 for v in values if v < current_iv) / len(values), len(values)
+
+
+def warm_scan(store_cls, path, symbols, next_date):
+    store = store_cls(path).load()
+    store.rank_many({symbol: 0.5 for symbol in symbols})
+    day = date.fromisoformat(next_date)
+    timings = {"linear": [], "rank": [], "rank_many": []}
+    for label in timings:
+        for _ in range(3):
+            day += timedelta(days=1)
+            for symbol in symbols:
+                store.record(symbol, day.isoformat(), 0.5)
+            start = time.perf_counter()
+            if label == "rank_many":
+                store.rank_many({symbol: 0.55 for symbol in symbols})
+            elif label == "rank":
+                for symbol in symbols:
+                    store.rank(symbol, 0.55)
+            else:
+                for symbol in symbols:
+                    linear_rank(store, symbol, 0.55)
+            timings[label].append(time.perf_counter() - start)
+    return {label: statistics.median(times) * 1000.0 for label, times in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=4000)
+    parser.add_argument("--observations", type=int, default=400)
+    parser.add_argument("--touched", type=int, default=None, help="series ranked and recorded (default all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    touched = args.series if args.touched is None else min(args.touched, args.series)
+    symbols = [f"S{i:05d}|put" for i in range(0, args.series, max(args.series // max(touched, 1), 1))][:touched]
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "iv_history.json")
+        columnar_path = os.path.join(directory, "iv_history.ivh")
+        next_date = write_json_history(json_path, args.series, args.observations)
+        start = time.perf_counter()
+        migrate_json(json_path, columnar_path).close()
+        migrate_seconds = time.perf_counter() - start
+        print(f"{args.series} series x {args.observations} observations, {len(symbols)} touched")
+        print(f"  file size    : JSON {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f"columnar {os.path.getsize(columnar_path) / 1e6:.1f} MB (migration {migrate_seconds:.2f} s)")
+
+        pristine = {}
+        for path in (json_path, columnar_path):
+            with open(path, "rb") as f:
+                pristine[path] = f.read()
+        for label, store_cls, path in (
+            ("JSON", IVHistoryStore, json_path),
+            ("columnar", ColumnarIVHistoryStore, columnar_path),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                with open(path, "wb") as f:
+                    f.write(pristine[path])
+                timings.append(run(store_cls, path, symbols, next_date))
+            load, rank, save = (statistics.median(column) * 1000.0 for column in zip(*timings))
+            print(f"  {label:<9}    : load {load:8.1f} ms, rank {rank:8.1f} ms, record+save {save:8.1f} ms")
+            warm = warm_scan(store_cls, path, symbols, next_date)
+            print(f"  {'':<9}      warm rank: linear {warm['linear']:6.1f} ms, "
+                  f"rank {warm['rank']:6.1f} ms, rank_many {warm['rank_many']:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,30 +7,61 @@ import time
 import json
 import yaml
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 import math
+import multiprocessing
 import threading
 import random
 import argparse
+import asyncio
 import traceback
-
-from options_wheel.iv_history import IVHistoryStore, extract_atm_iv
+from urllib.parse import parse_qs, urlsplit
+
+from options_wheel.bar_store import DEFAULT_BAR_STORE_PATH, DailyBarStore, quotes_from_payload
+from options_wheel.cache import DEFAULT_CACHE_FILENAME, DEFAULT_MAX_BYTES, ResponseCache
+from options_wheel.checkpoint import DEFAULT_CHECKPOINT_DIR, ScanJournal, config_hash
+from options_wheel.indicator_store import (
+    DEFAULT_INDICATOR_STATE_PATH,
+    IndicatorStateStore,
+    continues,
+    sessions_missing,
+    split_suspected,
+)
+from options_wheel.indicators import IndicatorState, bar_arrays, compute_indicators, dated_bar_arrays
+from options_wheel.iv_history import extract_atm_iv, open_iv_history_store
 from options_wheel.metrics import (
     collateral_per_share,
     credit_risk_ratio,
-    expected_itm_payoff,
-    forecast_volatility,
-    max_monthly_yield_for_delta,
+    expected_itm_payoff_array,
+    implied_volatility_array,
     net_credit,
+    net_credit_array,
     option_delta,
-    probability_of_profit,
-    sigma_distance,
+    option_delta_array,
+    option_delta_range,
+    option_price_array,
+    probability_of_profit_array,
+    sigma_distance_array,
     simple_yields,
+    simple_yields_array,
     variance_risk_premium,
     years_to_expiration,
 )
 from options_wheel.outcomes import archive_scan
 from options_wheel.portfolio import build_portfolio, load_sector_map
+from options_wheel.ratelimit import TokenBucketLimiter
+from options_wheel.records import ContractRecord, as_dicts
+from options_wheel.shards import DEFAULT_SHARD_DIR, select_shard, shard_path, write_shard
+from options_wheel.singleflight import SingleFlight
+from options_wheel.stages import CpuTask, StageMetrics, run_staged, set_worker_collector
+from options_wheel.volatility import VolatilityProfile
+from options_wheel.yield_ceiling import YieldCeilingGrid
 
 MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
@@ -41,6 +72,8 @@ DATA_HISTORY_DIR = os.path.join(PROJECT_ROOT, "data", "history")
 
 
 def convert_numpy_types(obj):
+    if isinstance(obj, ContractRecord):
+        obj = obj.to_dict()
     if isinstance(obj, dict):
         return {k: convert_numpy_types(v) for k, v in obj.items()}
     elif isinstance(obj, list):
@@ -83,6 +116,15 @@ OPTIONS_URL = os.environ.get(
 
 SLEEP_TIME = 0.0
 MAX_WORKERS = 4
+# Quote batches a streaming scan keeps in flight; the next one starts as one
+# lands, so the analyses a batch unlocks do not queue behind the whole screen.
+QUOTE_BATCHES_IN_FLIGHT = 2
+# Symbol pipelines kept in flight by the asyncio engine (``--engine async``).
+ASYNC_CONCURRENCY = 128
+# CPU stage of the staged engine (``--engine staged``): worker processes (0 runs
+# the stage on one in-process thread) and the bound of its task queue.
+CPU_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+CPU_QUEUE_SIZE = 32
 REQUEST_TIMEOUT = 15
 MAX_RETRIES = 3
 OPTIONS_REQUEST_TIMEOUT = 25
@@ -91,42 +133,138 @@ DEBUG = False
 
 # Caching
 CACHE_DIR = os.environ.get("OPTIONS_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+CACHE_PATH = os.environ.get(
+    "OPTIONS_CACHE_PATH", os.path.join(CACHE_DIR, DEFAULT_CACHE_FILENAME)
+)
+# Master switch (<= 0 disables the cache) and TTL for endpoints without a policy.
 CACHE_TTL_SECONDS = float(os.environ.get("OPTIONS_CACHE_TTL", 3600))  # 1 hours default
+# Quotes go stale in seconds and chains in minutes, while a daily-bar range that
+# ends before today never changes again. A range ending today still carries the
+# live bar, but intraday drift of one bar barely moves the indicators.
+CACHE_TTL_BY_ENDPOINT = {
+    "quotes": float(os.environ.get("OPTIONS_CACHE_TTL_QUOTES", 60)),
+    "options": float(os.environ.get("OPTIONS_CACHE_TTL_OPTIONS", 15 * 60)),
+    "history": float(os.environ.get("OPTIONS_CACHE_TTL_HISTORY", 4 * 3600)),
+}
+CACHE_TTL_HISTORY_CLOSED = float(
+    os.environ.get("OPTIONS_CACHE_TTL_HISTORY_CLOSED", 7 * 24 * 3600)
+)
+# Client errors and empty chains from delisted or unsupported tickers are
+# remembered this long so they stop costing a request slot on every run.
+CACHE_TTL_NEGATIVE = float(os.environ.get("OPTIONS_CACHE_TTL_NEGATIVE", 24 * 3600))
+# A symbol is only left out of quote batches after it is missing from two
+# batch responses in a row; the first miss is remembered this long so the
+# next scan (even after a weekend) can confirm it.
+QUOTE_MISS_TTL = 4 * CACHE_TTL_NEGATIVE
+# Statuses that mean "this symbol does not exist here" rather than a transient
+# or account-wide problem (401/403 must not blacklist every ticker).
+NEGATIVE_CACHE_STATUSES = {400, 404, 410, 422}
+CACHE_MAX_BYTES = DEFAULT_MAX_BYTES  # OPTIONS_CACHE_MAX_BYTES, 256 MiB default
+# Set by ``--type both``: cache reads accept any response fetched since this
+# timestamp, so the second option type reuses the first one's downloads even
+# when the run outlasts the per-endpoint TTLs.
+CACHE_PINNED_SINCE = None
+# ``url -> payload`` of a pinned run whose responses the cache does not keep
+# (its TTL is disabled), so the second option type still shares them.
+PINNED_PAYLOADS = {}
+RESPONSE_CACHE = ResponseCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES)
+
+
+def _cache_endpoint(url):
+    base = url.split("?", 1)[0]
+    if base == OPTIONS_URL:
+        return "options"
+    if base == HIST_URL:
+        return "history"
+    if base == BASE_URL:
+        return "quotes"
+    return "other"
+
+
+def _history_range_closed(url, today=None):
+    """True when a history URL asks for bars that all end before today."""
+    query = parse_qs(urlsplit(url).query)
+    to_date = (query.get("to") or [None])[0]
+    if not to_date:
+        return False
+    today = today or datetime.now().strftime("%Y-%m-%d")
+    return to_date[:10] < today
 
 
-def _get_cache_path(url):
-    import hashlib
-
-    safe = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
-    return os.path.join(CACHE_DIR, f"{safe}.json")
+def _cache_ttl(url):
+    if CACHE_TTL_SECONDS <= 0:
+        return 0.0
+    endpoint = _cache_endpoint(url)
+    if endpoint == "history" and _history_range_closed(url):
+        return CACHE_TTL_HISTORY_CLOSED
+    return CACHE_TTL_BY_ENDPOINT.get(endpoint, CACHE_TTL_SECONDS)
 
 
 def _read_cache(url):
-    if CACHE_TTL_SECONDS <= 0:
+    ttl = _cache_ttl(url)
+    if CACHE_PINNED_SINCE is not None:
+        if ttl <= 0:
+            return PINNED_PAYLOADS.get(url)
+        # Anything fetched during this run stays valid for the rest of it.
+        ttl = max(ttl, time.time() - CACHE_PINNED_SINCE)
+    elif ttl <= 0:
         return None
-    path = _get_cache_path(url)
     try:
-        if not os.path.exists(path):
-            return None
-        mtime = os.path.getmtime(path)
-        if time.time() - mtime > CACHE_TTL_SECONDS:
-            return None
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+        return RESPONSE_CACHE.get(url, max_age=ttl)
+    except Exception as e:
+        debug_log(f"Cache read failed for {url}: {e}")
         return None
 
 
 def _write_cache(url, data):
-    if CACHE_TTL_SECONDS <= 0:
+    ttl = _cache_ttl(url)
+    if ttl <= 0:
+        if CACHE_PINNED_SINCE is not None:
+            PINNED_PAYLOADS[url] = data
         return
     try:
-        os.makedirs(CACHE_DIR, exist_ok=True)
-        path = _get_cache_path(url)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f)
-    except Exception:
-        pass
+        RESPONSE_CACHE.put(url, data, endpoint=_cache_endpoint(url), ttl=ttl)
+    except Exception as e:
+        debug_log(f"Cache write failed for {url}: {e}")
+
+
+def _read_negative(key):
+    if CACHE_TTL_SECONDS <= 0 or CACHE_TTL_NEGATIVE <= 0:
+        return None
+    try:
+        return RESPONSE_CACHE.get_negative(key)
+    except Exception as e:
+        debug_log(f"Negative cache read failed for {key}: {e}")
+        return None
+
+
+def _write_negative(key, reason, ttl=None):
+    if CACHE_TTL_SECONDS <= 0 or CACHE_TTL_NEGATIVE <= 0:
+        return
+    try:
+        RESPONSE_CACHE.put_negative(key, reason, ttl=CACHE_TTL_NEGATIVE if ttl is None else ttl)
+    except Exception as e:
+        debug_log(f"Negative cache write failed for {key}: {e}")
+
+
+def _forget_negative(keys):
+    if CACHE_TTL_SECONDS <= 0 or CACHE_TTL_NEGATIVE <= 0:
+        return
+    try:
+        RESPONSE_CACHE.forget_negative(keys)
+    except Exception as e:
+        debug_log(f"Negative cache delete failed: {e}")
+
+
+def _skip_negative(key):
+    """True (and counted as an avoided request) when ``key`` recently failed."""
+    reason = _read_negative(key)
+    if reason is None:
+        return False
+    _bump_error_stat("negative_cache_skips")
+    debug_log(f"NEGATIVE CACHE HIT ({reason}): {key}")
+    return True
+
 
 DEFAULT_SCREENING_CONFIG = {
     "MAX_PRICE": 120.0,
@@ -143,6 +281,8 @@ DEFAULT_SCREENING_CONFIG = {
     "MAX_SPREAD_PCT": 10.0,
     "MIN_ABS_DELTA": 0.0,
     "MAX_ABS_DELTA": 0.11,
+    "STRIKE_WINDOW_IV_MULTIPLE": 3.0,
+    "SOLVE_STALE_IV": True,
     "MAX_EXPIRATIONS_PER_SYMBOL": 3,
     "MAX_CONTRACTS_PER_SYMBOL": 3,
     "OPTIONS_REQUEST_TIMEOUT": 25,
@@ -272,6 +412,8 @@ def validate_screening_config(cfg):
         errors.append("MAX_ABS_DELTA must be in [0, 1].")
     if cfg["MAX_ABS_DELTA"] < cfg["MIN_ABS_DELTA"]:
         errors.append("MAX_ABS_DELTA must be >= MIN_ABS_DELTA.")
+    if cfg["STRIKE_WINDOW_IV_MULTIPLE"] != 0 and not 1 <= cfg["STRIKE_WINDOW_IV_MULTIPLE"] <= 20:
+        errors.append("STRIKE_WINDOW_IV_MULTIPLE must be 0 (off) or in [1, 20].")
 
     if cfg["MAX_EXPIRATIONS_PER_SYMBOL"] < 1 or cfg["MAX_EXPIRATIONS_PER_SYMBOL"] > 24:
         errors.append("MAX_EXPIRATIONS_PER_SYMBOL must be in [1, 24].")
@@ -305,6 +447,8 @@ def validate_screening_config(cfg):
 
     if not isinstance(cfg["EXCLUDE_EARNINGS_BEFORE_EXPIRY"], bool):
         errors.append("EXCLUDE_EARNINGS_BEFORE_EXPIRY must be true/false.")
+    if not isinstance(cfg["SOLVE_STALE_IV"], bool):
+        errors.append("SOLVE_STALE_IV must be true/false.")
 
     if cfg["FORECAST_HV_WEIGHT"] < 0 or cfg["FORECAST_HV_WEIGHT"] > 1:
         errors.append("FORECAST_HV_WEIGHT must be in [0, 1].")
@@ -342,6 +486,7 @@ def init_screening_config(option_type="put"):
     global TARGET_MONTHLY_YIELD_PCT, PRICE_LIMIT, MIN_STOCK_AVG_VOLUME, MIN_MARKET_CAP
     global EXCLUDE_EARNINGS_BEFORE_EXPIRY, MIN_PREMIUM, MIN_DTE, MAX_DTE, MIN_OTM_PCT
     global MIN_OPEN_INTEREST, MIN_VOLUME, MAX_SPREAD_PCT, MIN_ABS_DELTA, MAX_ABS_DELTA
+    global STRIKE_WINDOW_IV_MULTIPLE, SOLVE_STALE_IV
     global MAX_EXPIRATIONS_PER_SYMBOL, MAX_CONTRACTS_PER_SYMBOL
     global OPTIONS_REQUEST_TIMEOUT, OPTIONS_MAX_RETRIES
     global COMMISSION_PER_CONTRACT, SLIPPAGE_PCT_OF_SPREAD, MAX_SPREAD_ABS
@@ -370,6 +515,8 @@ def init_screening_config(option_type="put"):
     MAX_SPREAD_PCT = SCREENING_CONFIG["MAX_SPREAD_PCT"]
     MIN_ABS_DELTA = SCREENING_CONFIG["MIN_ABS_DELTA"]
     MAX_ABS_DELTA = SCREENING_CONFIG["MAX_ABS_DELTA"]
+    STRIKE_WINDOW_IV_MULTIPLE = SCREENING_CONFIG["STRIKE_WINDOW_IV_MULTIPLE"]
+    SOLVE_STALE_IV = SCREENING_CONFIG["SOLVE_STALE_IV"]
     MAX_EXPIRATIONS_PER_SYMBOL = SCREENING_CONFIG["MAX_EXPIRATIONS_PER_SYMBOL"]
     MAX_CONTRACTS_PER_SYMBOL = SCREENING_CONFIG["MAX_CONTRACTS_PER_SYMBOL"]
     OPTIONS_REQUEST_TIMEOUT = SCREENING_CONFIG["OPTIONS_REQUEST_TIMEOUT"]
@@ -401,14 +548,43 @@ def init_screening_config(option_type="put"):
 init_screening_config("put")
 
 IV_HISTORY_PATH = os.path.join(DATA_HISTORY_DIR, "iv_history.json")
-IV_HISTORY_STORE = IVHistoryStore(IV_HISTORY_PATH).load()
+# Used instead of the JSON file once ``python -m options_wheel.iv_history
+# migrate`` has written it.
+IV_HISTORY_COLUMNAR_PATH = os.path.join(DATA_HISTORY_DIR, "iv_history.ivh")
+IV_HISTORY_STORE = open_iv_history_store(IV_HISTORY_PATH, IV_HISTORY_COLUMNAR_PATH)
+BAR_STORE = DailyBarStore(DEFAULT_BAR_STORE_PATH)
+INDICATOR_STATES = IndicatorStateStore(DEFAULT_INDICATOR_STATE_PATH)
 CURRENT_SCAN_DATE = None
+# Set by ``--type both``: option chains are requested without the puts/calls
+# filter (and with this many expirations) so both scans share one download.
+SHARED_CHAIN_EXPIRATIONS = None
+# ``(index, count)`` when main runs one shard of the ticker universe.
+SHARD = None
+SHARD_DIR = DEFAULT_SHARD_DIR
+# Checkpoint journal of the option-type scan in progress (set by main).
+CHECKPOINT_DIR = DEFAULT_CHECKPOINT_DIR
+SCAN_JOURNAL = None
+# Interpolated max_monthly_yield_for_delta grid, loaded from (or built into)
+# YIELD_CEILING_DIR on first use by _yield_ceiling.
+YIELD_CEILING_DIR = CACHE_DIR
+YIELD_CEILING = None
+_yield_ceiling_lock = threading.Lock()
+# A yield target this far above the plausible ceiling flags the screen as
+# over-constrained.
+YIELD_CEILING_MARGIN = 1.2
 
 _thread_local = threading.local()
-_rate_limit_lock = threading.Lock()
-_next_request_ts = 0.0
-_next_slot_ts = 0.0
-_min_request_interval = 0.35
+# One adaptive limiter per API endpoint, shared by worker threads and the
+# asyncio engine; a cooldown after a 429 on the option chains does not hold
+# up the quote batches. Every endpoint also draws from the host bucket, so
+# together they stay within the single budget the API host allows.
+HOST_RATE_LIMITER = TokenBucketLimiter("host")
+RATE_LIMITERS = {
+    endpoint: TokenBucketLimiter(endpoint, parent=HOST_RATE_LIMITER)
+    for endpoint in ("quotes", "options", "history", "other")
+}
+# Concurrent safe_get calls for the same URL share one network request.
+IN_FLIGHT = SingleFlight()
 _error_stats_lock = threading.Lock()
 _error_stats = {
     "rate_limited_429": 0,
@@ -421,7 +597,17 @@ _error_stats = {
     "symbol_analysis_exceptions": 0,
     "contracts_excluded_earnings": 0,
     "contracts_excluded_missing_quote": 0,
+    "contracts_pruned_strike_window": 0,
+    "implied_volatilities_solved": 0,
+    "symbols_above_yield_ceiling": 0,
+    "coalesced_requests": 0,
+    "negative_cache_skips": 0,
+    "negative_cache_symbols": 0,
+    "indicator_state_updates": 0,
+    "indicator_state_rebuilds": 0,
 }
+# Queue depth and per-stage latency of the staged engine.
+STAGE_METRICS = StageMetrics()
 
 
 def get_tickers(option_type="put"):
@@ -447,49 +633,8 @@ def get_session():
     return session
 
 
-def _wait_if_rate_limited():
-    global _next_request_ts
-    while True:
-        with _rate_limit_lock:
-            wait_for = _next_request_ts - time.time()
-        if wait_for <= 0:
-            return
-        time.sleep(min(wait_for, 0.25))
-
-
-def _acquire_request_slot():
-    global _next_slot_ts
-    with _rate_limit_lock:
-        now = time.time()
-        slot_ts = max(now, _next_slot_ts)
-        _next_slot_ts = slot_ts + _min_request_interval
-    wait_for = slot_ts - time.time()
-    if wait_for > 0:
-        time.sleep(wait_for)
-
-
-def _on_success():
-    global _min_request_interval
-    with _rate_limit_lock:
-        _min_request_interval = max(0.12, _min_request_interval * 0.98)
-
-
-def _on_rate_limited(retry_after):
-    global _min_request_interval
-    with _rate_limit_lock:
-        grown_interval = _min_request_interval * 1.4
-        floor_from_retry = max(0.25, retry_after)
-        _min_request_interval = min(5.0, max(grown_interval, floor_from_retry))
-
-
-def _set_global_cooldown(seconds):
-    global _next_request_ts, _next_slot_ts, _min_request_interval
-    seconds = max(0.0, float(seconds))
-    with _rate_limit_lock:
-        # Spread requests after cooldown to avoid herd retries.
-        _min_request_interval = max(_min_request_interval, min(5.0, seconds))
-        _next_request_ts = max(_next_request_ts, time.time() + seconds)
-        _next_slot_ts = max(_next_slot_ts, _next_request_ts)
+def _rate_limiter(url):
+    return RATE_LIMITERS[_cache_endpoint(url)]
 
 
 def _bump_error_stat(key, amount=1):
@@ -517,7 +662,14 @@ def print_error_summary():
             "Contracts excluded for missing two-sided quote",
             stats["contracts_excluded_missing_quote"],
         ),
+        ("Contracts pruned outside the strike window", stats["contracts_pruned_strike_window"]),
+        ("Missing or stale IVs solved from the mid", stats["implied_volatilities_solved"]),
+        (
+            "Symbols whose ATM IV cannot plausibly reach the yield target",
+            stats["symbols_above_yield_ceiling"],
+        ),
         ("Worker analysis exceptions", stats["symbol_analysis_exceptions"]),
+        ("Requests coalesced with an in-flight call", stats["coalesced_requests"]),
     ]
     non_zero_items = [(label, count) for label, count in ordered_items if count > 0]
 
@@ -530,156 +682,375 @@ def print_error_summary():
         print(f"- {label}: {count}")
 
 
+def print_cache_summary():
+    stats = RESPONSE_CACHE.run_stats()
+    print("\nCache Summary:")
+    if CACHE_TTL_SECONDS <= 0:
+        print("- Disabled (OPTIONS_CACHE_TTL <= 0)")
+        return
+    print(f"- Hits: {stats['hits']} | misses: {stats['misses']}")
+    raw = stats["raw_bytes_written"]
+    if raw > 0:
+        saved_pct = stats["bytes_saved"] / raw * 100.0
+        print(
+            f"- Stored {stats['writes']} payloads: {raw:,} -> "
+            f"{stats['stored_bytes_written']:,} bytes "
+            f"(saved {stats['bytes_saved']:,} bytes, {saved_pct:.1f}%)"
+        )
+    print(
+        f"- Evictions: {stats['evictions']} | expired entries purged: "
+        f"{stats['expired_purged']}"
+    )
+    errors = _snapshot_error_stats()
+    if errors["negative_cache_skips"] or errors["negative_cache_symbols"]:
+        print(
+            f"- Negative cache: {errors['negative_cache_skips']} requests avoided, "
+            f"{errors['negative_cache_symbols']} symbols left out of quote batches"
+        )
+    if errors["indicator_state_updates"] or errors["indicator_state_rebuilds"]:
+        print(
+            f"- Indicator state: {errors['indicator_state_updates']} symbols advanced by new bars, "
+            f"{errors['indicator_state_rebuilds']} rebuilt from full history"
+        )
+
+
+def print_stage_summary():
+    lines = STAGE_METRICS.summary_lines()
+    if not lines:
+        return
+    print("\nPipeline Stage Summary:")
+    for line in lines:
+        print(line)
+
+
+def print_rate_limit_summary():
+    print("\nRate Limiter Summary:")
+    used = [limiter.snapshot() for limiter in (*RATE_LIMITERS.values(), HOST_RATE_LIMITER)]
+    used = [stats for stats in used if stats["acquired"]]
+    if not used:
+        print("- No requests sent")
+        return
+    for stats in used:
+        avg_wait = stats["waited_seconds"] / stats["acquired"]
+        print(
+            f"- {stats['name']}: {stats['acquired']} requests | rate {stats['rate']:.2f}/s | "
+            f"avg wait {avg_wait:.2f}s | max queue {stats['max_queue_depth']} | "
+            f"rate-limited {stats['rate_limited']}"
+        )
+
+
+def _http_get(url, timeout):
+    return get_session().get(url, timeout=timeout)
+
+
+def _retry_after_seconds(response, default):
+    retry_after_raw = response.headers.get("Retry-After", str(default))
+    try:
+        return float(retry_after_raw)
+    except ValueError:
+        return float(default)
+
+
+def _classify_response(url, response, attempt, max_retries):
+    """Apply the status-code policy shared by ``safe_get`` and ``safe_get_async``.
+
+    Returns ``(action, value, last_error)``. ``action`` is ``"return"`` when the
+    caller must return ``value`` (the decoded payload, or ``None`` for a
+    non-retryable failure) and ``"retry"`` when it must back off ``value``
+    seconds before the next attempt. Cooldowns are applied here so both engines
+    share the same rate-limiter state.
+    """
+    if response.status_code == 429:
+        _bump_error_stat("rate_limited_429")
+        retry_after = _retry_after_seconds(response, 1.0)
+        retry_after += random.uniform(0.05, 0.25)
+        limiter = _rate_limiter(url)
+        limiter.on_rate_limited(retry_after)
+        print(f"Rate limited. Waiting {retry_after:.2f} seconds...")
+        debug_log(
+            f"HTTP 429 on attempt {attempt + 1}/{max_retries}; "
+            f"retry-after={retry_after:.2f}s; {limiter.name} rate={limiter.rate:.2f}/s"
+        )
+        limiter.pause(retry_after)
+        return "retry", 0.0, f"HTTP 429 (retry-after: {retry_after:.2f}s)"
+
+    if response.status_code >= 500:
+        _bump_error_stat("http_5xx")
+        body_snippet = _shorten_response_text(response.text)
+        if "Too Many Requests" in response.text:
+            # Edge/CDN rate-limit disguised as a 500 — treat like a 429.
+            _bump_error_stat("rate_limited_429")
+            retry_after = _retry_after_seconds(response, 5.0)
+            retry_after = max(retry_after, 5.0) + random.uniform(0.5, 2.0)
+            limiter = _rate_limiter(url)
+            limiter.on_rate_limited(retry_after)
+            limiter.pause(retry_after)
+            print(f"Edge rate-limited (HTTP 500). Waiting {retry_after:.2f} seconds...")
+            debug_log(
+                f"HTTP 500 'Too Many Requests' on attempt {attempt + 1}/{max_retries}; "
+                f"retry-after={retry_after:.2f}s; body={body_snippet}"
+            )
+            return (
+                "retry",
+                retry_after,
+                f"HTTP 500 Edge rate-limited (retry-after: {retry_after:.2f}s)",
+            )
+
+        backoff = min(0.52 * (2**attempt), 5.0)
+        debug_log(
+            f"HTTP {response.status_code} on attempt {attempt + 1}/{max_retries}; "
+            f"backoff={backoff:.2f}s; body={body_snippet}"
+        )
+        _rate_limiter(url).pause(backoff)
+        return "retry", backoff, f"HTTP {response.status_code}: {body_snippet}"
+
+    # Do not retry most client errors (invalid/unsupported symbol, bad request, etc.)
+    if response.status_code >= 400:
+        _bump_error_stat("http_4xx")
+        if response.status_code in NEGATIVE_CACHE_STATUSES:
+            _write_negative(url, f"HTTP {response.status_code}")
+        print(f"Skipping {url}: HTTP {response.status_code}")
+        debug_log(
+            f"HTTP {response.status_code} body: "
+            f"{_shorten_response_text(response.text)}"
+        )
+        return "return", None, None
+
+    response.raise_for_status()
+    _rate_limiter(url).on_success()
+    data = response.json()
+    _write_cache(url, data)
+    return "return", data, None
+
+
+def _classify_request_exception(url, error, attempt, max_retries):
+    """Exception counterpart of ``_classify_response``."""
+    _bump_error_stat("request_exceptions")
+    if attempt == max_retries - 1:
+        print(f"Error fetching {url}: {error}")
+        return "return", None, str(error)
+    backoff = min(0.35 * (2**attempt), 8.0) + random.uniform(0.05, 0.4)
+    debug_log(
+        f"Request exception on attempt {attempt + 1}/{max_retries}: {error}; "
+        f"backoff={backoff:.2f}s"
+    )
+    _rate_limiter(url).pause(backoff)
+    return "retry", backoff, str(error)
+
+
+def _on_max_retries_exceeded(url, last_error):
+    _bump_error_stat("max_retries_exceeded")
+    print(f"Error fetching {url}: max retries exceeded ({last_error})")
+
+
 def safe_get(url, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES):
+    if _skip_negative(url):
+        return None
     cached = _read_cache(url)
     if cached is not None:
         debug_log(f"CACHE HIT: {url}")
         return cached
 
+    data, shared = IN_FLIGHT.do(url, lambda: _fetch(url, timeout, max_retries))
+    if shared:
+        _bump_error_stat("coalesced_requests")
+        debug_log(f"COALESCED: {url}")
+    return data
+
+
+def _fetch(url, timeout, max_retries):
     last_error = None
     for attempt in range(max_retries):
         debug_log(f"GET attempt {attempt + 1}/{max_retries}: {url}")
-        _wait_if_rate_limited()
-        _acquire_request_slot()
+        _rate_limiter(url).acquire()
         try:
-            response = get_session().get(url, timeout=timeout)
-            if response.status_code == 429:
-                _bump_error_stat("rate_limited_429")
-                retry_after_raw = response.headers.get("Retry-After", "1")
-                try:
-                    retry_after = float(retry_after_raw)
-                except ValueError:
-                    retry_after = 1.0
-                retry_after += random.uniform(0.05, 0.25)
-                _on_rate_limited(retry_after)
-                print(f"Rate limited. Waiting {retry_after:.2f} seconds...")
-                debug_log(
-                    f"HTTP 429 on attempt {attempt + 1}/{max_retries}; "
-                    f"retry-after={retry_after:.2f}s"
-                )
-                _set_global_cooldown(retry_after)
-                last_error = f"HTTP 429 (retry-after: {retry_after:.2f}s)"
-                continue
+            response = _http_get(url, timeout)
+            action, value, error = _classify_response(url, response, attempt, max_retries)
+        except requests.RequestException as e:
+            action, value, error = _classify_request_exception(url, e, attempt, max_retries)
+        if action == "return":
+            return value
+        last_error = error
+        if value > 0:
+            time.sleep(value)
+
+    _on_max_retries_exceeded(url, last_error)
+    return None
 
-            if response.status_code >= 500:
-                _bump_error_stat("http_5xx")
-                body_snippet = _shorten_response_text(response.text)
-                if "Too Many Requests" in response.text:
-                    # Edge/CDN rate-limit disguised as a 500 — treat like a 429.
-                    _bump_error_stat("rate_limited_429")
-                    retry_after_raw = response.headers.get("Retry-After", "5")
-                    try:
-                        retry_after = float(retry_after_raw)
-                    except ValueError:
-                        retry_after = 5.0
-                    retry_after = max(retry_after, 5.0) + random.uniform(0.5, 2.0)
-                    _on_rate_limited(retry_after)
-                    _set_global_cooldown(retry_after)
-                    print(f"Edge rate-limited (HTTP 500). Waiting {retry_after:.2f} seconds...")
-                    debug_log(
-                        f"HTTP 500 'Too Many Requests' on attempt {attempt + 1}/{max_retries}; "
-                        f"retry-after={retry_after:.2f}s; body={body_snippet}"
-                    )
-                    last_error = f"HTTP 500 Edge rate-limited (retry-after: {retry_after:.2f}s)"
-                    time.sleep(retry_after)
-                else:
-                    backoff = min(0.52 * (2**attempt), 5.0)
-                    debug_log(
-                        f"HTTP {response.status_code} on attempt {attempt + 1}/{max_retries}; "
-                        f"backoff={backoff:.2f}s; body={body_snippet}"
-                    )
-                    _set_global_cooldown(backoff)
-                    last_error = f"HTTP {response.status_code}: {body_snippet}"
-                    time.sleep(backoff)
-                continue
 
-            # Do not retry most client errors (invalid/unsupported symbol, bad request, etc.)
-            if response.status_code >= 400:
-                _bump_error_stat("http_4xx")
-                print(f"Skipping {url}: HTTP {response.status_code}")
-                debug_log(
-                    f"HTTP {response.status_code} body: "
-                    f"{_shorten_response_text(response.text)}"
-                )
-                return None
-
-            response.raise_for_status()
-            _on_success()
-            data = response.json()
-            _write_cache(url, data)
-            return data
-        except requests.RequestException as e:
-            _bump_error_stat("request_exceptions")
-            last_error = str(e)
-            if attempt == max_retries - 1:
-                print(f"Error fetching {url}: {e}")
-                return None
-            backoff = min(0.35 * (2**attempt), 8.0) + random.uniform(0.05, 0.4)
-            debug_log(
-                f"Request exception on attempt {attempt + 1}/{max_retries}: {e}; "
-                f"backoff={backoff:.2f}s"
-            )
-            _set_global_cooldown(backoff)
-            time.sleep(backoff)
+async def safe_get_async(url, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES):
+    """``safe_get`` for the asyncio engine.
 
-    _bump_error_stat("max_retries_exceeded")
-    print(f"Error fetching {url}: max retries exceeded ({last_error})")
+    Rate-limit waits and backoffs are awaited, so a pipeline waiting for its
+    turn does not hold a thread; only the blocking ``requests`` call itself runs
+    in the loop's default executor.
+    """
+    if _skip_negative(url):
+        return None
+    cached = _read_cache(url)
+    if cached is not None:
+        debug_log(f"CACHE HIT: {url}")
+        return cached
+
+    data, shared = await IN_FLIGHT.do_async(
+        url, lambda: _fetch_async(url, timeout, max_retries)
+    )
+    if shared:
+        _bump_error_stat("coalesced_requests")
+        debug_log(f"COALESCED: {url}")
+    return data
+
+
+async def _fetch_async(url, timeout, max_retries):
+    loop = asyncio.get_running_loop()
+    last_error = None
+    for attempt in range(max_retries):
+        debug_log(f"GET attempt {attempt + 1}/{max_retries}: {url}")
+        await _rate_limiter(url).acquire_async()
+        try:
+            response = await loop.run_in_executor(None, _http_get, url, timeout)
+            action, value, error = _classify_response(url, response, attempt, max_retries)
+        except requests.RequestException as e:
+            action, value, error = _classify_request_exception(url, e, attempt, max_retries)
+        if action == "return":
+            return value
+        last_error = error
+        if value > 0:
+            await asyncio.sleep(value)
+
+    _on_max_retries_exceeded(url, last_error)
     return None
 
 
+def run_steps(steps):
+    """Drive a pipeline generator, answering each yielded request with ``safe_get``.
+
+    ``CpuTask`` steps are run inline.
+    """
+    try:
+        request = next(steps)
+        while True:
+            if isinstance(request, CpuTask):
+                request = steps.send(request.run())
+            else:
+                request = steps.send(safe_get(*request))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_steps_async(steps):
+    """Asyncio counterpart of ``run_steps``."""
+    try:
+        request = next(steps)
+        while True:
+            if isinstance(request, CpuTask):
+                request = steps.send(request.run())
+            else:
+                request = steps.send(await safe_get_async(*request))
+    except StopIteration as stop:
+        return stop.value
+
+
 def batch_price_filter(tickers):
+    return [quote for quote in fetch_quote_candidates(tickers) if _passes_price_filter(quote)]
+
+
+def _passes_price_filter(quote):
+    return (
+        quote["price"] < PRICE_LIMIT
+        and quote["averageDailyVolume3Month"] >= MIN_STOCK_AVG_VOLUME
+        and quote["marketCap"] >= MIN_MARKET_CAP
+    )
+
+
+def fetch_quote_candidates(tickers):
+    """Phase 1 quote records for every priced ticker, before the price/volume/
+    market-cap filter, so one quote download can serve both option types."""
     candidates = []
-    now_dt = datetime.now(timezone.utc)
-    for i in range(0, len(tickers), BATCH_SIZE):
-        batch = tickers[i : i + BATCH_SIZE]
-        symbols = ",".join(batch)
-        url = (
-            f"{BASE_URL}?symbols={symbols}&fields="
-            "symbol,shortName,regularMarketPrice,trailingPE,"
-            "averageDailyVolume3Month,marketCap,"
-            "trailingAnnualDividendYield,fiftyDayAverage,"
-            "earningsTimestamp,earningsTimestampStart,earningsTimestampEnd,"
-            "dividendDate,trailingAnnualDividendRate"
-        )
-        data = safe_get(url)
-        if data:
-            for item in data:
-                price = item.get("regularMarketPrice")
-                avg_volume_3m = int(
-                    _to_float(item.get("averageDailyVolume3Month")) or 0
-                )
-                market_cap = int(_to_float(item.get("marketCap")) or 0)
-                dividend_yield = _to_float(item.get("trailingAnnualDividendYield")) or 0.0
-                fifty_day_average = _to_float(item.get("fiftyDayAverage"))
-                next_earnings_dt = _extract_next_earnings_dt(item, now_dt)
-                ex_dividend_date_raw = item.get("dividendDate")
-                ex_dividend_date_dt = _parse_expiration(ex_dividend_date_raw)
-                trailing_annual_dividend_rate = _to_float(item.get("trailingAnnualDividendRate")) or 0.0
-                if (
-                    price is not None
-                    and price < PRICE_LIMIT
-                    and avg_volume_3m >= MIN_STOCK_AVG_VOLUME
-                    and market_cap >= MIN_MARKET_CAP
-                ):
-                    candidates.append(
-                        {
-                            "symbol": item["symbol"],
-                            "price": price,
-                            "name": item.get("shortName", ""),
-                            "averageDailyVolume3Month": avg_volume_3m,
-                            "marketCap": market_cap,
-                            "dividend_yield": dividend_yield,
-                            "fifty_day_average": fifty_day_average,
-                            "next_earnings_dt": next_earnings_dt,
-                            "ex_dividend_date_dt": ex_dividend_date_dt,
-                            "trailing_annual_dividend_rate": trailing_annual_dividend_rate,
-                        }
-                    )
+    for batch in _quote_batches(tickers):
+        candidates.extend(run_steps(_quote_batch_steps(batch)))
         if SLEEP_TIME > 0:
             time.sleep(SLEEP_TIME)
     return candidates
 
 
+def _quote_batches(tickers):
+    # Symbols the quote endpoint recently did not know about are left out, so
+    # the remaining ones fill fewer batches.
+    known = [ticker for ticker in tickers if _read_negative(f"quote:{ticker}") is None]
+    if len(known) < len(tickers):
+        _bump_error_stat("negative_cache_symbols", len(tickers) - len(known))
+        skipped_batches = -(-len(tickers) // BATCH_SIZE) - -(-len(known) // BATCH_SIZE)
+        if skipped_batches:
+            _bump_error_stat("negative_cache_skips", skipped_batches)
+    return [known[i : i + BATCH_SIZE] for i in range(0, len(known), BATCH_SIZE)]
+
+
+def _record_quote_misses(batch, returned):
+    """Negative-cache the symbols of ``batch`` missing from two responses in a row.
+
+    One truncated or partial response must not take valid names out of the
+    following scans, so a first miss is only remembered.
+    """
+    for ticker in batch:
+        if ticker in returned:
+            continue
+        if _read_negative(f"quote-miss:{ticker}") is None:
+            _write_negative(f"quote-miss:{ticker}", "missing from quote batch", ttl=QUOTE_MISS_TTL)
+        else:
+            _write_negative(f"quote:{ticker}", "missing from two quote batches in a row")
+    _forget_negative(f"quote-miss:{ticker}" for ticker in batch if ticker in returned)
+
+
+def _quote_batch_steps(batch):
+    """Pipeline generator for one Phase 1 quote batch (see ``_symbol_analysis_steps``)."""
+    symbols = ",".join(batch)
+    url = (
+        f"{BASE_URL}?symbols={symbols}&fields="
+        "symbol,shortName,regularMarketPrice,trailingPE,"
+        "averageDailyVolume3Month,marketCap,"
+        "trailingAnnualDividendYield,fiftyDayAverage,"
+        "earningsTimestamp,earningsTimestampStart,earningsTimestampEnd,"
+        "dividendDate,trailingAnnualDividendRate"
+    )
+    data = yield url, REQUEST_TIMEOUT, MAX_RETRIES
+    candidates = []
+    if not data:
+        return candidates
+    now_dt = datetime.now(timezone.utc)
+    _record_quote_misses(batch, {item.get("symbol") for item in data if isinstance(item, dict)})
+    for item in data:
+        price = item.get("regularMarketPrice")
+        avg_volume_3m = int(
+            _to_float(item.get("averageDailyVolume3Month")) or 0
+        )
+        market_cap = int(_to_float(item.get("marketCap")) or 0)
+        dividend_yield = _to_float(item.get("trailingAnnualDividendYield")) or 0.0
+        fifty_day_average = _to_float(item.get("fiftyDayAverage"))
+        next_earnings_dt = _extract_next_earnings_dt(item, now_dt)
+        ex_dividend_date_raw = item.get("dividendDate")
+        ex_dividend_date_dt = _parse_expiration(ex_dividend_date_raw)
+        trailing_annual_dividend_rate = _to_float(item.get("trailingAnnualDividendRate")) or 0.0
+        if price is not None:
+            candidates.append(
+                {
+                    "symbol": item["symbol"],
+                    "price": price,
+                    "name": item.get("shortName", ""),
+                    "averageDailyVolume3Month": avg_volume_3m,
+                    "marketCap": market_cap,
+                    "dividend_yield": dividend_yield,
+                    "fifty_day_average": fifty_day_average,
+                    "next_earnings_dt": next_earnings_dt,
+                    "ex_dividend_date_dt": ex_dividend_date_dt,
+                    "trailing_annual_dividend_rate": trailing_annual_dividend_rate,
+                }
+            )
+    return candidates
+
+
+# Series versions of the indicators. Scans use options_wheel.indicators; these
+# remain as the pandas reference it is tested and benchmarked against.
 def calculate_ema(series, span):
     return series.ewm(span=span, adjust=False).mean()
 
@@ -763,76 +1134,105 @@ def calculate_rvi(series, std_period=10, smooth_period=14):
 
 def fetch_historical_indicators(symbol):
     """Fetch historical prices and compute technical + realised-volatility data."""
-    from datetime import datetime, timedelta
+    return run_steps(_historical_indicator_steps(symbol))
 
-    to_date = datetime.now().strftime("%Y-%m-%d")
+
+def _historical_indicator_steps(symbol):
+    today = datetime.now().strftime("%Y-%m-%d")
     from_date = (datetime.now() - timedelta(days=HIST_DAYS)).strftime("%Y-%m-%d")
-    url = f"{HIST_URL}?ticker={symbol}&from={from_date}&to={to_date}&interval=1d"
-    data = safe_get(url, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES)
-    if not data:
-        return None
-    # API returns {"meta": ..., "quotes": [...], ...} or a flat list
-    if isinstance(data, dict):
-        data = data.get("quotes") or data.get("prices") or []
-    if not isinstance(data, list) or len(data) < 50:
+    state = INDICATOR_STATES.load(symbol)
+    if state is not None and state.last_date is not None and state.last_date >= from_date:
+        # Only the bars from the state's last one onwards are needed; that bar
+        # comes back first and must be unchanged for the state to continue.
+        bars = yield from _daily_bar_steps(symbol, state.last_date, today)
+        refetch = split_suspected(bars) or sessions_missing(bars)
+        if continues(state, bars) and not refetch:
+            _bump_error_stat("indicator_state_updates")
+            return (yield from _indicator_state_steps(symbol, state, bars[1:], from_date, today))
+        _bump_error_stat("indicator_state_rebuilds")
+        if refetch:
+            # The stored bars predate a split or lack a session the vendor had
+            # not published yet; download the window again.
+            BAR_STORE.forget(symbol)
+
+    bars = yield from _daily_bar_steps(symbol, from_date, today)
+    if not bars or len(bars) < 50:
         return None
+    return (yield from _indicator_state_steps(symbol, IndicatorState(), bars, from_date, today))
 
-    df = pd.DataFrame(data)
-    # Normalize column names (API may return various casings)
-    df.columns = [c.lower() for c in df.columns]
 
-    required = {"close", "high", "low"}
-    if not required.issubset(set(df.columns)):
-        return None
+def _indicator_state_steps(symbol, state, bars, from_date, today):
+    # Applying the bars (the whole window on a rebuild) is a CPU task like the
+    # chain passes; the state store is written back on the I/O side.
+    saved, indicators = yield CpuTask(_advance_indicator_state, state, bars, from_date, today)
+    if saved is not None:
+        INDICATOR_STATES.save(symbol, saved)
+    return indicators
 
-    df["close"] = pd.to_numeric(df["close"], errors="coerce")
-    df["high"] = pd.to_numeric(df["high"], errors="coerce")
-    df["low"] = pd.to_numeric(df["low"], errors="coerce")
-    df = df.dropna(subset=["close", "high", "low"]).reset_index(drop=True)
 
-    if len(df) < 50:
-        return None
+def _advance_indicator_state(state, bars, from_date, today):
+    """Apply ``bars`` to ``state`` and return ``(state, indicators)``.
 
-    close = df["close"]
-
-    ema50 = calculate_ema(close, 50).iloc[-1]
-    rsi = calculate_rsi(close, 14).iloc[-1]
-    adx = calculate_adx(df, 14).iloc[-1]
-    rvi = calculate_rvi(close).iloc[-1]
-    macd_line, signal_line = calculate_macd(close)
-    macd_val = macd_line.iloc[-1]
-    signal_val = signal_line.iloc[-1]
-
-    # Compute historical volatility (annualized) for IV rank comparison
-    log_returns = np.log(close / close.shift(1)).dropna()
-    hv_current = log_returns[-20:].std() * np.sqrt(252)  # 20-day HV
-    hv_long = log_returns[-60:].std() * np.sqrt(252) if len(log_returns) >= 60 else hv_current
-    hv_high = log_returns.rolling(20).std().max() * np.sqrt(
-        252
-    )  # max 20-day HV in period
-    hv_low = log_returns.rolling(20).std().min() * np.sqrt(
-        252
-    )  # min 20-day HV in period
-    realized_drift = log_returns.mean() * 252
-    if not np.isnan(realized_drift):
-        realized_drift = float(np.clip(realized_drift, -0.25, 0.25))
-    else:
-        realized_drift = None
+    The state is advanced through the last closed bar (``None`` when there is
+    none to persist); the indicators include today's still-moving bar.
+    """
+    columns = dated_bar_arrays(bars) if bars else None
+    if columns is None:
+        return None, state.indicators()
+    dates, high, low, close, opens = columns
+    closed = sum(1 for day in dates if day < today)
+    if closed:
+        state.advance(
+            high[:closed],
+            low[:closed],
+            close[:closed],
+            opens[:closed],
+            dates=dates[:closed],
+            returns_from=from_date,
+        )
+    saved = state if closed else None
+    if closed < len(dates):
+        state = state.copy().advance(
+            high[closed:], low[closed:], close[closed:], opens[closed:], dates=dates[closed:]
+        )
+    return saved, state.indicators()
 
-    return {
-        "ema50": float(ema50) if not np.isnan(ema50) else None,
-        "rsi": float(rsi) if not np.isnan(rsi) else None,
-        "adx": float(adx) if not np.isnan(adx) else None,
-        "rvi": float(rvi) if not np.isnan(rvi) else None,
-        "macd": float(macd_val) if not np.isnan(macd_val) else None,
-        "signal": float(signal_val) if not np.isnan(signal_val) else None,
-        "price": float(close.iloc[-1]),
-        "hv_current": float(hv_current) if not np.isnan(hv_current) else None,
-        "hv_long": float(hv_long) if not np.isnan(hv_long) else None,
-        "hv_high": float(hv_high) if not np.isnan(hv_high) else None,
-        "hv_low": float(hv_low) if not np.isnan(hv_low) else None,
-        "realized_drift": realized_drift,
-    }
+
+def _history_url(symbol, from_date, to_date):
+    return f"{HIST_URL}?ticker={symbol}&from={from_date}&to={to_date}&interval=1d"
+
+
+def _daily_bar_steps(symbol, from_date, to_date):
+    # Only the bars missing from the local store are requested; usually that is
+    # just the range since the last closed bar stored by the previous run.
+    today = datetime.now().strftime("%Y-%m-%d")
+    fetched_range = BAR_STORE.missing_range(symbol, from_date, to_date, today=today)
+    quotes = None
+    if fetched_range is not None:
+        data = yield _history_url(symbol, *fetched_range), REQUEST_TIMEOUT, MAX_RETRIES
+        quotes = quotes_from_payload(data)
+    return BAR_STORE.merge(symbol, from_date, to_date, quotes, fetched_range, today=today)
+
+
+def load_daily_bars(symbol, from_date, to_date):
+    """Daily bars for ``from_date..to_date`` from the local store, downloading
+    only the missing ones."""
+    return run_steps(_daily_bar_steps(symbol, from_date, to_date))
+
+
+def indicators_from_history(data):
+    """Compute the indicator dict from daily bars or a historical-prices payload."""
+    if not data:
+        return None
+    # API returns {"meta": ..., "quotes": [...], ...} or a flat list
+    data = quotes_from_payload(data)
+    if not isinstance(data, list) or len(data) < 50:
+        return None
+
+    bars = bar_arrays(data)
+    if bars is None:
+        return None
+    return compute_indicators(*bars)
 
 
 def compute_iv_hv_percentile(option_iv, hv_low, hv_high):
@@ -912,6 +1312,11 @@ def _to_float(value):
         return None
 
 
+def _finite_or_none(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
 def _safe_round(value, digits=2):
     numeric = _to_float(value)
     return round(numeric, digits) if numeric is not None else None
@@ -1038,14 +1443,29 @@ def _real_world_drift(indicators):
     return max(-0.25, min(0.25, drift))
 
 
+def _yield_ceiling():
+    global YIELD_CEILING
+    with _yield_ceiling_lock:
+        if YIELD_CEILING is None:
+            YIELD_CEILING = YieldCeilingGrid.load_or_build(YIELD_CEILING_DIR)
+        return YIELD_CEILING
+
+
+def _plausible_yield(max_abs_delta, min_dte, implied_vol, risk_free_rate):
+    """Monthly yield ceiling at the delta cap and a 30-day-or-longer expiry."""
+    return _yield_ceiling().ceiling(
+        max(max_abs_delta, 0.01), max(min_dte, 30), implied_vol, risk_free_rate
+    )
+
+
 def _warn_if_config_is_overconstrained(cfg, option_type):
-    plausible_yield = max_monthly_yield_for_delta(
-        max(cfg["MAX_ABS_DELTA"], 0.01),
-        max(cfg["MIN_DTE"], 30),
-        implied_vol=0.40,
-        risk_free_rate=cfg["RISK_FREE_RATE"],
+    plausible_yield = _plausible_yield(
+        cfg["MAX_ABS_DELTA"], cfg["MIN_DTE"], 0.40, cfg["RISK_FREE_RATE"]
     )
-    if plausible_yield is not None and cfg["TARGET_MONTHLY_YIELD_PCT"] > plausible_yield * 1.2:
+    if (
+        plausible_yield is not None
+        and cfg["TARGET_MONTHLY_YIELD_PCT"] > plausible_yield * YIELD_CEILING_MARGIN
+    ):
         print(
             f"Warning: {option_type.upper()} config asks for "
             f"{cfg['TARGET_MONTHLY_YIELD_PCT']:.2f}%/mo at |delta|<={cfg['MAX_ABS_DELTA']:.2f}; "
@@ -1152,6 +1572,29 @@ def _calculate_pop_ev(
         return None, None
 
 
+def _chain_url(symbol, option_type, shared=None):
+    if shared is None:
+        shared = SHARED_CHAIN_EXPIRATIONS is not None
+    if shared:
+        return (
+            f"{OPTIONS_URL}?ticker={symbol}&limit=50"
+            f"&expirationDatesCount={SHARED_CHAIN_EXPIRATIONS}"
+        )
+    api_filter = "calls" if option_type == "call" else "puts"
+    return (
+        f"{OPTIONS_URL}?ticker={symbol}&filter={api_filter}&limit=50"
+        f"&expirationDatesCount={MAX_EXPIRATIONS_PER_SYMBOL}"
+    )
+
+
+def _chain_has_side(options_payload, option_type):
+    options = options_payload.get("options") if isinstance(options_payload, dict) else None
+    if not isinstance(options, list) or not options:
+        return True
+    chain_key = "calls" if option_type == "call" else "puts"
+    return any(isinstance(chain, dict) and chain_key in chain for chain in options)
+
+
 def _extract_contracts(options_payload, option_type="put"):
     options = options_payload.get("options", [])
     if not isinstance(options, list):
@@ -1176,8 +1619,192 @@ def _extract_contracts(options_payload, option_type="put"):
     return contracts
 
 
-def _evaluate_contract(symbol_data, expiration_dt, option, now_dt, option_type="put"):
-    symbol = symbol_data["symbol"]
+def _contract_check_labels():
+    """Names of the first-pass checks for the active screening config."""
+    return {
+        "yield": "Yield >= 1%/month",
+        "premium": f"Premium > {MIN_PREMIUM}",
+        "dte": f"{MIN_DTE} <= DTE <= {MAX_DTE}",
+        "otm": f"OTM >= {MIN_OTM_PCT}%",
+        "open_interest": f"OI >= {MIN_OPEN_INTEREST}",
+        "volume": f"Volume >= {MIN_VOLUME}",
+        "spread_pct": f"Spread <= {MAX_SPREAD_PCT}%",
+        "spread_abs": f"Spread <= ${MAX_SPREAD_ABS:.2f}",
+        "delta": f"{MIN_ABS_DELTA:.2f} <= |Delta| <= {MAX_ABS_DELTA:.2f}",
+    }
+
+
+def _earnings_before_expiry(next_earnings_dt, expiration, now_dt):
+    return (
+        isinstance(next_earnings_dt, datetime)
+        and next_earnings_dt >= now_dt
+        and expiration is not None
+        and next_earnings_dt.date() <= expiration.date()
+    )
+
+
+class ExpirationContext:
+    """Values shared by every strike of one ``(symbol, expiration)``.
+
+    Built once per expiry by ``_expiration_context`` and used by the first pass,
+    the output row and the enrichment pass instead of re-deriving them from the
+    expiration for each contract. ``dte`` and ``t_years`` are ``None`` without a
+    parseable expiration.
+    """
+
+    __slots__ = (
+        "expiration",
+        "dte",
+        "t_years",
+        "earnings_before_expiry",
+        "ex_dividend_date",
+        "ex_dividend_before_expiry",
+        "dividend_amount",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+
+def _expiration_context(symbol_data, expiration, now_dt):
+    dte = _dte_from_expiration(expiration, now_dt)
+    t_years = years_to_expiration(expiration, now_dt)
+    dividend_yield = symbol_data.get("dividend_yield", DIVIDEND_YIELD)
+
+    ex_div_dt = symbol_data.get("ex_dividend_date_dt")
+    ex_dividend_date = None
+    ex_dividend_before_expiry = False
+    if isinstance(ex_div_dt, datetime):
+        ex_dividend_date = ex_div_dt.strftime("%Y-%m-%d")
+        if ex_div_dt.tzinfo is None:
+            ex_div_dt = ex_div_dt.replace(tzinfo=timezone.utc)
+        else:
+            ex_div_dt = ex_div_dt.astimezone(timezone.utc)
+        # Whether the ex-dividend date falls during the option contract's life.
+        ex_dividend_before_expiry = (
+            expiration is not None and now_dt.date() <= ex_div_dt.date() <= expiration.date()
+        )
+
+    # Estimate quarterly dividend amount: Rate / 4 or Yield * Price / 4
+    trailing_annual_dividend_rate = symbol_data.get("trailing_annual_dividend_rate", 0.0)
+    if trailing_annual_dividend_rate > 0.0:
+        dividend_amount = trailing_annual_dividend_rate / 4.0
+    elif dividend_yield > 0.0:
+        dividend_amount = ((_to_float(symbol_data.get("price")) or 0.0) * dividend_yield) / 4.0
+    else:
+        dividend_amount = 0.0
+
+    return ExpirationContext(
+        expiration=expiration,
+        dte=dte,
+        t_years=t_years,
+        earnings_before_expiry=_earnings_before_expiry(
+            symbol_data.get("next_earnings_dt"), expiration, now_dt
+        ),
+        ex_dividend_date=ex_dividend_date,
+        ex_dividend_before_expiry=ex_dividend_before_expiry,
+        dividend_amount=dividend_amount,
+    )
+
+
+def _expiration_contexts(symbol_data, contracts, now_dt):
+    """One shared ``ExpirationContext`` per expiry, listed per contract."""
+    by_expiration = {}
+    contexts = []
+    for expiration_dt, option in contracts:
+        expiration = expiration_dt or _parse_expiration(option.get("expiration"))
+        context = by_expiration.get(expiration)
+        if context is None:
+            context = by_expiration[expiration] = _expiration_context(
+                symbol_data, expiration, now_dt
+            )
+        contexts.append(context)
+    return contexts
+
+
+def _ex_dividend_risk(context, price, strike, premium, option_type="put"):
+    """Return ``(ex_dividend_date, risk)`` for a contract of ``context``'s expiry."""
+    if context.ex_dividend_date is None:
+        return None, "NONE"
+    if not context.ex_dividend_before_expiry:
+        return context.ex_dividend_date, "NONE"
+    if option_type != "call":
+        return context.ex_dividend_date, "DIVIDEND_DROP"
+
+    extrinsic_value = premium - max(price - strike, 0.0)
+    if context.dividend_amount > 0.0 and extrinsic_value < context.dividend_amount:
+        return context.ex_dividend_date, "HIGH"
+    return context.ex_dividend_date, "MEDIUM"
+
+
+def _contract_row(
+    symbol_data,
+    price,
+    strike,
+    context,
+    premium,
+    net_premium,
+    bid,
+    ask,
+    spread_abs,
+    spread_pct,
+    monthly_yield_pct,
+    annualized_yield_pct,
+    otm_pct,
+    open_interest,
+    volume,
+    delta,
+    implied_volatility,
+    failed,
+    option_type="put",
+):
+    """Output row of a first-pass survivor; enrichment fields start as ``None``."""
+    ex_div_date_str, ex_div_risk = _ex_dividend_risk(
+        context, price, strike, premium, option_type=option_type
+    )
+    expiration = context.expiration
+    next_earnings_dt = symbol_data.get("next_earnings_dt")
+    return ContractRecord(
+        symbol=symbol_data["symbol"],
+        name=symbol_data["name"],
+        price=round(price, 2),
+        status="PASS" if len(failed) == 0 else "NEAR",
+        failed_criterion=failed[0] if len(failed) == 1 else "",
+        strike=round(strike, 2),
+        expiration=expiration.strftime("%Y-%m-%d") if expiration else None,
+        ex_dividend_date=ex_div_date_str,
+        ex_div_risk=ex_div_risk,
+        next_earnings=next_earnings_dt.strftime("%Y-%m-%d")
+        if isinstance(next_earnings_dt, datetime)
+        else None,
+        earnings_before_expiry=context.earnings_before_expiry,
+        dte=context.dte,
+        premium=round(premium, 2),
+        net_premium=_safe_round(net_premium),
+        bid=_safe_round(bid),
+        ask=_safe_round(ask),
+        spread_abs=_safe_round(spread_abs),
+        spread_pct=_safe_round(spread_pct),
+        monthly_yield_pct=_safe_round(monthly_yield_pct),
+        annualized_yield_pct=_safe_round(annualized_yield_pct),
+        otm_pct=round(otm_pct, 2),
+        open_interest=open_interest,
+        volume=volume,
+        delta=_safe_round(delta, 3),
+        implied_volatility=_safe_round(implied_volatility, 3),
+    )
+
+
+def _evaluate_contract(
+    symbol_data, expiration_dt, option, now_dt, option_type="put", context=None
+):
+    """Scalar first-pass evaluation of one contract.
+
+    The scan itself goes through ``_evaluate_chain``; this is the reference
+    implementation it is tested against. ``context`` is the contract's
+    ``ExpirationContext``, built here when not given.
+    """
     price = _to_float(symbol_data.get("price"))
     if price is None or price <= 0:
         return None
@@ -1208,75 +1835,35 @@ def _evaluate_contract(symbol_data, expiration_dt, option, now_dt, option_type="
         round_trip=False,
     )
     spread_abs = ask - bid
-    price_source = "mid"
 
     if premium is None or premium <= 0:
         return None
     if net_premium is None or net_premium <= 0:
         return None
 
-    expiration = expiration_dt or _parse_expiration(option.get("expiration"))
-    dte = _dte_from_expiration(expiration, now_dt)
+    if context is None:
+        expiration = expiration_dt or _parse_expiration(option.get("expiration"))
+        context = _expiration_context(symbol_data, expiration, now_dt)
+    dte = context.dte
     if dte is None or dte <= 0:
         return None
 
-    next_earnings_dt = symbol_data.get("next_earnings_dt")
-    earnings_before_expiry = (
-        isinstance(next_earnings_dt, datetime)
-        and next_earnings_dt >= now_dt
-        and expiration is not None
-        and next_earnings_dt.date() <= expiration.date()
-    )
-    if EXCLUDE_EARNINGS_BEFORE_EXPIRY and earnings_before_expiry:
+    if EXCLUDE_EARNINGS_BEFORE_EXPIRY and context.earnings_before_expiry:
         _bump_error_stat("contracts_excluded_earnings")
         return None
 
     per_stock_div_yield = symbol_data.get("dividend_yield", DIVIDEND_YIELD)
     if delta is None:
-        t_years = years_to_expiration(expiration, now_dt)
         delta = option_delta(
             price,
             strike,
             implied_volatility,
-            t_years,
+            context.t_years,
             RISK_FREE_RATE,
             per_stock_div_yield,
             option_type=option_type,
         )
 
-    # Ex-Dividend Risk Warning System
-    ex_div_dt = symbol_data.get("ex_dividend_date_dt")
-    ex_div_date_str = None
-    ex_div_risk = "NONE"
-
-    if ex_div_dt and isinstance(ex_div_dt, datetime):
-        ex_div_date_str = ex_div_dt.strftime("%Y-%m-%d")
-
-        if ex_div_dt.tzinfo is None:
-            ex_div_dt_aware = ex_div_dt.replace(tzinfo=timezone.utc)
-        else:
-            ex_div_dt_aware = ex_div_dt.astimezone(timezone.utc)
-
-        # Check if the ex-dividend date falls during the option contract's life
-        if now_dt.date() <= ex_div_dt_aware.date() <= expiration.date():
-            # Estimate quarterly dividend amount: Rate / 4 or Yield * Price / 4
-            trailing_annual_dividend_rate = symbol_data.get("trailing_annual_dividend_rate", 0.0)
-            if trailing_annual_dividend_rate > 0.0:
-                dividend_amount = trailing_annual_dividend_rate / 4.0
-            elif per_stock_div_yield > 0.0:
-                dividend_amount = (price * per_stock_div_yield) / 4.0
-            else:
-                dividend_amount = 0.0
-
-            if option_type == "call":
-                extrinsic_value = premium - max(price - strike, 0.0)
-                if dividend_amount > 0.0 and extrinsic_value < dividend_amount:
-                    ex_div_risk = "HIGH"
-                else:
-                    ex_div_risk = "MEDIUM"
-            else:
-                ex_div_risk = "DIVIDEND_DROP"
-
     # OTM% calculation differs for puts vs calls
     if option_type == "call":
         otm_pct = ((strike - price) / price) * 100
@@ -1286,75 +1873,377 @@ def _evaluate_contract(symbol_data, expiration_dt, option, now_dt, option_type="
     collateral = collateral_per_share(strike, price, net_premium, option_type=option_type)
     monthly_yield_pct, annualized_yield_pct = simple_yields(net_premium, collateral, dte)
 
+    labels = _contract_check_labels()
     checks = {
-        "Yield >= 1%/month": monthly_yield_pct is not None
+        labels["yield"]: monthly_yield_pct is not None
         and monthly_yield_pct >= TARGET_MONTHLY_YIELD_PCT,
-        f"Premium > {MIN_PREMIUM}": net_premium > MIN_PREMIUM,
-        f"{MIN_DTE} <= DTE <= {MAX_DTE}": MIN_DTE <= dte <= MAX_DTE,
-        f"OTM >= {MIN_OTM_PCT}%": (strike > price if option_type == "call" else strike < price) and otm_pct >= MIN_OTM_PCT,
-        f"OI >= {MIN_OPEN_INTEREST}": open_interest >= MIN_OPEN_INTEREST,
-        f"Volume >= {MIN_VOLUME}": volume >= MIN_VOLUME,
+        labels["premium"]: net_premium > MIN_PREMIUM,
+        labels["dte"]: MIN_DTE <= dte <= MAX_DTE,
+        labels["otm"]: (strike > price if option_type == "call" else strike < price) and otm_pct >= MIN_OTM_PCT,
+        labels["open_interest"]: open_interest >= MIN_OPEN_INTEREST,
+        labels["volume"]: volume >= MIN_VOLUME,
     }
     if spread_pct is not None:
-        checks[f"Spread <= {MAX_SPREAD_PCT}%"] = spread_pct <= MAX_SPREAD_PCT
-    checks[f"Spread <= ${MAX_SPREAD_ABS:.2f}"] = spread_abs <= MAX_SPREAD_ABS
+        checks[labels["spread_pct"]] = spread_pct <= MAX_SPREAD_PCT
+    checks[labels["spread_abs"]] = spread_abs <= MAX_SPREAD_ABS
 
     if delta is not None:
         abs_delta = abs(delta)
-        checks[f"{MIN_ABS_DELTA:.2f} <= |Delta| <= {MAX_ABS_DELTA:.2f}"] = (
-            MIN_ABS_DELTA <= abs_delta <= MAX_ABS_DELTA
-        )
+        checks[labels["delta"]] = MIN_ABS_DELTA <= abs_delta <= MAX_ABS_DELTA
 
     failed = [name for name, passed in checks.items() if not passed]
 
-    return {
-        "Symbol": symbol,
-        "Name": symbol_data["name"],
-        "Price": round(price, 2),
-        "EMA50": None,
-        "ADX": None,
-        "RSI": None,
-        "RVI": None,
-        "MACD": None,
-        "Signal": None,
-        "DiffPct": None,
-        "Status": "PASS" if len(failed) == 0 else "NEAR",
-        "Failed Criterion": failed[0] if len(failed) == 1 else "",
-        "Strike": round(strike, 2),
-        "Expiration": expiration.strftime("%Y-%m-%d") if expiration else None,
-        "ExDividendDate": ex_div_date_str,
-        "ExDivRisk": ex_div_risk,
-        "NextEarnings": next_earnings_dt.strftime("%Y-%m-%d")
-        if isinstance(next_earnings_dt, datetime)
-        else None,
-        "EarningsBeforeExpiry": earnings_before_expiry,
-        "DTE": dte,
-        "Premium": round(premium, 2),
-        "NetPremium": _safe_round(net_premium),
-        "PricingSource": price_source,
-        "Bid": _safe_round(bid),
-        "Ask": _safe_round(ask),
-        "SpreadAbs": _safe_round(spread_abs),
-        "SpreadPct": _safe_round(spread_pct),
-        "MonthlyYieldPct": _safe_round(monthly_yield_pct),
-        "AnnualizedYieldPct": _safe_round(annualized_yield_pct),
-        "OTMPct": round(otm_pct, 2),
-        "OpenInterest": open_interest,
-        "Volume": volume,
-        "Delta": _safe_round(delta, 3),
-        "ImpliedVolatility": _safe_round(implied_volatility, 3),
-        "ForecastVol": None,
-        "VRPRatio": None,
-        "SigmaDistance": None,
-        "CreditRiskRatio": None,
-        "PoP": None,
-        "EV": None,
-        "ExpectedAssignmentLoss": None,
-        "Score": 0.0,
-    }, failed
+    return _contract_row(
+        symbol_data,
+        price,
+        strike,
+        context,
+        premium,
+        net_premium,
+        bid,
+        ask,
+        spread_abs,
+        spread_pct,
+        monthly_yield_pct,
+        annualized_yield_pct,
+        otm_pct,
+        open_interest,
+        volume,
+        delta,
+        implied_volatility,
+        failed,
+        option_type=option_type,
+    ), failed
+
+
+def _float_column(contracts, key):
+    # ``None`` (and anything _to_float rejects) becomes NaN, which fails every
+    # comparison below just like the scalar ``is None`` guards.
+    return np.array([_to_float(option.get(key)) for _, option in contracts], dtype=float)
+
+
+def _bisect_first(values, predicate):
+    """Index of the first of the sorted ``values`` where the monotone ``predicate`` holds."""
+    low, high = 0, len(values)
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(values[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _solve_stale_ivs(symbol_data, contracts, contexts, option_type="put"):
+    """Contracts with a missing or stale IV re-solved from the bid/ask mid.
+
+    A quoted IV is stale when its Black-Scholes value falls outside the
+    contract's own bid/ask (Yahoo often derives it from an old last trade). The
+    whole chain is checked and solved in one ``implied_volatility_array`` call.
+    Repaired contracts are shallow copies, so the payload is left untouched.
+    Returns ``(contracts, solved_count)``.
+    """
+    price = _to_float(symbol_data.get("price"))
+    if not SOLVE_STALE_IV or price is None or price <= 0 or not contracts:
+        return contracts, 0
+
+    strike = _float_column(contracts, "strike")
+    bid = _float_column(contracts, "bid")
+    ask = _float_column(contracts, "ask")
+    quoted_iv = _float_column(contracts, "impliedVolatility")
+    t_years = np.array(
+        [np.nan if context.t_years is None else context.t_years for context in contexts],
+        dtype=float,
+    )
+    dividend_yield = symbol_data.get("dividend_yield", DIVIDEND_YIELD)
+    with np.errstate(invalid="ignore"):
+        two_sided = (strike > 0) & (bid > 0) & (ask >= bid) & (t_years > 0)
+        model = option_price_array(
+            price, strike, quoted_iv, t_years, RISK_FREE_RATE, dividend_yield, option_type=option_type
+        )
+        # Half a cent of slack for quotes rounded to the cent.
+        consistent = (quoted_iv > 0) & (model >= bid - 0.005) & (model <= ask + 0.005)
+    stale = np.flatnonzero(two_sided & ~consistent)
+    if not len(stale):
+        return contracts, 0
+
+    solved = implied_volatility_array(
+        0.5 * (bid[stale] + ask[stale]),
+        price,
+        strike[stale],
+        t_years[stale],
+        RISK_FREE_RATE,
+        dividend_yield,
+        option_type=option_type,
+    )
+    repaired = list(contracts)
+    count = 0
+    for i, iv in zip(stale.tolist(), solved.tolist()):
+        if math.isnan(iv):
+            continue
+        expiration_dt, option = contracts[i]
+        repaired[i] = (expiration_dt, {**option, "impliedVolatility": iv})
+        count += 1
+    if count:
+        _bump_error_stat("implied_volatilities_solved", count)
+    return repaired, count
+
+
+def _prune_strike_window(
+    symbol_data, contracts, now_dt, atm_iv, option_type="put", contexts=None
+):
+    """Drop the contracts that cannot be PASS/NEAR candidates before evaluation.
+
+    Returns ``(contracts, contexts, pruned_count)`` with the kept contracts in
+    chain order and their ``ExpirationContext``. Per expiration, a contract is
+    pruned when it is certain to fail more checks than a NEAR row may: the OTM
+    check and the DTE check of the whole expiration, plus the delta check for
+    any implied volatility within ``STRIKE_WINDOW_IV_MULTIPLE`` of ``atm_iv``
+    (both ways). The delta bound only holds for the contracts the first pass
+    estimates a delta for from an IV inside that band: one sent by the API is
+    used as is. Each of these failures holds on one side of a strike, so the
+    cut-off strikes are found by bisection over the sorted strikes.
+    ``contexts`` are the contracts' contexts when the caller has them.
+    """
+    if contexts is None:
+        contexts = _expiration_contexts(symbol_data, contracts, now_dt)
+    price = _to_float(symbol_data.get("price"))
+    if (
+        STRIKE_WINDOW_IV_MULTIPLE <= 0
+        or not atm_iv
+        or atm_iv <= 0
+        or price is None
+        or price <= 0
+        or not contracts
+    ):
+        return contracts, contexts, 0
+
+    sigma_low = atm_iv / STRIKE_WINDOW_IV_MULTIPLE
+    sigma_high = atm_iv * STRIKE_WINDOW_IV_MULTIPLE
+    dividend_yield = symbol_data.get("dividend_yield", DIVIDEND_YIELD)
+    call = option_type == "call"
+    strikes = _float_column(contracts, "strike")
+    implied_volatility = _float_column(contracts, "impliedVolatility")
+    with np.errstate(invalid="ignore"):
+        delta_bounded = (
+            np.isnan(_float_column(contracts, "delta"))
+            & (implied_volatility >= sigma_low)
+            & (implied_volatility <= sigma_high)
+        )
+
+    groups = {}
+    for i, context in enumerate(contexts):
+        groups.setdefault(id(context), (context, []))[1].append(i)
+
+    keep = np.ones(len(contracts), dtype=bool)
+    for context, indices in groups.values():
+        if context.t_years is None or context.dte is None or context.dte <= 0:
+            continue
+        indices = np.array(indices)
+        group_strikes = strikes[indices]
+        valid = group_strikes > 0
+        if not valid.any():
+            continue
+        unique = np.unique(group_strikes[valid]).tolist()
+        rank = np.searchsorted(unique, np.where(valid, group_strikes, 0.0))
+
+        def delta_range(strike, context=context):
+            return option_delta_range(
+                price,
+                strike,
+                sigma_low,
+                sigma_high,
+                context.t_years,
+                RISK_FREE_RATE,
+                dividend_yield,
+                option_type=option_type,
+            )
+
+        def fails_otm(strike):
+            otm_pct = ((strike - price) if call else (price - strike)) / price * 100
+            return not ((strike > price if call else strike < price) and otm_pct >= MIN_OTM_PCT)
+
+        # (check, True when it fails on the high-strike side, contracts it
+        # applies to); a put is further out of the money and has a smaller
+        # |delta| the lower its strike.
+        everywhere = np.ones(len(indices), dtype=bool)
+        bounded = delta_bounded[indices]
+        sided_checks = [
+            (fails_otm, not call, everywhere),
+            (lambda strike: delta_range(strike)[0] > MAX_ABS_DELTA, not call, bounded),
+        ]
+        if MIN_ABS_DELTA > 0:
+            sided_checks.append(
+                (lambda strike: delta_range(strike)[1] < MIN_ABS_DELTA, call, bounded)
+            )
+
+        certain = np.full(len(indices), 0 if MIN_DTE <= context.dte <= MAX_DTE else 1)
+        for fails, high_side, applies in sided_checks:
+            if not applies.any():
+                continue
+            if high_side:
+                certain += applies & (rank >= _bisect_first(unique, fails))
+            else:
+                certain += applies & (rank < _bisect_first(unique, lambda strike: not fails(strike)))
+        keep[indices[valid & (certain > 1)]] = False
+
+    pruned = len(contracts) - int(np.count_nonzero(keep))
+    if not pruned:
+        return contracts, contexts, 0
+    _bump_error_stat("contracts_pruned_strike_window", pruned)
+    kept = np.flatnonzero(keep).tolist()
+    return [contracts[i] for i in kept], [contexts[i] for i in kept], pruned
+
+
+def _evaluate_chain(symbol_data, contracts, now_dt, option_type="put", contexts=None):
+    """Vectorized first pass over a symbol's ``_extract_contracts`` output.
+
+    Gives the same rows as running ``_evaluate_contract`` on every contract and
+    keeping the PASS/NEAR candidates (at most one failed check, none of them a
+    spread check), in chain order. Quotes are converted to NumPy columns once,
+    pricing and the checks run as array operations, and rows are only built
+    for those survivors. Returns ``(row, failed, ExpirationContext)`` triples.
+    ``contexts`` are the contracts' contexts when the caller already has them.
+    """
+    price = _to_float(symbol_data.get("price"))
+    if price is None or price <= 0 or not contracts:
+        return []
+
+    strike = _float_column(contracts, "strike")
+    bid = _float_column(contracts, "bid")
+    ask = _float_column(contracts, "ask")
+    implied_volatility = _float_column(contracts, "impliedVolatility")
+    delta = _float_column(contracts, "delta")
+    open_interest = np.trunc(np.nan_to_num(_float_column(contracts, "openInterest")))
+    volume = np.trunc(np.nan_to_num(_float_column(contracts, "volume")))
+
+    # Contracts of one expiration share its ExpirationContext.
+    if contexts is None:
+        contexts = _expiration_contexts(symbol_data, contracts, now_dt)
+    expiry_columns = np.array(
+        [
+            (
+                np.nan if context.dte is None else context.dte,
+                np.nan if context.t_years is None else context.t_years,
+                context.earnings_before_expiry,
+            )
+            for context in contexts
+        ],
+        dtype=float,
+    )
+    dte = expiry_columns[:, 0]
+    t_years = expiry_columns[:, 1]
+    earnings_before_expiry = expiry_columns[:, 2] > 0
+
+    valid_strike = strike > 0
+    quoted = (bid > 0) & (ask > 0) & (ask >= bid)
+    missing_quote = int(np.count_nonzero(valid_strike & ~quoted))
+    if missing_quote:
+        _bump_error_stat("contracts_excluded_missing_quote", missing_quote)
+
+    premium, net_premium, spread_pct = net_credit_array(
+        bid,
+        ask,
+        commission_per_contract=COMMISSION_PER_CONTRACT,
+        slippage_pct_of_spread=SLIPPAGE_PCT_OF_SPREAD,
+        round_trip=False,
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread_abs = ask - bid
+
+        alive = valid_strike & quoted & (premium > 0) & (net_premium > 0) & (dte > 0)
+        if EXCLUDE_EARNINGS_BEFORE_EXPIRY:
+            excluded = alive & earnings_before_expiry
+            excluded_count = int(np.count_nonzero(excluded))
+            if excluded_count:
+                _bump_error_stat("contracts_excluded_earnings", excluded_count)
+            alive &= ~earnings_before_expiry
+        if not alive.any():
+            return []
+
+        # Black-Scholes delta where the API did not send one.
+        estimate = alive & np.isnan(delta)
+        if estimate.any():
+            delta[estimate] = option_delta_array(
+                price,
+                strike[estimate],
+                implied_volatility[estimate],
+                t_years[estimate],
+                RISK_FREE_RATE,
+                symbol_data.get("dividend_yield", DIVIDEND_YIELD),
+                option_type=option_type,
+            )
+
+        if option_type == "call":
+            otm_pct = ((strike - price) / price) * 100
+            out_of_the_money = strike > price
+            collateral = np.maximum(price - net_premium, 0.01)
+        else:
+            otm_pct = ((price - strike) / price) * 100
+            out_of_the_money = strike < price
+            collateral = np.maximum(strike - net_premium, 0.01)
+        monthly_yield_pct, annualized_yield_pct = simple_yields_array(net_premium, collateral, dte)
+
+        abs_delta = np.abs(delta)
+        has_delta = ~np.isnan(delta)
+        checks = (
+            ("yield", monthly_yield_pct >= TARGET_MONTHLY_YIELD_PCT),
+            ("premium", net_premium > MIN_PREMIUM),
+            ("dte", (MIN_DTE <= dte) & (dte <= MAX_DTE)),
+            ("otm", out_of_the_money & (otm_pct >= MIN_OTM_PCT)),
+            ("open_interest", open_interest >= MIN_OPEN_INTEREST),
+            ("volume", volume >= MIN_VOLUME),
+            ("delta", ~has_delta | ((MIN_ABS_DELTA <= abs_delta) & (abs_delta <= MAX_ABS_DELTA))),
+        )
+        spread_ok = (spread_pct <= MAX_SPREAD_PCT) & (spread_abs <= MAX_SPREAD_ABS)
+
+    failures = np.zeros(len(contracts), dtype=np.int64)
+    for _, passed in checks:
+        failures += ~passed
+    survivors = np.flatnonzero(alive & spread_ok & (failures <= 1))
+
+    labels = _contract_check_labels()
+    evaluated = []
+    for i in survivors.tolist():
+        failed = [labels[name] for name, passed in checks if not passed[i]]
+        row_delta = float(delta[i]) if has_delta[i] else None
+        row_iv = float(implied_volatility[i]) if not np.isnan(implied_volatility[i]) else None
+        row = _contract_row(
+            symbol_data,
+            price,
+            float(strike[i]),
+            contexts[i],
+            float(premium[i]),
+            float(net_premium[i]),
+            float(bid[i]),
+            float(ask[i]),
+            float(spread_abs[i]),
+            float(spread_pct[i]),
+            float(monthly_yield_pct[i]),
+            float(annualized_yield_pct[i]),
+            float(otm_pct[i]),
+            int(open_interest[i]),
+            int(volume[i]),
+            row_delta,
+            row_iv,
+            failed,
+            option_type=option_type,
+        )
+        evaluated.append((row, failed, contexts[i]))
+    return evaluated
 
 
 def analyze_single_symbol_options(symbol_data, option_type="put"):
+    return run_steps(_symbol_analysis_steps(symbol_data, option_type))
+
+
+def _symbol_analysis_steps(symbol_data, option_type="put"):
+    """Pipeline generator behind ``analyze_single_symbol_options``.
+
+    Every HTTP request is yielded as ``(url, timeout, max_retries)`` and the
+    decoded payload is sent back in, so the same pipeline is driven by the
+    thread engine (``run_steps``) and the asyncio engine (``run_steps_async``).
+    """
     symbol = symbol_data["symbol"]
     price = symbol_data.get("price") or 0.0
     fifty_day_avg = symbol_data.get("fifty_day_average")
@@ -1364,183 +2253,248 @@ def analyze_single_symbol_options(symbol_data, option_type="put"):
     # If price >= 95% of the 50-day SMA the stock cannot be flagged as a
     # downtrend (below_ema is a prerequisite for every signal), so we defer
     # the history fetch until after the options chain is evaluated.
+    url = _chain_url(symbol, option_type)
+    # "No contracts" is recorded per option type because a shared chain can
+    # hold puts but no calls.
+    contracts_key = f"{url}|{option_type}"
+    # A chain that recently failed with a client error or came back empty is
+    # skipped before spending a history request on the trend pre-check.
+    if _skip_negative(url) or _skip_negative(contracts_key):
+        return [], []
+
     indicators = None
     if option_type == "put" and FILTER_DOWNTRENDS:
         if fifty_day_avg is None or price < fifty_day_avg * 0.95:
-            indicators = fetch_historical_indicators(symbol)
+            indicators = yield from _historical_indicator_steps(symbol)
             if is_downtrend(indicators):
                 debug_log(f"Skipping {symbol}: strong downtrend detected")
                 return [], []
 
     if option_type == "call" and FILTER_UPTRENDS:
         if fifty_day_avg is None or price > fifty_day_avg * 1.08:
-            indicators = fetch_historical_indicators(symbol)
+            indicators = yield from _historical_indicator_steps(symbol)
             if is_uptrend(indicators):
                 debug_log(f"Skipping {symbol}: strong explosive uptrend detected")
                 return [], []
 
-    api_filter = "calls" if option_type == "call" else "puts"
-    url = (
-        f"{OPTIONS_URL}?ticker={symbol}&filter={api_filter}&limit=50"
-        f"&expirationDatesCount={MAX_EXPIRATIONS_PER_SYMBOL}"
-    )
-    data = safe_get(
-        url,
-        timeout=OPTIONS_REQUEST_TIMEOUT,
-        max_retries=OPTIONS_MAX_RETRIES,
-    )
+    data = yield url, OPTIONS_REQUEST_TIMEOUT, OPTIONS_MAX_RETRIES
+    if data and SHARED_CHAIN_EXPIRATIONS and not _chain_has_side(data, option_type):
+        # The API ignored the missing filter and sent one side only.
+        url = _chain_url(symbol, option_type, shared=False)
+        data = yield url, OPTIONS_REQUEST_TIMEOUT, OPTIONS_MAX_RETRIES
     if not data:
+        if data is not None:
+            # None means the request failed (already recorded if it was a
+            # client error); an empty body means the API has nothing here.
+            _write_negative(url, "empty payload")
         _bump_error_stat("empty_payloads")
         debug_log(f"No options payload for {symbol}: {url}")
         return [], []
 
     now_dt = datetime.now(timezone.utc)
-    contracts = _extract_contracts(data, option_type=option_type)
-    if len(contracts) == 0:
+    # Parsing the chain and both evaluation passes are CPU work; they are
+    # yielded as tasks so the staged engine can run them off the I/O threads.
+    contract_count, atm_iv, pre_evaluated = yield CpuTask(
+        _first_pass, symbol_data, data, now_dt, option_type
+    )
+    if contract_count == 0:
         _bump_error_stat("empty_contract_sets")
+        _write_negative(contracts_key, f"no {option_type} contracts")
         debug_log(f"No {option_type} contracts extracted for {symbol}")
 
-    atm_iv = extract_atm_iv(
-        contracts,
-        price,
-        now_dt=now_dt,
-        dte_fn=_dte_from_expiration,
-    )
     # Put and call ATM IV differ because of skew, so each option type keeps its
     # own series; otherwise the second scan of the day overwrites the first.
     iv_history_key = f"{symbol}|{option_type}"
     if CURRENT_SCAN_DATE:
         IV_HISTORY_STORE.record(iv_history_key, CURRENT_SCAN_DATE, atm_iv)
-    iv_rank, iv_percentile, iv_observation_count = IV_HISTORY_STORE.rank(
-        iv_history_key, atm_iv
-    )
-
-    # First pass: evaluate contracts without indicator enrichment.
-    # Only keep potential PASS (0 failures) or NEAR (1 failure) candidates.
-    pre_evaluated = []
-    for expiration_dt, option in contracts:
-        evaluated = _evaluate_contract(symbol_data, expiration_dt, option, now_dt, option_type=option_type)
-        if not evaluated:
-            continue
-        contract_data, failed = evaluated
-        spread_keys = {f"Spread <= {MAX_SPREAD_PCT}%", f"Spread <= ${MAX_SPREAD_ABS:.2f}"}
-        if len(failed) <= 1 and not spread_keys.intersection(failed):
-            pre_evaluated.append((contract_data, list(failed)))
+    iv_stats = IV_HISTORY_STORE.rank(iv_history_key, atm_iv)
+    _flag_yield_ceiling(symbol, atm_iv)
 
     if not pre_evaluated:
         return [], []
 
     # Lazy history fetch: only triggered when surviving contracts exist.
     if indicators is None:
-        indicators = fetch_historical_indicators(symbol)
+        indicators = yield from _historical_indicator_steps(symbol)
+
+    return (
+        yield CpuTask(
+            _second_pass,
+            symbol_data,
+            pre_evaluated,
+            indicators,
+            VolatilityProfile.from_indicators(indicators),
+            atm_iv,
+            iv_stats,
+            option_type,
+        )
+    )
+
+
+def _flag_yield_ceiling(symbol, atm_iv):
+    """Count (and debug-log) a symbol whose ATM IV cannot pay the yield target."""
+    if not atm_iv or atm_iv <= 0:
+        return False
+    ceiling = _plausible_yield(MAX_ABS_DELTA, MIN_DTE, atm_iv, RISK_FREE_RATE)
+    if ceiling is None or TARGET_MONTHLY_YIELD_PCT <= ceiling * YIELD_CEILING_MARGIN:
+        return False
+    _bump_error_stat("symbols_above_yield_ceiling")
+    debug_log(
+        f"{symbol}: {TARGET_MONTHLY_YIELD_PCT:.2f}%/mo target vs ~{ceiling:.2f}%/mo plausible "
+        f"at |delta|<={MAX_ABS_DELTA:.2f} and ATM IV {atm_iv:.2f}"
+    )
+    return True
+
+
+def _first_pass(symbol_data, data, now_dt, option_type):
+    """``(contract count, ATM IV, survivors)`` of an option-chain payload.
+
+    Contracts are evaluated without indicator enrichment and only potential
+    PASS (0 failures) or NEAR (1 failure) candidates are kept; missing or stale
+    IVs are solved from the quotes first, and strikes outside the window around
+    ATM IV are pruned.
+    """
+    contracts = _extract_contracts(data, option_type=option_type)
+    contexts = _expiration_contexts(symbol_data, contracts, now_dt)
+    contracts, _ = _solve_stale_ivs(symbol_data, contracts, contexts, option_type=option_type)
+    atm_iv = extract_atm_iv(
+        contracts,
+        symbol_data.get("price") or 0.0,
+        now_dt=now_dt,
+        dte_fn=_dte_from_expiration,
+    )
+    window, contexts, _ = _prune_strike_window(
+        symbol_data, contracts, now_dt, atm_iv, option_type=option_type, contexts=contexts
+    )
+    pre_evaluated = _evaluate_chain(
+        symbol_data, window, now_dt, option_type=option_type, contexts=contexts
+    )
+    return len(contracts), atm_iv, pre_evaluated
+
+
+def _second_pass(
+    symbol_data, pre_evaluated, indicators, volatility, atm_iv, iv_stats, option_type
+):
+    """``(passed, near)`` rows of the first-pass survivors.
+
+    Enriches them with technical indicators, the IV/HV percentile filter and
+    the probability metrics, then scores and ranks them. ``volatility`` is the
+    symbol's :class:`~options_wheel.volatility.VolatilityProfile`, which the
+    volatility forecast is drawn from.
+    """
+    price = symbol_data.get("price") or 0.0
+    iv_rank, iv_percentile, iv_observation_count = iv_stats
+
+    # The probability metrics are evaluated for all survivors in one array call.
+    drift = _real_world_drift(indicators)
+    forecast_vols = [
+        volatility.forecast(
+            contract_data.implied_volatility,
+            hv_weight=FORECAST_HV_WEIGHT,
+            iv_haircut=FORECAST_IV_HAIRCUT,
+        )
+        for contract_data, _, _ in pre_evaluated
+    ]
+    strikes = np.array([contract_data.strike for contract_data, _, _ in pre_evaluated], dtype=float)
+    net_premiums = np.array(
+        [_to_float(contract_data.net_premium) for contract_data, _, _ in pre_evaluated],
+        dtype=float,
+    )
+    t_years = np.array(
+        [
+            np.nan if context.t_years is None else context.t_years
+            for _, _, context in pre_evaluated
+        ],
+        dtype=float,
+    )
+    sigmas = np.array(forecast_vols, dtype=float)
+    expected_losses = expected_itm_payoff_array(
+        price, strikes, sigmas, t_years, drift, option_type=option_type
+    )
+    pops = probability_of_profit_array(
+        price, strikes, sigmas, t_years, drift, net_premiums, option_type=option_type
+    )
+    sigma_dists = sigma_distance_array(price, strikes, sigmas, t_years, option_type=option_type)
 
-    # Second pass: enrich with technical indicators + IV/HV percentile filter.
     passed_contracts = []
     near_contracts = []
-    for contract_data, failed in pre_evaluated:
+    for i, (contract_data, failed, _) in enumerate(pre_evaluated):
         if indicators:
-            contract_data["EMA50"] = _safe_round(indicators.get("ema50"))
-            contract_data["ADX"] = _safe_round(indicators.get("adx"))
-            contract_data["RSI"] = _safe_round(indicators.get("rsi"))
-            contract_data["RVI"] = _safe_round(indicators.get("rvi"))
-            contract_data["MACD"] = _safe_round(indicators.get("macd"), 3)
-            contract_data["Signal"] = _safe_round(indicators.get("signal"), 3)
+            contract_data.ema50 = _safe_round(indicators.get("ema50"))
+            contract_data.adx = _safe_round(indicators.get("adx"))
+            contract_data.rsi = _safe_round(indicators.get("rsi"))
+            contract_data.rvi = _safe_round(indicators.get("rvi"))
+            contract_data.macd = _safe_round(indicators.get("macd"), 3)
+            contract_data.signal = _safe_round(indicators.get("signal"), 3)
             if indicators.get("ema50") and indicators.get("price"):
                 diff_pct = (
                     (indicators["price"] - indicators["ema50"]) / indicators["ema50"]
                 ) * 100
-                contract_data["DiffPct"] = _safe_round(diff_pct)
+                contract_data.diff_pct = _safe_round(diff_pct)
 
-        iv = contract_data.get("ImpliedVolatility")
+        iv = contract_data.implied_volatility
         if indicators and iv is not None:
             iv_hv_percentile = compute_iv_hv_percentile(
                 iv, indicators.get("hv_low"), indicators.get("hv_high")
             )
-            contract_data["IVHVPercentile"] = _safe_round(iv_hv_percentile)
+            contract_data.iv_hv_percentile = _safe_round(iv_hv_percentile)
         else:
-            contract_data["IVHVPercentile"] = None
-
-        contract_data["ATMImpliedVolatility"] = _safe_round(atm_iv, 3)
-        contract_data["IVRank"] = _safe_round(iv_rank)
-        contract_data["IVPercentile"] = _safe_round(iv_percentile)
-        contract_data["IVRankObservationCount"] = iv_observation_count
-
-        dte = contract_data.get("DTE")
-        strike = contract_data.get("Strike")
-        net_premium = _to_float(contract_data.get("NetPremium"))
-        t_years = years_to_expiration(
-            _parse_expiration(contract_data.get("Expiration")),
-            now_dt,
-        )
-        forecast_vol = forecast_volatility(
-            iv,
-            indicators.get("hv_current") if indicators else None,
-            indicators.get("hv_long") if indicators else None,
-            hv_weight=FORECAST_HV_WEIGHT,
-            iv_haircut=FORECAST_IV_HAIRCUT,
-        )
+            contract_data.iv_hv_percentile = None
+
+        contract_data.atm_implied_volatility = _safe_round(atm_iv, 3)
+        contract_data.iv_rank = _safe_round(iv_rank)
+        contract_data.iv_percentile = _safe_round(iv_percentile)
+        contract_data.iv_rank_observation_count = iv_observation_count
+
+        dte = contract_data.dte
+        net_premium = _to_float(contract_data.net_premium)
+        forecast_vol = forecast_vols[i]
         vrp_ratio = variance_risk_premium(iv, forecast_vol)
-        drift = _real_world_drift(indicators)
-        expected_loss = expected_itm_payoff(
-            price,
-            strike,
-            forecast_vol,
-            t_years,
-            drift,
-            option_type=option_type,
-        )
-        pop = probability_of_profit(
-            price,
-            strike,
-            forecast_vol,
-            t_years,
-            drift,
-            net_premium,
-            option_type=option_type,
-        )
-        sigma_dist = sigma_distance(price, strike, forecast_vol, t_years, option_type=option_type)
+        expected_loss = _finite_or_none(expected_losses[i])
+        pop = _finite_or_none(pops[i])
+        sigma_dist = _finite_or_none(sigma_dists[i])
         risk_ratio = credit_risk_ratio(net_premium, expected_loss)
         ev = None
         if net_premium is not None and expected_loss is not None:
             ev = net_premium - expected_loss
 
-        contract_data["ForecastVol"] = _safe_round(forecast_vol, 3)
-        contract_data["VRPRatio"] = _safe_round(vrp_ratio, 3)
-        contract_data["SigmaDistance"] = _safe_round(sigma_dist, 3)
-        contract_data["CreditRiskRatio"] = _safe_round(risk_ratio, 3)
-        contract_data["PoP"] = _safe_round(pop * 100.0 if pop is not None else None, 1)
-        contract_data["EV"] = _safe_round(ev)
-        contract_data["ExpectedAssignmentLoss"] = _safe_round(expected_loss)
+        contract_data.forecast_vol = _safe_round(forecast_vol, 3)
+        contract_data.vrp_ratio = _safe_round(vrp_ratio, 3)
+        contract_data.sigma_distance = _safe_round(sigma_dist, 3)
+        contract_data.credit_risk_ratio = _safe_round(risk_ratio, 3)
+        contract_data.pop = _safe_round(pop * 100.0 if pop is not None else None, 1)
+        contract_data.ev = _safe_round(ev)
+        contract_data.expected_assignment_loss = _safe_round(expected_loss)
 
         effective_iv_rank = (
-            iv_rank if iv_rank is not None else contract_data.get("IVHVPercentile")
+            iv_rank if iv_rank is not None else contract_data.iv_hv_percentile
         )
         if effective_iv_rank is not None and effective_iv_rank < MIN_IV_RANK:
             failed.append(f"IVRank >= {MIN_IV_RANK:.0%}")
 
-        liquidity_score = min(contract_data["OpenInterest"] / 500, 1.0) * SCORE_WEIGHT_OI
-        liquidity_score += min(contract_data["Volume"] / 50, 1.0) * SCORE_WEIGHT_VOLUME
+        liquidity_score = min(contract_data.open_interest / 500, 1.0) * SCORE_WEIGHT_OI
+        liquidity_score += min(contract_data.volume / 50, 1.0) * SCORE_WEIGHT_VOLUME
         yield_score = 0.0
-        if contract_data.get("MonthlyYieldPct") is not None and TARGET_MONTHLY_YIELD_PCT > 0:
+        if contract_data.monthly_yield_pct is not None and TARGET_MONTHLY_YIELD_PCT > 0:
             yield_score = (
-                min(contract_data["MonthlyYieldPct"] / TARGET_MONTHLY_YIELD_PCT, 2.0)
+                min(contract_data.monthly_yield_pct / TARGET_MONTHLY_YIELD_PCT, 2.0)
                 * SCORE_WEIGHT_YIELD
             )
-        otm_score = min(max(contract_data["OTMPct"], 0) / 10, 1.0) * SCORE_WEIGHT_OTM
+        otm_score = min(max(contract_data.otm_pct, 0) / 10, 1.0) * SCORE_WEIGHT_OTM
         spread_score = 0.0
-        if contract_data.get("SpreadPct") is not None:
+        if contract_data.spread_pct is not None:
             spread_score = (
-                max(0.0, 1.0 - (contract_data["SpreadPct"] / MAX_SPREAD_PCT))
+                max(0.0, 1.0 - (contract_data.spread_pct / MAX_SPREAD_PCT))
                 * SCORE_WEIGHT_SPREAD
             )
         dte_mid = (MIN_DTE + MAX_DTE) / 2
         dte_score = max(0.0, 1.0 - abs(dte - dte_mid) / dte_mid) * SCORE_WEIGHT_DTE
         iv_score = _score_variance_risk_premium(vrp_ratio)
-        contract_data["Score"] = _safe_round(
+        contract_data.score = _safe_round(
             yield_score + otm_score + liquidity_score + spread_score + dte_score + iv_score
         )
-        contract_data["Status"] = "PASS" if len(failed) == 0 else "NEAR"
-        contract_data["Failed Criterion"] = failed[0] if len(failed) == 1 else ""
+        contract_data.status = "PASS" if len(failed) == 0 else "NEAR"
+        contract_data.failed_criterion = failed[0] if len(failed) == 1 else ""
 
         if len(failed) == 0:
             passed_contracts.append(contract_data)
@@ -1549,17 +2503,17 @@ def analyze_single_symbol_options(symbol_data, option_type="put"):
 
     passed_contracts.sort(
         key=lambda row: (
-            row.get("Score") or 0.0,
-            row.get("MonthlyYieldPct") or 0.0,
-            row.get("OpenInterest") or 0,
+            row.score or 0.0,
+            row.monthly_yield_pct or 0.0,
+            row.open_interest or 0,
         ),
         reverse=True,
     )
     near_contracts.sort(
         key=lambda row: (
-            row.get("Score") or 0.0,
-            row.get("MonthlyYieldPct") or 0.0,
-            row.get("OpenInterest") or 0,
+            row.score or 0.0,
+            row.monthly_yield_pct or 0.0,
+            row.open_interest or 0,
         ),
         reverse=True,
     )
@@ -1587,79 +2541,657 @@ def parse_args():
     parser.add_argument(
         "--type",
         dest="option_type",
-        choices=["put", "call"],
+        choices=["put", "call", "both"],
         default="put",
-        help="Type of options to analyze: 'put' (default) or 'call'.",
+        help=(
+            "Type of options to analyze: 'put' (default), 'call', or 'both' "
+            "(one pass over the shared quotes, history and chains)."
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "async", "staged"],
+        default="threads",
+        help=(
+            "Scan engine: 'threads' (default, MAX_WORKERS worker threads), "
+            "'async' (asyncio, many symbol pipelines in flight) or 'staged' "
+            "(MAX_WORKERS I/O threads feeding a pool of CPU worker processes)."
+        ),
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=CPU_WORKERS,
+        help=(
+            "Worker processes of the staged engine's CPU stage "
+            f"(default {CPU_WORKERS}; 0 runs it on one in-process thread)."
+        ),
+    )
+    parser.add_argument(
+        "--cpu-queue",
+        type=int,
+        default=CPU_QUEUE_SIZE,
+        help=(
+            "CPU tasks the staged engine queues before it stops starting new "
+            f"symbols (default {CPU_QUEUE_SIZE})."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ASYNC_CONCURRENCY,
+        help=(
+            "Symbol pipelines kept in flight by the asyncio engine "
+            f"(default {ASYNC_CONCURRENCY})."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Reuse symbols already analyzed by an interrupted scan with the same "
+            "scan date and screening config (checkpoint journal)."
+        ),
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help=(
+            "Split the tickers into this many shards by a stable symbol hash; "
+            "merge the shard files with 'python -m options_wheel.shards merge'."
+        ),
+    )
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="Shard scanned by this process, from 0 to --shard-count - 1.",
     )
     args = parser.parse_args()
+    if args.shard_count <= 0:
+        parser.error("--shard-count must be greater than 0")
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be in [0, --shard-count)")
     if args.top is not None and args.top <= 0:
         parser.error("-top/--top must be greater than 0")
+    if args.concurrency <= 0:
+        parser.error("--concurrency must be greater than 0")
+    if args.cpu_workers < 0:
+        parser.error("--cpu-workers must be 0 or greater")
+    if args.cpu_queue <= 0:
+        parser.error("--cpu-queue must be greater than 0")
     return args
 
 
-def deep_analysis(candidates, option_type="put"):
+def _print_progress(completed, total, symbol, analysis_start):
+    elapsed = time.time() - analysis_start
+    if completed > 0:
+        avg_time = elapsed / completed
+        eta_seconds = avg_time * (total - completed)
+        eta_str = format_eta(eta_seconds)
+    else:
+        eta_str = "--:--"
+    limiter = RATE_LIMITERS["options"]
+    msg = (
+        f"[{completed}/{total}] Options scan {symbol:<10} ETA: {eta_str} "
+        f"({limiter.rate:.1f} req/s, {limiter.queue_depth} queued)"
+    )
+    print(f"{msg:<80}", end="\r", flush=True)
+
+
+def _report_symbol_failure(symbol, error):
+    _bump_error_stat("symbol_analysis_exceptions")
+    print(f"\nError analyzing {symbol}: {error}")
+    if DEBUG:
+        traceback.print_exception(error)
+
+
+def _resumed_outcome(symbol, option_type):
+    """``(passed, near)`` of a symbol finished by an interrupted run, or ``None``.
+
+    The ATM IV that run recorded is put back into the IV history, which is only
+    saved once the scan completes.
+    """
+    if SCAN_JOURNAL is None:
+        return None
+    entry = SCAN_JOURNAL.get(symbol)
+    if entry is None:
+        return None
+    if CURRENT_SCAN_DATE and entry.get("atm_iv"):
+        IV_HISTORY_STORE.record(f"{symbol}|{option_type}", CURRENT_SCAN_DATE, entry["atm_iv"])
+    return entry["passed"], entry["near"]
+
+
+def _journal_outcome(symbol, option_type, outcome):
+    if SCAN_JOURNAL is None:
+        return
+    atm_iv = None
+    if CURRENT_SCAN_DATE:
+        atm_iv = IV_HISTORY_STORE.observation(f"{symbol}|{option_type}", CURRENT_SCAN_DATE)
+    passed_contracts, near_contracts = outcome
+    SCAN_JOURNAL.record(symbol, as_dicts(passed_contracts), as_dicts(near_contracts), atm_iv)
+
+
+def _collect_in_candidate_order(outcomes):
+    # Results are merged in candidate order rather than completion order so the
+    # stable sort in main() yields the same output whichever engine ran.
     results = []
     near_misses = []
+    for idx in sorted(outcomes):
+        passed_contracts, near_contracts = outcomes[idx]
+        results.extend(passed_contracts)
+        near_misses.extend(near_contracts)
+    return results, near_misses
 
+
+def deep_analysis(candidates, option_type="put"):
     total = len(candidates)
     type_label = option_type.upper()
     print(f"Analyzing {type_label} options for {total} candidates")
     analysis_start = time.time()
     completed = 0
+    outcomes = {}
 
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = {
-            executor.submit(analyze_single_symbol_options, c, option_type): idx
-            for idx, c in enumerate(candidates, 1)
-        }
+        futures = {}
+        for idx, c in enumerate(candidates):
+            resumed = _resumed_outcome(c["symbol"], option_type)
+            if resumed is not None:
+                outcomes[idx] = resumed
+                completed += 1
+                continue
+            futures[executor.submit(analyze_single_symbol_options, c, option_type)] = idx
 
         for future in as_completed(futures):
             idx = futures[future]
             completed += 1
-            elapsed = time.time() - analysis_start
-            if completed > 0:
-                avg_time = elapsed / completed
-                eta_seconds = avg_time * (total - completed)
-                eta_str = format_eta(eta_seconds)
+            symbol = candidates[idx]["symbol"]
+            _print_progress(completed, total, symbol, analysis_start)
+
+            try:
+                outcomes[idx] = future.result()
+            except Exception as e:
+                _report_symbol_failure(symbol, e)
             else:
-                eta_str = "--:--"
-            symbol = candidates[idx - 1]["symbol"]
-            msg = f"[{completed}/{total}] Options scan {symbol:<10} ETA: {eta_str}"
-            print(f"{msg:<60}", end="\r", flush=True)
+                _journal_outcome(symbol, option_type, outcomes[idx])
+
+    return _collect_in_candidate_order(outcomes)
+
+
+def deep_analysis_async(candidates, option_type="put", concurrency=ASYNC_CONCURRENCY):
+    """Asyncio engine: keeps up to ``concurrency`` symbol pipelines in flight.
+
+    Produces the same results as ``deep_analysis``; only the scheduling differs.
+    """
+    return asyncio.run(_deep_analysis_async(candidates, option_type, concurrency))
+
+
+def _install_http_executor(concurrency):
+    # requests is blocking, so the socket I/O itself runs in a pool sized to the
+    # number of pipelines; everything else (rate-limit waits, backoffs, parsing,
+    # contract evaluation) happens on the event loop.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ow-http")
+    )
+
 
+async def _deep_analysis_async(candidates, option_type, concurrency):
+    total = len(candidates)
+    type_label = option_type.upper()
+    print(
+        f"Analyzing {type_label} options for {total} candidates "
+        f"(asyncio engine, concurrency={concurrency})"
+    )
+    analysis_start = time.time()
+    completed = 0
+    outcomes = {}
+
+    _install_http_executor(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(idx, candidate):
+        async with semaphore:
             try:
-                passed_contracts, near_contracts = future.result()
-                results.extend(passed_contracts)
-                near_misses.extend(near_contracts)
+                steps = _symbol_analysis_steps(candidate, option_type)
+                return idx, await run_steps_async(steps), None
             except Exception as e:
-                _bump_error_stat("symbol_analysis_exceptions")
-                print(f"\nError analyzing {symbol}: {e}")
-                if DEBUG:
-                    traceback.print_exc()
+                return idx, None, e
 
-    return results, near_misses
+    tasks = []
+    for idx, c in enumerate(candidates):
+        resumed = _resumed_outcome(c["symbol"], option_type)
+        if resumed is not None:
+            outcomes[idx] = resumed
+            completed += 1
+        else:
+            tasks.append(asyncio.create_task(run_one(idx, c)))
+    for next_done in asyncio.as_completed(tasks):
+        idx, outcome, error = await next_done
+        completed += 1
+        symbol = candidates[idx]["symbol"]
+        _print_progress(completed, total, symbol, analysis_start)
+        if error is not None:
+            _report_symbol_failure(symbol, error)
+        else:
+            outcomes[idx] = outcome
+            _journal_outcome(symbol, option_type, outcome)
+
+    return _collect_in_candidate_order(outcomes)
+
+
+# The globals a CPU task reads: the screening settings init_screening_config
+# sets (or a caller overrides) and debug logging. Only these are copied into
+# worker processes; run-wide state such as PINNED_PAYLOADS stays here.
+CPU_WORKER_SETTINGS = (
+    "SCREENING_CONFIG",
+    "DEBUG",
+    "TARGET_MONTHLY_YIELD_PCT",
+    "PRICE_LIMIT",
+    "MIN_STOCK_AVG_VOLUME",
+    "MIN_MARKET_CAP",
+    "EXCLUDE_EARNINGS_BEFORE_EXPIRY",
+    "MIN_PREMIUM",
+    "MIN_DTE",
+    "MAX_DTE",
+    "MIN_OTM_PCT",
+    "MIN_OPEN_INTEREST",
+    "MIN_VOLUME",
+    "MAX_SPREAD_PCT",
+    "MIN_ABS_DELTA",
+    "MAX_ABS_DELTA",
+    "STRIKE_WINDOW_IV_MULTIPLE",
+    "SOLVE_STALE_IV",
+    "MAX_EXPIRATIONS_PER_SYMBOL",
+    "MAX_CONTRACTS_PER_SYMBOL",
+    "COMMISSION_PER_CONTRACT",
+    "SLIPPAGE_PCT_OF_SPREAD",
+    "MAX_SPREAD_ABS",
+    "RISK_FREE_RATE",
+    "DIVIDEND_YIELD",
+    "MIN_IV_RANK",
+    "FORECAST_HV_WEIGHT",
+    "FORECAST_IV_HAIRCUT",
+    "SCORE_WEIGHT_YIELD",
+    "SCORE_WEIGHT_OTM",
+    "SCORE_WEIGHT_OI",
+    "SCORE_WEIGHT_VOLUME",
+    "SCORE_WEIGHT_SPREAD",
+    "SCORE_WEIGHT_DTE",
+    "SCORE_WEIGHT_IV",
+)
+
+
+def _cpu_worker_config():
+    # The settings a worker process needs to evaluate contracts exactly like
+    # this one.
+    return {name: globals()[name] for name in CPU_WORKER_SETTINGS}
+
+
+def _init_cpu_worker(config):
+    globals().update(config)
+    set_worker_collector(_drain_error_stats)
+
+
+def _drain_error_stats():
+    with _error_stats_lock:
+        bumped = {key: count for key, count in _error_stats.items() if count}
+        for key in bumped:
+            _error_stats[key] = 0
+    return bumped
+
+
+def _merge_error_stats(bumped):
+    for key, count in bumped.items():
+        _bump_error_stat(key, count)
+
+
+def _cpu_executor(cpu_workers):
+    if cpu_workers <= 0:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="ow-cpu")
+    # Spawned rather than forked: the parent already runs I/O threads.
+    return ProcessPoolExecutor(
+        max_workers=cpu_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_cpu_worker,
+        initargs=(_cpu_worker_config(),),
+    )
+
+
+def _run_staged(jobs, on_result, cpu_workers, queue_size):
+    with _cpu_executor(cpu_workers) as cpu_executor:
+        run_staged(
+            jobs,
+            lambda *request: safe_get(*request),
+            cpu_executor,
+            on_result,
+            io_workers=MAX_WORKERS,
+            cpu_slots=max(cpu_workers, 1),
+            queue_size=queue_size,
+            metrics=STAGE_METRICS,
+            merge=_merge_error_stats,
+        )
+
+
+def _staged_label(cpu_workers, queue_size):
+    cpu = f"{cpu_workers} CPU processes" if cpu_workers > 0 else "in-process CPU thread"
+    return f"staged engine, {MAX_WORKERS} I/O threads, {cpu}, queue {queue_size}"
+
+
+def deep_analysis_staged(
+    candidates, option_type="put", cpu_workers=CPU_WORKERS, queue_size=CPU_QUEUE_SIZE
+):
+    """Staged engine: I/O threads fetch, a CPU stage evaluates (see ``stages``).
+
+    Produces the same results as ``deep_analysis``; only the scheduling differs.
+    """
+    total = len(candidates)
+    type_label = option_type.upper()
+    print(
+        f"Analyzing {type_label} options for {total} candidates "
+        f"({_staged_label(cpu_workers, queue_size)})"
+    )
+    analysis_start = time.time()
+    completed = 0
+    outcomes = {}
+
+    queued = []
+    for idx, c in enumerate(candidates):
+        resumed = _resumed_outcome(c["symbol"], option_type)
+        if resumed is not None:
+            outcomes[idx] = resumed
+            completed += 1
+        else:
+            queued.append((idx, c))
+
+    def on_result(idx, outcome, error):
+        nonlocal completed
+        completed += 1
+        symbol = candidates[idx]["symbol"]
+        _print_progress(completed, total, symbol, analysis_start)
+        if error is not None:
+            _report_symbol_failure(symbol, error)
+        else:
+            outcomes[idx] = outcome
+            _journal_outcome(symbol, option_type, outcome)
+
+    jobs = ((idx, _symbol_analysis_steps(c, option_type)) for idx, c in queued)
+    _run_staged(jobs, on_result, cpu_workers, queue_size)
+    return _collect_in_candidate_order(outcomes)
+
+
+def _shard_suffix():
+    return f".shard-{SHARD[0]}-of-{SHARD[1]}" if SHARD is not None else ""
+
+
+def _shared_chain_expirations(option_types):
+    return max(
+        validate_screening_config(
+            load_screening_config(DEFAULT_SCREENING_CONFIG, option_type=option_type)
+        )["MAX_EXPIRATIONS_PER_SYMBOL"]
+        for option_type in option_types
+    )
+
+
+class _StreamingScan:
+    """Bookkeeping for a scan whose Phase 1 quote batches feed Phase 2/3 directly.
+
+    Candidates are keyed by ``(batch index, position in batch)`` so results come
+    out in the same order as a sequential Phase 1 followed by ``deep_analysis``,
+    whatever order the batches and symbols finish in.
+    """
+
+    def __init__(self, option_type, analyze):
+        self.option_type = option_type
+        self.wanted = set(analyze)
+        self.quotes_by_batch = {}
+        self.candidates = {}
+        self.outcomes = {}
+        self.completed = 0
+        self.started = time.time()
+
+    def on_batch(self, batch_idx, records, error=None):
+        """Record a finished quote batch; return the ``(key, candidate)`` pairs to analyze."""
+        if error is not None:
+            _report_symbol_failure(f"quote batch {batch_idx + 1}", error)
+        self.quotes_by_batch[batch_idx] = records or []
+        admitted = []
+        for position, quote in enumerate(self.quotes_by_batch[batch_idx]):
+            if quote["symbol"] in self.wanted and _passes_price_filter(quote):
+                key = (batch_idx, position)
+                self.candidates[key] = quote
+                resumed = _resumed_outcome(quote["symbol"], self.option_type)
+                if resumed is not None:
+                    self.outcomes[key] = resumed
+                    self.completed += 1
+                else:
+                    admitted.append((key, quote))
+        return admitted
+
+    def on_symbol(self, key, outcome, error=None):
+        self.completed += 1
+        symbol = self.candidates[key]["symbol"]
+        _print_progress(self.completed, len(self.candidates), symbol, self.started)
+        if error is not None:
+            _report_symbol_failure(symbol, error)
+        else:
+            self.outcomes[key] = outcome
+            _journal_outcome(symbol, self.option_type, outcome)
+
+    def result(self):
+        quotes = [q for idx in sorted(self.quotes_by_batch) for q in self.quotes_by_batch[idx]]
+        candidates = [self.candidates[key] for key in sorted(self.candidates)]
+        return quotes, candidates, _collect_in_candidate_order(self.outcomes)
+
+
+def screen_and_analyze(tickers, option_type="put", analyze=None):
+    """Phases 1-3 with the thread engine, overlapped.
+
+    Up to ``QUOTE_BATCHES_IN_FLIGHT`` quote batches are fetched at a time under
+    the shared rate limiter and every candidate passing the price filter is
+    queued for options analysis as soon as its batch lands. ``analyze`` limits Phase 2/3 to a subset of
+    ``tickers`` (``--type both`` screens the union of both lists).
+
+    Returns ``(quotes, candidates, (results, near_misses))``.
+    """
+    scan = _StreamingScan(option_type, tickers if analyze is None else analyze)
+    batches = _quote_batches(tickers)
+    print(
+        f"Screening {len(batches)} quote batches; {option_type.upper()} options "
+        "analysis starts as candidates arrive"
+    )
+    queued_batches = enumerate(batches)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = {}
+
+        def submit_batch():
+            for idx, batch in queued_batches:
+                pending[executor.submit(run_steps, _quote_batch_steps(batch))] = ("batch", idx)
+                return
+
+        for _ in range(QUOTE_BATCHES_IN_FLIGHT):
+            submit_batch()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, key = pending.pop(future)
+                try:
+                    value, error = future.result(), None
+                except Exception as e:
+                    value, error = None, e
+                if kind == "batch":
+                    submit_batch()
+                    for candidate_key, candidate in scan.on_batch(key, value, error):
+                        future = executor.submit(
+                            analyze_single_symbol_options, candidate, option_type
+                        )
+                        pending[future] = ("symbol", candidate_key)
+                else:
+                    scan.on_symbol(key, value, error)
+    return scan.result()
+
+
+def screen_and_analyze_async(
+    tickers, option_type="put", analyze=None, concurrency=ASYNC_CONCURRENCY
+):
+    """Asyncio counterpart of ``screen_and_analyze``."""
+    return asyncio.run(
+        _screen_and_analyze_async(tickers, option_type, analyze, concurrency)
+    )
+
+
+async def _screen_and_analyze_async(tickers, option_type, analyze, concurrency):
+    scan = _StreamingScan(option_type, tickers if analyze is None else analyze)
+    batches = _quote_batches(tickers)
+    print(
+        f"Screening {len(batches)} quote batches; {option_type.upper()} options "
+        f"analysis starts as candidates arrive (asyncio engine, concurrency={concurrency})"
+    )
+    _install_http_executor(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(kind, key, steps):
+        async with semaphore:
+            try:
+                return kind, key, await run_steps_async(steps), None
+            except Exception as e:
+                return kind, key, None, e
+
+    queued_batches = enumerate(batches)
+    pending = set()
+
+    def start_batch():
+        for idx, batch in queued_batches:
+            pending.add(asyncio.create_task(run("batch", idx, _quote_batch_steps(batch))))
+            return
+
+    for _ in range(QUOTE_BATCHES_IN_FLIGHT):
+        start_batch()
+    while pending:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending -= done
+        for task in done:
+            kind, key, value, error = task.result()
+            if kind == "batch":
+                start_batch()
+                for candidate_key, candidate in scan.on_batch(key, value, error):
+                    steps = _symbol_analysis_steps(candidate, option_type)
+                    pending.add(asyncio.create_task(run("symbol", candidate_key, steps)))
+            else:
+                scan.on_symbol(key, value, error)
+    return scan.result()
+
+
+def screen_and_analyze_staged(
+    tickers, option_type="put", analyze=None, cpu_workers=CPU_WORKERS, queue_size=CPU_QUEUE_SIZE
+):
+    """Staged-engine counterpart of ``screen_and_analyze``."""
+    scan = _StreamingScan(option_type, tickers if analyze is None else analyze)
+    batches = _quote_batches(tickers)
+    print(
+        f"Screening {len(batches)} quote batches; {option_type.upper()} options "
+        f"analysis starts as candidates arrive ({_staged_label(cpu_workers, queue_size)})"
+    )
+
+    def on_result(job, value, error):
+        kind, key = job
+        if kind == "batch":
+            return [
+                (("symbol", candidate_key), _symbol_analysis_steps(candidate, option_type))
+                for candidate_key, candidate in scan.on_batch(key, value, error)
+            ]
+        scan.on_symbol(key, value, error)
+        return None
+
+    jobs = ((("batch", idx), _quote_batch_steps(batch)) for idx, batch in enumerate(batches))
+    _run_staged(jobs, on_result, cpu_workers, queue_size)
+    return scan.result()
 
 
 def main():
-    global CURRENT_SCAN_DATE, DEBUG
+    global CURRENT_SCAN_DATE, DEBUG, CACHE_PINNED_SINCE, SHARED_CHAIN_EXPIRATIONS, SHARD
     args = parse_args()
     DEBUG = args.debug
-    option_type = args.option_type
-    type_label = option_type.upper()
+    option_types = ["call", "put"] if args.option_type == "both" else [args.option_type]
     CURRENT_SCAN_DATE = datetime.now(timezone.utc).strftime("%Y-%m-%d")
 
-    # Re-initialize config for the chosen option type
-    init_screening_config(option_type)
-    _warn_if_config_is_overconstrained(SCREENING_CONFIG, option_type)
-
     if DEBUG:
         print("Debug logging enabled.")
 
-    print(f"Fetching {type_label} tickers...")
-    tickers = get_tickers(option_type)
-    if args.top is not None:
-        tickers = tickers[: args.top]
-        print(f"Limiting analysis to first {len(tickers)} tickers (-top={args.top}).")
+    tickers_by_type = {}
+    for option_type in option_types:
+        print(f"Fetching {option_type.upper()} tickers...")
+        tickers = get_tickers(option_type)
+        if args.top is not None:
+            tickers = tickers[: args.top]
+            print(f"Limiting analysis to first {len(tickers)} tickers (-top={args.top}).")
+        tickers_by_type[option_type] = tickers
+
+    if len(option_types) > 1:
+        # Each symbol's quote, history and (unfiltered) chain is downloaded
+        # once; the second scan reads them back from the response cache, or
+        # from memory when its TTL is disabled.
+        CACHE_PINNED_SINCE = time.time()
+        SHARED_CHAIN_EXPIRATIONS = _shared_chain_expirations(option_types)
+
+    # The first scan screens every ticker while it analyzes; later scans reuse
+    # its quotes.
+    all_tickers = list(
+        dict.fromkeys(ticker for tickers in tickers_by_type.values() for ticker in tickers)
+    )
+    ticker_order = {ticker: idx for idx, ticker in enumerate(all_tickers)}
+    if args.shard_count > 1:
+        SHARD = (args.shard_index, args.shard_count)
+        tickers_by_type = {
+            option_type: select_shard(tickers, *SHARD)
+            for option_type, tickers in tickers_by_type.items()
+        }
+        all_tickers = select_shard(all_tickers, *SHARD)
+        print(
+            f"Shard {args.shard_index + 1}/{args.shard_count}: "
+            f"{len(all_tickers)} tickers"
+        )
+
+    quotes = None
+    for option_type in option_types:
+        quotes = _scan_option_type(
+            option_type, tickers_by_type[option_type], args, quotes=quotes,
+            quote_tickers=all_tickers, ticker_order=ticker_order,
+        )
+
+    print_error_summary()
+    print_cache_summary()
+    print_rate_limit_summary()
+    print_stage_summary()
+
+
+def _scan_option_type(
+    option_type, tickers, args, quotes=None, quote_tickers=None, ticker_order=None
+):
+    """Phases 1-4 for one option type; returns the Phase 1 quotes.
+
+    Without ``quotes`` the quotes of ``quote_tickers`` (default ``tickers``) are
+    fetched while the candidates among them are analyzed. In shard mode the rows
+    go to a shard file instead, with each symbol's ``ticker_order`` position.
+    """
+    global SCAN_JOURNAL
+    type_label = option_type.upper()
+    init_screening_config(option_type)
+    _warn_if_config_is_overconstrained(SCREENING_CONFIG, option_type)
+
+    # Every finished symbol is journaled so an interrupted run can --resume.
+    SCAN_JOURNAL = ScanJournal(
+        os.path.join(CHECKPOINT_DIR, f"{option_type}_scan{_shard_suffix()}.jsonl"),
+        CURRENT_SCAN_DATE,
+        option_type,
+        config_hash(SCREENING_CONFIG, option_type),
+        encoder=NumpyEncoder,
+    ).open(resume=args.resume)
+    if SCAN_JOURNAL.entries:
+        print(
+            f"Resuming {type_label} scan: {len(SCAN_JOURNAL.entries)} symbols "
+            f"restored from {SCAN_JOURNAL.path}"
+        )
 
     print(
         f"Screen config ({type_label}): "
@@ -1675,33 +3207,125 @@ def main():
     )
 
     print(f"Phase 1: Screening {len(tickers)} tickers for price < ${PRICE_LIMIT}...")
-    candidates = batch_price_filter(tickers)
-    print(f"Found {len(candidates)} candidates.")
+    if quotes is None:
+        print(f"Phase 2 & 3: {type_label} options-first analysis, overlapped with Phase 1...")
+        quote_tickers = quote_tickers or tickers
+        if args.engine == "async":
+            quotes, candidates, (final_results, near_misses) = screen_and_analyze_async(
+                quote_tickers, option_type=option_type, analyze=tickers,
+                concurrency=args.concurrency,
+            )
+        elif args.engine == "staged":
+            quotes, candidates, (final_results, near_misses) = screen_and_analyze_staged(
+                quote_tickers, option_type=option_type, analyze=tickers,
+                cpu_workers=args.cpu_workers, queue_size=args.cpu_queue,
+            )
+        else:
+            quotes, candidates, (final_results, near_misses) = screen_and_analyze(
+                quote_tickers, option_type=option_type, analyze=tickers
+            )
+        print(f"\nFound {len(candidates)} candidates.")
+    else:
+        wanted = set(tickers)
+        candidates = [
+            quote for quote in quotes
+            if quote["symbol"] in wanted and _passes_price_filter(quote)
+        ]
+        print(f"Found {len(candidates)} candidates.")
+
+        print(f"Phase 2 & 3: {type_label} options-first analysis and filtering...")
+        if args.engine == "async":
+            final_results, near_misses = deep_analysis_async(
+                candidates, option_type=option_type, concurrency=args.concurrency
+            )
+        elif args.engine == "staged":
+            final_results, near_misses = deep_analysis_staged(
+                candidates, option_type=option_type,
+                cpu_workers=args.cpu_workers, queue_size=args.cpu_queue,
+            )
+        else:
+            final_results, near_misses = deep_analysis(candidates, option_type=option_type)
+
+    rows = final_results + near_misses
+    if SHARD is not None:
+        shard_index, shard_count = SHARD
+        path = write_shard(
+            shard_path(option_type, shard_index, shard_count, SHARD_DIR),
+            {
+                "scan_date": CURRENT_SCAN_DATE,
+                "option_type": option_type,
+                "shard_index": shard_index,
+                "shard_count": shard_count,
+                "config_hash": config_hash(SCREENING_CONFIG, option_type),
+                "screening_config": SCREENING_CONFIG,
+                "total_tickers": len(tickers),
+                "candidates": len(candidates),
+                "ticker_order": {
+                    c["symbol"]: (ticker_order or {}).get(c["symbol"], idx)
+                    for idx, c in enumerate(candidates)
+                },
+                "iv_observations": _iv_observations(candidates, option_type),
+                "rows": convert_numpy_types(rows),
+            },
+            encoder=NumpyEncoder,
+        )
+        print(f"\n{type_label} shard {shard_index + 1}/{shard_count} saved to {path}")
+    else:
+        print("Phase 4: Sorting and Reporting...")
+        save_scan_results(
+            option_type,
+            rows,
+            SCREENING_CONFIG,
+            total_tickers=len(tickers),
+            candidates_count=len(candidates),
+            scan_date=CURRENT_SCAN_DATE,
+        )
+    SCAN_JOURNAL.finish()
+    SCAN_JOURNAL = None
+    return quotes
 
-    print(f"Phase 2 & 3: {type_label} options-first analysis and filtering...")
-    final_results, near_misses = deep_analysis(candidates, option_type=option_type)
 
-    print("Phase 4: Sorting and Reporting...")
-    combined_results = final_results + near_misses
-    combined_results.sort(
+def _iv_observations(candidates, option_type):
+    observations = {}
+    for candidate in candidates:
+        key = f"{candidate['symbol']}|{option_type}"
+        atm_iv = IV_HISTORY_STORE.observation(key, CURRENT_SCAN_DATE)
+        if atm_iv is not None:
+            observations[key] = atm_iv
+    return observations
+
+
+def rank_scan_results(rows):
+    """PASS rows first, then by score and monthly yield; ties keep input order."""
+    return sorted(
+        rows,
         key=lambda x: (
             x["Status"] != "PASS",
             -(x.get("Score") or 0.0),
             -(x.get("MonthlyYieldPct") or 0.0),
-        )
+        ),
     )
+
+
+def save_scan_results(
+    option_type, rows, config, total_tickers, candidates_count, scan_date=None
+):
+    """Phase 4: rank ``rows``, build the portfolio, print the summary table and
+    write the results file, IV history and scan archive. Returns the output path."""
+    type_label = option_type.upper()
+    combined_results = rank_scan_results(rows)
     final_results = [row for row in combined_results if row["Status"] == "PASS"]
     sector_map = load_sector_map(os.path.join(DATA_INPUT_DIR, "sectors.json"))
     portfolio = build_portfolio(
         final_results,
-        SCREENING_CONFIG,
+        config,
         option_type=option_type,
         sector_map=sector_map,
     )
 
     if combined_results:
         print(f"\nFull {type_label} Summary Table (Options-first ranking):")
-        df = pd.DataFrame(combined_results)
+        df = pd.DataFrame(as_dicts(combined_results))
         # Reorder columns for better display
         cols = [
             "Symbol",
@@ -1743,8 +3367,6 @@ def main():
     else:
         print(f"\nNo {type_label} stocks matched the criteria or were near misses.")
 
-    print_error_summary()
-
     # Save results to JSON
     output_file = (
         os.path.join(DATA_OUTPUT_DIR, "call_results.json")
@@ -1754,16 +3376,16 @@ def main():
     output = {
         "timestamp": datetime.now().isoformat(),
         "option_type": option_type,
-        "total_tickers_analyzed": len(tickers),
-        "candidates_after_phase1": len(candidates),
+        "total_tickers_analyzed": total_tickers,
+        "candidates_after_phase1": candidates_count,
         "passed_all_criteria": len(final_results),
-        "near_misses": len(near_misses),
+        "near_misses": len(combined_results) - len(final_results),
         "screening_mode": "options-first",
-        "target_monthly_yield_pct": TARGET_MONTHLY_YIELD_PCT,
+        "target_monthly_yield_pct": config["TARGET_MONTHLY_YIELD_PCT"],
         "options_api_url": OPTIONS_URL,
-        "screening_config": SCREENING_CONFIG,
+        "screening_config": config,
         "portfolio": portfolio,
-        "results": combined_results,
+        "results": as_dicts(combined_results),
     }
     output = convert_numpy_types(output)
 
@@ -1771,10 +3393,11 @@ def main():
     with open(output_file, "w") as f:
         json.dump(output, f, indent=2, cls=NumpyEncoder)
     IV_HISTORY_STORE.save()
-    archive_path = archive_scan(combined_results, option_type=option_type)
+    archive_path = archive_scan(combined_results, option_type=option_type, scan_date=scan_date)
     print(f"\nResults saved to {output_file}")
     print(f"Portfolio selected {portfolio['position_count']} positions.")
     print(f"Archived scan to {archive_path}")
+    return output_file
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""Persistent daily OHLC bars so price history is downloaded only once.
+
+``fetch_historical_indicators`` needs a year of daily bars per surviving symbol,
+and every scan used to download the full window again even though all but the
+latest bar were already fetched the day before. This store keeps the bars in a
+SQLite file under ``data/history`` together with the date range each symbol is
+known to be complete for, so a scan only asks the API for the bars after the
+last stored one.
+
+Only *closed* bars (dated before today) are persisted. Today's bar is still
+moving while the market is open, so it is returned to the caller but fetched
+again on the next run.
+
+The store is transport-agnostic: ``missing_range`` says which dates to
+download and ``merge`` records whatever the caller fetched. ``load`` wires the
+two together for synchronous callers such as the check_option skill.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+from options_wheel.cache import execute_script, open_wal_connection
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_BAR_STORE_PATH = os.environ.get(
+    "OW_BAR_STORE_PATH", os.path.join(PROJECT_ROOT, "data", "history", "daily_bars.sqlite3")
+)
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    covered_from TEXT NOT NULL,
+    covered_to TEXT NOT NULL
+);
+"""
+
+
+def _shift(day, days):
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def normalize_quote(quote):
+    """``{"date": "YYYY-MM-DD", "open": ..., ...}`` from one API quote, or ``None``."""
+    if not isinstance(quote, dict):
+        return None
+    lowered = {str(k).lower(): v for k, v in quote.items()}
+    raw_date = lowered.get("date")
+    if not raw_date:
+        return None
+    bar = {"date": str(raw_date)[:10]}
+    for field in BAR_FIELDS:
+        value = lowered.get(field)
+        try:
+            bar[field] = float(value) if value is not None else None
+        except (TypeError, ValueError):
+            bar[field] = None
+    return bar
+
+
+class DailyBarStore:
+    """Thread-safe ``symbol -> daily bars`` store backed by SQLite."""
+
+    def __init__(self, path=DEFAULT_BAR_STORE_PATH, busy_timeout=30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_wal_connection(
+                self.path, self.busy_timeout, init=lambda conn: execute_script(conn, _SCHEMA)
+            )
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def coverage(self, symbol):
+        """``(covered_from, covered_to)`` of complete closed bars, or ``None``."""
+        row = self._connection().execute(
+            "SELECT covered_from, covered_to FROM coverage WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def missing_range(self, symbol, from_date, to_date, today=None):
+        """``(fetch_from, fetch_to)`` that must be downloaded, or ``None``.
+
+        A range reaching today always needs a fetch, because today's bar is
+        never persisted.
+        """
+        today = today or _today()
+        covered = self.coverage(symbol)
+        if covered is None or from_date < covered[0]:
+            return from_date, to_date
+        if to_date <= covered[1]:
+            return None
+        return max(from_date, _shift(covered[1], 1)), to_date
+
+    def merge(self, symbol, from_date, to_date, quotes, fetched_range, today=None):
+        """Persist the closed bars of a fetch and return ``from_date..to_date``.
+
+        ``quotes`` is the API quote list for ``fetched_range`` (``None`` when the
+        download failed, in which case only already stored bars are returned).
+        """
+        today = today or _today()
+        live = []
+        if fetched_range is not None and quotes is not None:
+            bars = [bar for bar in map(normalize_quote, quotes) if bar is not None]
+            closed = [bar for bar in bars if bar["date"] < today]
+            live = [bar for bar in bars if today <= bar["date"] <= to_date]
+            self._record(symbol, closed, fetched_range, today)
+        stored = self.bars(symbol, from_date, min(to_date, _shift(today, -1)))
+        return stored + live
+
+    def _record(self, symbol, closed_bars, fetched_range, today):
+        fetch_from, fetch_to = fetched_range
+        # Coverage ends at the last bar received, not at the end of the range
+        # asked for: an empty answer or a bar published late must be asked for
+        # again by the next missing_range.
+        received_through = max((bar["date"] for bar in closed_bars), default=None)
+        fetched_through = None
+        if received_through is not None:
+            fetched_through = min(fetch_to, _shift(today, -1), received_through)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (symbol, bar["date"], *(bar[field] for field in BAR_FIELDS))
+                    for bar in closed_bars
+                ],
+            )
+            covered = None
+            if fetched_through is not None and fetch_from <= fetched_through:
+                covered = conn.execute(
+                    "SELECT covered_from, covered_to FROM coverage WHERE symbol = ?",
+                    (symbol,),
+                ).fetchone()
+                if covered and fetch_from <= _shift(covered[1], 1) and covered[0] <= _shift(fetched_through, 1):
+                    covered = (min(covered[0], fetch_from), max(covered[1], fetched_through))
+                elif covered is None or fetched_through > covered[1]:
+                    # A single range is kept, so a disjoint fetch only replaces
+                    # the coverage when it reaches later bars.
+                    covered = (fetch_from, fetched_through)
+                else:
+                    covered = None
+            if covered is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage (symbol, covered_from, covered_to) "
+                    "VALUES (?, ?, ?)",
+                    (symbol, *covered),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def forget(self, symbol):
+        """Drop the stored bars of ``symbol``, e.g. after a split re-scaled them."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM bars WHERE symbol = ?", (symbol,))
+            conn.execute("DELETE FROM coverage WHERE symbol = ?", (symbol,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def bars(self, symbol, from_date, to_date):
+        rows = self._connection().execute(
+            "SELECT date, open, high, low, close, volume FROM bars "
+            "WHERE symbol = ? AND date >= ? AND date <= ? ORDER BY date",
+            (symbol, from_date, to_date),
+        ).fetchall()
+        return [dict(zip(("date",) + BAR_FIELDS, row)) for row in rows]
+
+    def load(self, symbol, from_date, to_date, fetch, today=None):
+        """Return bars for ``from_date..to_date``, downloading only what is missing.
+
+        ``fetch(fetch_from, fetch_to)`` must return the API quote list or ``None``.
+        """
+        fetched_range = self.missing_range(symbol, from_date, to_date, today=today)
+        quotes = fetch(*fetched_range) if fetched_range else None
+        return self.merge(symbol, from_date, to_date, quotes, fetched_range, today=today)
+
+
+def quotes_from_payload(data):
+    """Quote list from a historical-prices payload (``{"quotes": [...]}`` or a list)."""
+    if isinstance(data, dict):
+        data = data.get("quotes") or data.get("prices") or []
+    return data if isinstance(data, list) else None
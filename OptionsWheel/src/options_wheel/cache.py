@@ -0,0 +1,391 @@
+"""Single-file SQLite store for cached API responses.
+
+The screener used to write one ``.cache/<sha256>.json`` file per URL and test
+freshness with ``os.path.getmtime``; a full scan turned into thousands of tiny
+file opens, stats and unsynchronised writes from the worker threads. This store
+keeps every response in one SQLite database in WAL mode: readers never block the
+writer, concurrent threads and processes are serialised by SQLite itself, and the
+whole cache is a single file that CI can persist between runs.
+
+Each row stores the URL, the endpoint it belongs to, the fetch timestamp, the
+TTL it was written with and the zlib-compressed JSON payload. Freshness is
+decided at read time against the caller's current TTL; the stored TTL drives
+proactive expiry. Option chains are large and were never deleted, so the store
+also enforces a byte budget: expired rows go first, then the least recently
+used ones.
+
+A second table holds negative entries: URLs and symbols that answered with a
+client error or an empty option chain, kept for their own TTL so delisted
+tickers stop costing a rate-limited request on every run.
+
+Maintenance CLI::
+
+    python -m options_wheel.cache stats
+    python -m options_wheel.cache purge [--all]
+    python -m options_wheel.cache vacuum
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_CACHE_DIR = os.environ.get("OPTIONS_CACHE_DIR", os.path.join(PROJECT_ROOT, ".cache"))
+DEFAULT_CACHE_FILENAME = "responses.sqlite3"
+DEFAULT_MAX_BYTES = int(os.environ.get("OPTIONS_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# Eviction frees down to this share of the budget so it does not run on every write.
+EVICTION_LOW_WATERMARK = 0.9
+COMPRESSION_LEVEL = 6
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    ttl REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    raw_bytes INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE TABLE IF NOT EXISTS negative (
+    key TEXT PRIMARY KEY,
+    reason TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+_open_lock = threading.Lock()
+
+
+def open_wal_connection(path, busy_timeout=30.0, init=None):
+    """Open an autocommit SQLite connection in WAL mode, creating its directory.
+
+    ``init(conn)`` (typically creating the schema) runs in an immediate
+    transaction. Worker threads opening a new database at the same time then
+    wait for each other; a plain ``CREATE TABLE IF NOT EXISTS`` that has to
+    upgrade its read lock fails with "database is locked" without waiting.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _open_lock:
+        conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if init is not None:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                init(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+    return conn
+
+
+def execute_script(conn, script):
+    """Run the ``;``-separated statements of ``script`` in the current transaction.
+
+    ``executescript`` would commit it first.
+    """
+    for statement in script.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _create_schema(conn):
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        # Cached responses are disposable: rebuild rather than migrate.
+        conn.execute("DROP TABLE IF EXISTS responses")
+        conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+    execute_script(conn, _SCHEMA)
+
+
+class ResponseCache:
+    """Thread- and process-safe ``url -> JSON payload`` store backed by SQLite.
+
+    ``max_bytes`` caps the compressed payload size (0 disables the cap).
+    """
+
+    def __init__(self, path, busy_timeout=30.0, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.max_bytes = max(int(max_bytes or 0), 0)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened = False
+        self._stored_bytes = None
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "raw_bytes_written": 0,
+            "stored_bytes_written": 0,
+            "evictions": 0,
+            "expired_purged": 0,
+            "negative_hits": 0,
+        }
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads, so every
+        # thread lazily opens its own; WAL lets them read while another writes.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_wal_connection(self.path, self.busy_timeout, init=_create_schema)
+            self._local.conn = conn
+            with self._lock:
+                first_open = not self._opened
+                self._opened = True
+            if first_open:
+                # Expire proactively once per process instead of leaving stale
+                # rows on disk until something happens to overwrite them.
+                self._bump("expired_purged", self._delete_expired(conn, time.time()))
+        return conn
+
+    def _bump(self, key, amount=1):
+        with self._lock:
+            self._counters[key] += amount
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def get(self, url, max_age, now=None):
+        """Return the cached payload for ``url`` if fetched within ``max_age`` seconds."""
+        if max_age is None or max_age <= 0:
+            return None
+        now = time.time() if now is None else now
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT payload FROM responses WHERE url = ? AND fetched_at >= ?",
+            (url, now - max_age),
+        ).fetchone()
+        if row is None:
+            self._bump("misses")
+            return None
+        conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (now, url))
+        self._bump("hits")
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, url, payload, endpoint="other", ttl=0.0, now=None):
+        now = time.time() if now is None else now
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        blob = zlib.compress(raw, COMPRESSION_LEVEL)
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(url, endpoint, fetched_at, ttl, expires_at, last_access, raw_bytes, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, endpoint, now, float(ttl), now + float(ttl), now, len(raw), blob),
+        )
+        with self._lock:
+            self._counters["writes"] += 1
+            self._counters["raw_bytes_written"] += len(raw)
+            self._counters["stored_bytes_written"] += len(blob)
+            if self._stored_bytes is not None:
+                self._stored_bytes += len(blob)
+            over_budget = self._over_budget()
+        if over_budget:
+            self.enforce_budget(now=now)
+
+    def put_negative(self, key, reason, ttl, now=None):
+        """Remember that ``key`` failed with ``reason`` for ``ttl`` seconds."""
+        if ttl is None or ttl <= 0:
+            return
+        now = time.time() if now is None else now
+        self._connection().execute(
+            "INSERT OR REPLACE INTO negative (key, reason, recorded_at, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, reason, now, now + float(ttl)),
+        )
+
+    def get_negative(self, key, now=None):
+        """Return the recorded failure reason for ``key`` while it is live, else ``None``."""
+        now = time.time() if now is None else now
+        row = self._connection().execute(
+            "SELECT reason FROM negative WHERE key = ? AND expires_at >= ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        self._bump("negative_hits")
+        return row[0]
+
+    def forget_negative(self, keys):
+        """Drop the negative entries of ``keys``."""
+        keys = list(keys)
+        if keys:
+            self._connection().execute(
+                f"DELETE FROM negative WHERE key IN ({','.join('?' * len(keys))})", keys
+            )
+
+    def _over_budget(self):
+        return bool(self.max_bytes) and (
+            self._stored_bytes is None or self._stored_bytes > self.max_bytes
+        )
+
+    @staticmethod
+    def _delete_expired(conn, now):
+        conn.execute("DELETE FROM negative WHERE expires_at < ?", (now,))
+        return conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,)).rowcount
+
+    def enforce_budget(self, now=None):
+        """Expire stale rows, then evict least recently used ones until the
+        compressed payload total is back under the budget. Returns evictions."""
+        conn = self._connection()
+        now = time.time() if now is None else now
+        total = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        if self.max_bytes and total > self.max_bytes:
+            self._bump("expired_purged", self._delete_expired(conn, now))
+            total = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM responses"
+            ).fetchone()[0]
+        if self.max_bytes and total > self.max_bytes:
+            target = self.max_bytes * EVICTION_LOW_WATERMARK
+            victims = []
+            for url, size in conn.execute(
+                "SELECT url, LENGTH(payload) FROM responses ORDER BY last_access, url"
+            ):
+                if total <= target:
+                    break
+                victims.append((url,))
+                total -= size
+            conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+            evicted = len(victims)
+            self._bump("evictions", evicted)
+        with self._lock:
+            self._stored_bytes = total
+        return evicted
+
+    def purge(self, expired_only=True, now=None):
+        """Delete expired rows (or every row) and return how many were removed.
+
+        Expired-only purges also apply the byte budget.
+        """
+        conn = self._connection()
+        if expired_only:
+            now = time.time() if now is None else now
+            removed = self._delete_expired(conn, now)
+            removed += self.enforce_budget(now=now)
+        else:
+            removed = conn.execute("DELETE FROM responses").rowcount
+            removed += conn.execute("DELETE FROM negative").rowcount
+            with self._lock:
+                self._stored_bytes = 0
+        return removed
+
+    def run_stats(self):
+        """Counters accumulated by this process (hits, bytes saved, evictions...)."""
+        with self._lock:
+            stats = dict(self._counters)
+        stats["bytes_saved"] = stats["raw_bytes_written"] - stats["stored_bytes_written"]
+        return stats
+
+    def vacuum(self):
+        conn = self._connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+
+    def stats(self, now=None):
+        now = time.time() if now is None else now
+        conn = self._connection()
+        by_endpoint = {}
+        for endpoint, count, payload_bytes, raw_bytes, expired in conn.execute(
+            "SELECT endpoint, COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), "
+            "COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(expires_at < ?), 0) "
+            "FROM responses GROUP BY endpoint ORDER BY endpoint",
+            (now,),
+        ):
+            by_endpoint[endpoint] = {
+                "entries": count,
+                "payload_bytes": payload_bytes,
+                "raw_bytes": raw_bytes,
+                "expired": expired,
+            }
+        negative = conn.execute(
+            "SELECT COUNT(*) FROM negative WHERE expires_at >= ?", (now,)
+        ).fetchone()[0]
+        file_bytes = sum(
+            os.path.getsize(path)
+            for path in (self.path, f"{self.path}-wal")
+            if os.path.exists(path)
+        )
+        return {
+            "path": self.path,
+            "entries": sum(v["entries"] for v in by_endpoint.values()),
+            "payload_bytes": sum(v["payload_bytes"] for v in by_endpoint.values()),
+            "raw_bytes": sum(v["raw_bytes"] for v in by_endpoint.values()),
+            "max_bytes": self.max_bytes,
+            "expired": sum(v["expired"] for v in by_endpoint.values()),
+            "file_bytes": file_bytes,
+            "negative": negative,
+            "by_endpoint": by_endpoint,
+        }
+
+
+def _print_stats(stats):
+    print(f"Cache file: {stats['path']} ({stats['file_bytes']:,} bytes on disk)")
+    budget = f"{stats['max_bytes']:,} bytes" if stats["max_bytes"] else "unlimited"
+    print(
+        f"Entries: {stats['entries']:,} | payload {stats['payload_bytes']:,} bytes "
+        f"({stats['raw_bytes']:,} uncompressed, budget {budget}) | "
+        f"expired {stats['expired']:,} | negative {stats['negative']:,}"
+    )
+    for endpoint, item in stats["by_endpoint"].items():
+        print(
+            f"- {endpoint}: {item['entries']:,} entries, "
+            f"{item['payload_bytes']:,} bytes ({item['raw_bytes']:,} uncompressed), "
+            f"{item['expired']:,} expired"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the API response cache.")
+    parser.add_argument("command", choices=["stats", "vacuum", "purge"])
+    parser.add_argument(
+        "--path",
+        default=os.path.join(DEFAULT_CACHE_DIR, DEFAULT_CACHE_FILENAME),
+        help="Cache database (default: .cache/responses.sqlite3).",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="With 'purge', delete every entry instead of only expired ones.",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Byte budget applied by 'purge' (default OPTIONS_CACHE_MAX_BYTES or 256 MiB).",
+    )
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.path, max_bytes=args.max_bytes)
+    if args.command == "stats":
+        _print_stats(cache.stats())
+    elif args.command == "purge":
+        removed = cache.purge(expired_only=not args.all)
+        print(f"Removed {removed:,} cache entries.")
+    else:
+        cache.vacuum()
+        print(f"Vacuumed {args.path}.")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
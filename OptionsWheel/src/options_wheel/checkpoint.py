@@ -0,0 +1,112 @@
+"""Append-only journal of finished symbol analyses, for resuming a scan.
+
+Results used to exist only in memory until ``main`` wrote ``put_results.json``
+at the very end, so a cancelled or crashed CI run threw away every completed
+analysis. The journal is a JSON-lines file: a header with the scan date, option
+type and a hash of the screening config, then one line per finished symbol with
+its PASS and NEAR rows and the ATM IV recorded for it. Lines are flushed as
+they are written, so an interrupted process leaves at most one torn line, which
+``load`` skips.
+
+A journal is only resumed when the scan date and config hash match; a finished
+scan removes its journal so a later run on the same day starts over.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_CHECKPOINT_DIR = os.environ.get(
+    "OW_CHECKPOINT_DIR", os.path.join(PROJECT_ROOT, ".cache", "checkpoints")
+)
+
+
+def config_hash(config, option_type):
+    """Stable short hash of a screening config and option type."""
+    blob = json.dumps({"option_type": option_type, "config": config}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class ScanJournal:
+    """Thread-safe checkpoint journal for one option-type scan."""
+
+    def __init__(self, path, scan_date, option_type, config_digest, encoder=None):
+        self.path = path
+        self.encoder = encoder
+        self.header = {
+            "scan_date": scan_date,
+            "option_type": option_type,
+            "config_hash": config_digest,
+        }
+        self._lock = threading.Lock()
+        self._file = None
+        self.entries = {}
+
+    def open(self, resume=False):
+        """Start the journal; with ``resume`` keep the entries of a matching one."""
+        self.entries = self.load() if resume else {}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.entries:
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write(self.header)
+        return self
+
+    def load(self):
+        """Entries of the journal on disk, or ``{}`` when it belongs to another scan."""
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = iter(f)
+                try:
+                    header = json.loads(next(lines))
+                except (StopIteration, ValueError):
+                    return {}
+                if header != self.header:
+                    return {}
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                        entries[entry["symbol"]] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn final line of an interrupted run
+        except OSError:
+            return {}
+        return entries
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":"), cls=self.encoder) + "\n")
+        self._file.flush()
+
+    def record(self, symbol, passed, near, atm_iv=None):
+        entry = {"symbol": symbol, "passed": passed, "near": near, "atm_iv": atm_iv}
+        with self._lock:
+            self.entries[symbol] = entry
+            if self._file is not None:
+                self._write(entry)
+
+    def get(self, symbol):
+        with self._lock:
+            return self.entries.get(symbol)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Close and delete the journal once the scan's results are saved."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,141 @@
+"""Persistent per-symbol indicator state so daily scans only apply new bars.
+
+EMA, RSI, ADX, RVI and MACD are recursive filters: today's value depends only
+on yesterday's filter state and today's bar. ``IndicatorStateStore`` keeps the
+:class:`~options_wheel.indicators.IndicatorState` of every symbol as of its
+last *closed* bar, in a SQLite file next to the daily bar store. A scan loads
+the state, asks the bar store for the bars after ``last_date`` only and
+advances the state by those.
+
+The state is rebuilt from the full history window when it cannot be continued:
+it is missing, from another format version, older than the window, or the bar
+it stops at is no longer the first bar returned (a gap, or the stored bars were
+replaced). A close-to-close jump that looks like a split, or new bars that skip
+more weekdays than a market holiday explains, also force a rebuild from freshly
+downloaded bars; see ``split_suspected`` and ``sessions_missing``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+from options_wheel.cache import execute_script, open_wal_connection
+from options_wheel.indicators import IndicatorState
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_INDICATOR_STATE_PATH = os.environ.get(
+    "OW_INDICATOR_STATE_PATH",
+    os.path.join(PROJECT_ROOT, "data", "history", "indicator_state.sqlite3"),
+)
+
+# Daily moves beyond these ratios are treated as a split or reverse split.
+SPLIT_RATIO_HIGH = 1.8
+SPLIT_RATIO_LOW = 1.0 / SPLIT_RATIO_HIGH
+# Weekdays two consecutive bars may skip: one holiday. More than that means the
+# vendor left out a session.
+MAX_SKIPPED_WEEKDAYS = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS indicator_state (
+    symbol TEXT PRIMARY KEY,
+    last_date TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+"""
+
+
+def continues(state, bars):
+    """Whether ``bars`` starts with the exact bar ``state`` stops at."""
+    if not bars or state.last_bar is None:
+        return False
+    first = bars[0]
+    if str(first.get("date"))[:10] != state.last_date:
+        return False
+    return tuple(first.get(key) for key in ("high", "low", "close")) == state.last_bar
+
+
+def split_suspected(bars):
+    """Whether consecutive closes in ``bars`` jump by a split-like ratio."""
+    previous = None
+    for bar in bars:
+        close = bar.get("close")
+        if close is None or not close > 0:
+            continue
+        if previous is not None:
+            ratio = close / previous
+            if ratio >= SPLIT_RATIO_HIGH or ratio <= SPLIT_RATIO_LOW:
+                return True
+        previous = close
+    return False
+
+
+def sessions_missing(bars):
+    """Whether consecutive bars in ``bars`` skip more weekdays than a holiday."""
+    previous = None
+    for bar in bars:
+        day = date.fromisoformat(str(bar.get("date"))[:10])
+        if previous is not None:
+            skipped = sum(
+                1
+                for offset in range(1, (day - previous).days)
+                if (previous + timedelta(days=offset)).weekday() < 5
+            )
+            if skipped > MAX_SKIPPED_WEEKDAYS:
+                return True
+        previous = day
+    return False
+
+
+class IndicatorStateStore:
+    """Thread-safe ``symbol -> IndicatorState`` store backed by SQLite."""
+
+    def __init__(self, path=DEFAULT_INDICATOR_STATE_PATH, busy_timeout=30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = open_wal_connection(
+                self.path, self.busy_timeout, init=lambda conn: execute_script(conn, _SCHEMA)
+            )
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def load(self, symbol):
+        """The saved state of ``symbol``, or ``None`` if absent or unreadable."""
+        row = self._connection().execute(
+            "SELECT state FROM indicator_state WHERE symbol = ?", (symbol,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            return IndicatorState.from_dict(json.loads(row[0]))
+        except (ValueError, TypeError, KeyError):
+            return None
+
+    def save(self, symbol, state):
+        if state.last_date is None:
+            return
+        # NaN is valid in a filter (nothing observed yet) and survives the
+        # round trip as the JSON extension token.
+        payload = json.dumps(state.to_dict(), allow_nan=True, separators=(",", ":"))
+        self._connection().execute(
+            "INSERT OR REPLACE INTO indicator_state (symbol, last_date, state) VALUES (?, ?, ?)",
+            (symbol, state.last_date, payload),
+        )
+
+    def delete(self, symbol):
+        self._connection().execute("DELETE FROM indicator_state WHERE symbol = ?", (symbol,))
+
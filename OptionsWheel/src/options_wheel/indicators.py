@@ -0,0 +1,336 @@
+"""Technical indicators computed in one pass over contiguous float64 arrays.
+
+``indicators_from_history`` only needs the *last* value of EMA50, RSI, ADX, RVI
+and MACD/signal, yet the pandas versions (``calculate_*`` in ``analysis``) each
+build their own Series pipeline, and ADX copies the whole frame to add six
+columns. Every one of those indicators is a recursive exponential filter, so
+here the per-bar inputs (close changes, directional movement, true range, the
+RVI standard deviation) are derived with NumPy array operations and a single
+loop then advances all the filters together.
+
+The filters reproduce pandas ``ewm(..., adjust=False).mean()`` step by step,
+including how it carries weights across NaN observations and how it turns
+``span``/``alpha`` into a smoothing factor, so the results agree with the
+pandas versions to floating-point noise (``tests/test_indicators.py``).
+
+Because the filters are recursive, everything needed to continue them fits in
+an :class:`IndicatorState`: the filter values, the previous bar, the last
+closes of the RVI window and the per-bar returns and ranges of the volatility
+window (summarised by :mod:`options_wheel.volatility`). Advancing a
+state bar by bar or in chunks gives the same numbers as one pass over all bars,
+so a state saved after yesterday's close only has to be fed today's bars.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from options_wheel.volatility import realized_volatility
+
+MIN_BARS = 50
+BAR_COLUMNS = ("high", "low", "close")
+# Parsed when present but not required; NaN where missing.
+OPTIONAL_COLUMNS = ("open",)
+RVI_STD_PERIOD = 10
+
+_FILTER_SPANS = {"ema50": 50, "ema12": 12, "ema26": 26, "signal": 9}
+_WILDER_FILTERS = (
+    "avg_gain",
+    "avg_loss",
+    "atr",
+    "plus_dm",
+    "minus_dm",
+    "adx",
+    "rvi_up",
+    "rvi_down",
+)
+
+
+def _alpha(span=None, alpha=None):
+    # pandas goes through the centre of mass, which is not always bit-identical
+    # to 2 / (span + 1) or to the alpha it was given.
+    com = (span - 1) / 2 if span is not None else (1 - alpha) / alpha
+    return 1.0 / (1.0 + float(com))
+
+
+class _Ewm:
+    """``Series.ewm(alpha=..., adjust=False).mean()`` one observation at a time."""
+
+    __slots__ = ("alpha", "old_factor", "value", "old_weight")
+
+    def __init__(self, alpha, value=math.nan, old_weight=1.0):
+        self.alpha = alpha
+        self.old_factor = 1.0 - alpha
+        self.value = value
+        self.old_weight = old_weight
+
+    def update(self, observation):
+        value = self.value
+        if value == value:
+            self.old_weight *= self.old_factor
+            if observation == observation:
+                if value != observation:
+                    self.value = (self.old_weight * value + self.alpha * observation) / (
+                        self.old_weight + self.alpha
+                    )
+                self.old_weight = 1.0
+        elif observation == observation:
+            self.value = observation
+        return self.value
+
+
+def _numeric(value):
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _parse_bars(quotes, columns):
+    rows = []
+    seen = set()
+    for row in quotes:
+        if not isinstance(row, dict):
+            continue
+        if not row.keys() >= set(columns):
+            row = {str(key).lower(): value for key, value in row.items()}
+        seen.update(key for key in columns if key in row)
+        rows.append(row)
+    if not seen >= set(columns):
+        return None
+
+    parsed_columns = BAR_COLUMNS + OPTIONAL_COLUMNS
+    values = np.array(
+        [[_numeric(row.get(key)) for key in parsed_columns] for row in rows], dtype=np.float64
+    ).reshape(-1, len(parsed_columns))
+    keep = ~np.isnan(values[:, : len(BAR_COLUMNS)]).any(axis=1)
+    parsed = [np.ascontiguousarray(values[keep, i]) for i in range(len(parsed_columns))]
+    if "date" in columns:
+        parsed.insert(0, [str(row.get("date"))[:10] for row, kept in zip(rows, keep) if kept])
+    return tuple(parsed)
+
+
+def bar_arrays(quotes):
+    """``(high, low, close, open)`` float64 arrays from API quote rows, oldest first.
+
+    Keys are matched case-insensitively and rows with a missing or non-numeric
+    high, low or close are dropped; a missing open is NaN. Returns ``None`` when
+    a required column is absent from every row.
+    """
+    return _parse_bars(quotes, BAR_COLUMNS)
+
+
+def dated_bar_arrays(bars):
+    """``(dates, high, low, close, open)`` from dated bars, as :func:`bar_arrays`."""
+    return _parse_bars(bars, ("date",) + BAR_COLUMNS)
+
+
+def _rolling_std(values, window):
+    std = np.full_like(values, np.nan)
+    if len(values) >= window:
+        std[window - 1 :] = np.lib.stride_tricks.sliding_window_view(values, window).std(
+            axis=1, ddof=1
+        )
+    return std
+
+
+def _finite(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+class IndicatorState:
+    """Indicator filters advanced through a symbol's daily bars.
+
+    ``last_date``/``last_bar`` identify the bar the state stops at, so a caller
+    can check that the bars it is about to apply continue that one.
+    """
+
+    VERSION = 2
+
+    def __init__(self, period=14):
+        self.period = period
+        wilder = _alpha(alpha=1 / period)
+        self.filters = {name: _Ewm(_alpha(span=span)) for name, span in _FILTER_SPANS.items()}
+        self.filters.update((name, _Ewm(wilder)) for name in _WILDER_FILTERS)
+        self.macd = math.nan
+        self.bar_count = 0
+        self.last_date = None
+        self.last_bar = None
+        # The closes before the next bar's RVI window, and per bar of the
+        # realised-volatility window its date, log return, ln(H/L) and ln(C/O)
+        # (NaN where not available).
+        self.closes = []
+        self.return_dates = []
+        self.returns = []
+        self.ranges = []
+        self.bodies = []
+
+    def advance(self, high, low, close, opens=None, dates=None, returns_from=None):
+        """Apply bars (oldest first) and drop the volatility window before ``returns_from``."""
+        high = np.ascontiguousarray(high, dtype=np.float64)
+        low = np.ascontiguousarray(low, dtype=np.float64)
+        close = np.ascontiguousarray(close, dtype=np.float64)
+        if opens is None:
+            opens = np.full_like(close, np.nan)
+        if len(close):
+            self._advance(high, low, close, np.asarray(opens, dtype=np.float64), dates)
+        if returns_from is not None:
+            start = next(
+                (i for i, day in enumerate(self.return_dates) if day >= returns_from),
+                len(self.return_dates),
+            )
+            del self.return_dates[:start], self.returns[:start]
+            del self.ranges[:start], self.bodies[:start]
+        return self
+
+    def _advance(self, high, low, close, opens, dates):
+        prev_high, prev_low, prev_close = self.last_bar or (math.nan,) * 3
+
+        # Per-bar filter inputs, as array operations. Comparisons against a NaN
+        # previous bar are False, which is what the pandas versions rely on too.
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change = np.diff(close, prepend=prev_close)
+            gain = np.where(change > 0, change, 0.0)
+            loss = np.where(change < 0, -change, 0.0)
+
+            up_move = np.diff(high, prepend=prev_high)
+            down_move = -np.diff(low, prepend=prev_low)
+            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+            previous = np.concatenate(([prev_close], close[:-1]))
+            true_range = np.maximum(
+                high - low, np.maximum(np.abs(high - previous), np.abs(low - previous))
+            )
+
+            window = np.concatenate((self.closes, close))
+            std10 = _rolling_std(window, RVI_STD_PERIOD)[len(self.closes) :]
+            rvi_up = np.where(change > 0, std10, 0.0)
+            rvi_down = np.where(change < 0, std10, 0.0)
+
+            log_returns = np.log(close / previous)
+            log_ranges = np.log(high / low)
+            log_bodies = np.log(close / opens)
+
+        f = self.filters
+        ema50, ema12, ema26, signal = f["ema50"], f["ema12"], f["ema26"], f["signal"]
+        avg_gain, avg_loss, avg_up, avg_down = f["avg_gain"], f["avg_loss"], f["rvi_up"], f["rvi_down"]
+        atr, plus_sm, minus_sm, adx = f["atr"], f["plus_dm"], f["minus_dm"], f["adx"]
+
+        # One pass advancing every recursive filter.
+        macd = self.macd
+        for c, g, l, tr, pdm, mdm, up, down in zip(
+            close.tolist(),
+            gain.tolist(),
+            loss.tolist(),
+            true_range.tolist(),
+            plus_dm.tolist(),
+            minus_dm.tolist(),
+            rvi_up.tolist(),
+            rvi_down.tolist(),
+        ):
+            ema50.update(c)
+            macd = ema12.update(c) - ema26.update(c)
+            signal.update(macd)
+            avg_gain.update(g)
+            avg_loss.update(l)
+            avg_up.update(up)
+            avg_down.update(down)
+
+            atr_value = atr.update(tr)
+            plus_value = plus_sm.update(pdm)
+            minus_value = minus_sm.update(mdm)
+            if atr_value == atr_value and atr_value != 0:
+                plus_di = 100 * (plus_value / atr_value)
+                minus_di = 100 * (minus_value / atr_value)
+            else:
+                plus_di = minus_di = 0.0
+            di_sum = plus_di + minus_di
+            adx.update(100 * abs(plus_di - minus_di) / di_sum if di_sum != 0 else 0.0)
+
+        self.macd = macd
+        self.bar_count += len(close)
+        self.last_bar = (float(high[-1]), float(low[-1]), float(close[-1]))
+        self.last_date = dates[-1] if dates is not None else None
+        self.closes = window[-(RVI_STD_PERIOD - 1) :].tolist()
+        self.returns.extend(log_returns.tolist())
+        self.ranges.extend(log_ranges.tolist())
+        self.bodies.extend(log_bodies.tolist())
+        self.return_dates.extend(dates if dates is not None else [""] * len(close))
+
+    def indicators(self):
+        """Indicator dict as of the last bar, or ``None`` below ``MIN_BARS`` bars.
+
+        Keys match ``analysis.indicators_from_history``: ``ema50``, ``rsi``,
+        ``adx``, ``rvi``, ``macd``, ``signal``, ``price`` plus the
+        realised-volatility statistics.
+        """
+        if self.bar_count < MIN_BARS:
+            return None
+        f = self.filters
+        avg_gain, avg_loss = f["avg_gain"].value, f["avg_loss"].value
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss)) if avg_loss != 0 else 100.0
+        avg_up, avg_down = f["rvi_up"].value, f["rvi_down"].value
+        rvi_sum = avg_up + avg_down
+        rvi = 100 * (avg_up / rvi_sum) if rvi_sum != 0 else math.nan
+
+        return {
+            "ema50": _finite(f["ema50"].value),
+            "rsi": _finite(rsi),
+            "adx": _finite(f["adx"].value),
+            "rvi": _finite(rvi),
+            "macd": _finite(self.macd),
+            "signal": _finite(f["signal"].value),
+            "price": self.last_bar[2],
+            **self.volatility().as_indicators(),
+        }
+
+    def volatility(self):
+        """:class:`~options_wheel.volatility.VolatilityProfile` of the window."""
+        return realized_volatility(self.returns, self.ranges, self.bodies)
+
+    def copy(self):
+        return IndicatorState.from_dict(self.to_dict())
+
+    def to_dict(self):
+        return {
+            "version": self.VERSION,
+            "period": self.period,
+            "filters": {name: [ewm.value, ewm.old_weight] for name, ewm in self.filters.items()},
+            "macd": self.macd,
+            "bar_count": self.bar_count,
+            "last_date": self.last_date,
+            "last_bar": list(self.last_bar) if self.last_bar else None,
+            "closes": list(self.closes),
+            "return_dates": list(self.return_dates),
+            "returns": list(self.returns),
+            "ranges": list(self.ranges),
+            "bodies": list(self.bodies),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a state saved by :meth:`to_dict`; ``None`` if it is from another version."""
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return None
+        state = cls(period=data["period"])
+        for name, (value, old_weight) in data["filters"].items():
+            state.filters[name].value = value
+            state.filters[name].old_weight = old_weight
+        state.macd = data["macd"]
+        state.bar_count = data["bar_count"]
+        state.last_date = data["last_date"]
+        state.last_bar = tuple(data["last_bar"]) if data["last_bar"] else None
+        state.closes = list(data["closes"])
+        state.return_dates = list(data["return_dates"])
+        state.returns = list(data["returns"])
+        state.ranges = list(data["ranges"])
+        state.bodies = list(data["bodies"])
+        return state
+
+
+def compute_indicators(high, low, close, opens=None, period=14):
+    """Indicator dict for daily bars (oldest first), or ``None`` below ``MIN_BARS``."""
+    return IndicatorState(period=period).advance(high, low, close, opens).indicators()
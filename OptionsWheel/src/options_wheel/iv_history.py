@@ -11,18 +11,92 @@ Yahoo does not expose historical implied volatility, so we build it ourselves:
 every scan records the ATM implied volatility of each analysed symbol, and once
 enough observations have accumulated a real IV Rank / IV Percentile can be
 computed. The store is a single JSON file so it can be cached between CI runs.
+
+``rank`` runs once per symbol per scan, so each store keeps the lookback
+window of every ranked series sorted by value. The window's min and max are
+its ends, and the percentile is a bisection. A new latest observation is
+folded in by inserting it and dropping the one that left the window. Only an
+out-of-order record forces a rebuild.
+
+:class:`ColumnarIVHistoryStore` is a drop-in alternative for large universes.
+It keeps each series as NumPy arrays (day ordinals and float32 IVs) in one
+binary file with a JSON index. The file is memory-mapped, and a series is only
+read when its symbol is first used. Saving copies untouched series as raw
+bytes instead of re-sorting and re-serialising them. Convert the JSON history
+once with:
+
+    python -m options_wheel.iv_history migrate
+
+:func:`open_iv_history_store` then picks the columnar file whenever it exists.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
+import mmap
 import os
+import struct
 import threading
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import date
+
+import numpy as np
 
 DEFAULT_LOOKBACK_DAYS = 252
 DEFAULT_MIN_OBSERVATIONS = 40
 DEFAULT_MAX_OBSERVATIONS = 400
 
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_JSON_PATH = os.path.join(PROJECT_ROOT, "data", "history", "iv_history.json")
+DEFAULT_COLUMNAR_PATH = os.path.join(PROJECT_ROOT, "data", "history", "iv_history.ivh")
+
+# Columnar file layout: magic, index length, UTF-8 JSON index padded to 8
+# bytes, then one block per series of ``count`` little-endian int32 day
+# ordinals followed by ``count`` float32 IVs. Index offsets are relative to
+# the first block.
+_MAGIC = b"OWIVH\x00\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+_ORDINAL_DTYPE = np.dtype("<i4")
+_VALUE_DTYPE = np.dtype("<f4")
+
+
+def _rank_stats(count, low, high, below, current_iv, min_observations):
+    if count < min_observations:
+        return None, None, count
+    if high <= low:
+        return None, None, count
+    iv_rank = (current_iv - low) / (high - low)
+    iv_rank = max(0.0, min(1.0, iv_rank))
+    return iv_rank, below / count, count
+
+
+class _RankWindow:
+    """The last ``lookback`` observations of a series, by date and by value."""
+
+    __slots__ = ("keys", "values", "ranked")
+
+    def __init__(self, items):
+        keys, values = zip(*items) if items else ((), ())
+        self.keys = deque(keys)
+        self.values = deque(values)
+        self.ranked = sorted(values)
+
+    def replace_latest(self, iv):
+        del self.ranked[bisect_left(self.ranked, self.values[-1])]
+        self.values[-1] = iv
+        insort(self.ranked, iv)
+
+    def append(self, key, iv, lookback):
+        self.keys.append(key)
+        self.values.append(iv)
+        insort(self.ranked, iv)
+        if len(self.keys) > lookback:
+            self.keys.popleft()
+            del self.ranked[bisect_left(self.ranked, self.values.popleft())]
+
 
 class IVHistoryStore:
     """Thread-safe ``{symbol: {date: atm_iv}}`` store backed by a JSON file."""
@@ -41,8 +115,11 @@ class IVHistoryStore:
         self._lock = threading.Lock()
         self._data = {}
         self._dirty = False
+        # Rank windows of the series ranked so far: ``{symbol: _RankWindow}``.
+        self._windows = {}
 
     def load(self):
+        self._windows = {}
         try:
             with open(self.path, "r", encoding="utf-8") as f:
                 data = json.load(f)
@@ -83,13 +160,47 @@ class IVHistoryStore:
             return
         with self._lock:
             self._data.setdefault(symbol, {})[date_str] = float(atm_iv)
+            self._update_window(symbol, date_str, float(atm_iv))
             self._dirty = True
 
+    def observation(self, symbol, date_str):
+        """ATM IV recorded for ``symbol`` on ``date_str``, or ``None``."""
+        with self._lock:
+            return self._data.get(symbol, {}).get(date_str)
+
     def observations(self, symbol):
         with self._lock:
-            series = self._data.get(symbol, {})
-            values = [iv for _, iv in sorted(series.items())[-self.lookback :]]
-        return values
+            return list(self._window(symbol).values)
+
+    def _window(self, symbol):
+        """The rank window of ``symbol``, built on first use; caller holds the lock."""
+        window = self._windows.get(symbol)
+        if window is None:
+            items = sorted(self._data.get(symbol, {}).items())[-self.lookback :]
+            window = self._windows[symbol] = _RankWindow(items)
+        return window
+
+    def _update_window(self, symbol, key, iv):
+        """Fold a just-recorded observation into a built window; caller holds the lock."""
+        window = self._windows.get(symbol)
+        if window is None:
+            return
+        keys = window.keys
+        if not keys or key > keys[-1]:
+            window.append(key, iv, self.lookback)
+        elif key == keys[-1]:
+            window.replace_latest(iv)
+        elif key < keys[0] and len(keys) >= self.lookback:
+            pass  # older than a full window
+        else:
+            del self._windows[symbol]
+
+    def _stats(self, symbol, current_iv):
+        """``(count, low, high, below)`` of ``symbol``'s window; caller holds the lock."""
+        ranked = self._window(symbol).ranked
+        if not ranked:
+            return 0, None, None, 0
+        return len(ranked), ranked[0], ranked[-1], bisect_left(ranked, current_iv)
 
     def rank(self, symbol, current_iv):
         """Return ``(iv_rank, iv_percentile, observation_count)``.
@@ -100,21 +211,286 @@ class IVHistoryStore:
         """
         if current_iv is None or current_iv <= 0:
             return None, None, 0
+        with self._lock:
+            stats = self._stats(symbol, current_iv)
+        return _rank_stats(*stats, current_iv, self.min_observations)
+
+    def rank_many(self, current_ivs):
+        """:meth:`rank` of every ``{symbol: current_iv}`` item, under one lock."""
+        ranked = {}
+        with self._lock:
+            for symbol, current_iv in current_ivs.items():
+                if current_iv is None or current_iv <= 0:
+                    ranked[symbol] = None, None, 0
+                else:
+                    stats = self._stats(symbol, current_iv)
+                    ranked[symbol] = _rank_stats(*stats, current_iv, self.min_observations)
+        return ranked
 
-        values = self.observations(symbol)
-        count = len(values)
-        if count < self.min_observations:
-            return None, None, count
 
-        low = min(values)
-        high = max(values)
-        if high <= low:
-            return None, None, count
+def _empty_series():
+    return np.empty(0, dtype=_ORDINAL_DTYPE), np.empty(0, dtype=_VALUE_DTYPE)
+
+
+def _inserted(array, position, value):
+    # np.insert costs tens of microseconds of argument handling per call.
+    result = np.empty(len(array) + 1, dtype=array.dtype)
+    result[:position] = array[:position]
+    result[position] = value
+    result[position + 1 :] = array[position:]
+    return result
+
+
+def _deleted(array, position):
+    return np.concatenate((array[:position], array[position + 1 :]))
+
+
+class ColumnarIVHistoryStore(IVHistoryStore):
+    """:class:`IVHistoryStore` backed by a memory-mapped columnar file.
+
+    Series read from the file are copied into memory on first use, so the map
+    can be released (and the file replaced) by :meth:`save` at any time.
+    IVs are stored as float32, which keeps about seven significant digits.
+    """
+
+    def __init__(
+        self,
+        path,
+        lookback=DEFAULT_LOOKBACK_DAYS,
+        min_observations=DEFAULT_MIN_OBSERVATIONS,
+        max_observations=DEFAULT_MAX_OBSERVATIONS,
+    ):
+        super().__init__(path, lookback, min_observations, max_observations)
+        self._map = None
+        self._data_start = 0
+        # Series still in the file: ``{symbol: (offset, count)}``.
+        self._index = {}
+        # Series read or written since load: ``{symbol: (ordinals, values)}``.
+        self._series = {}
+
+    def load(self):
+        with self._lock:
+            self._close_map()
+            self._index = {}
+            self._series = {}
+            self._windows = {}
+            try:
+                self._open_map()
+            except (OSError, ValueError, struct.error):
+                self._close_map()
+                self._index = {}
+        return self
+
+    def close(self):
+        with self._lock:
+            for symbol in list(self._index):
+                self._materialize(symbol)
+            self._close_map()
+
+    def _open_map(self):
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a columnar IV history file")
+        index_end = _HEADER.size + index_length
+        index = json.loads(bytes(self._map[_HEADER.size : index_end]).decode("utf-8"))
+        self._data_start = -(-index_end // 8) * 8
+        data_size = len(self._map) - self._data_start
+        for symbol, (offset, count) in index.items():
+            if offset < 0 or offset + count * 8 > data_size:
+                raise ValueError(f"{self.path}: series {symbol!r} runs past the end of the file")
+        self._index = {symbol: (int(offset), int(count)) for symbol, (offset, count) in index.items()}
 
-        iv_rank = (current_iv - low) / (high - low)
-        iv_rank = max(0.0, min(1.0, iv_rank))
-        iv_percentile = sum(1 for v in values if v < current_iv) / count
-        return iv_rank, iv_percentile, count
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _materialize(self, symbol):
+        """The in-memory ``(ordinals, values)`` of ``symbol``; caller holds the lock."""
+        series = self._series.get(symbol)
+        if series is not None:
+            return series
+        location = self._index.pop(symbol, None)
+        if location is None:
+            return _empty_series()
+        offset, count = location
+        start = self._data_start + offset
+        ordinals = np.frombuffer(self._map, _ORDINAL_DTYPE, count, start).copy()
+        values = np.frombuffer(self._map, _VALUE_DTYPE, count, start + count * 4).copy()
+        self._series[symbol] = ordinals, values
+        return ordinals, values
+
+    def save(self):
+        if not self._dirty:
+            return False
+        with self._lock:
+            for symbol, (_, count) in list(self._index.items()):
+                if count > self.max_observations:
+                    self._materialize(symbol)
+            layout = []
+            index = {}
+            offset = 0
+            for symbol in sorted(self._series.keys() | self._index.keys()):
+                if symbol in self._series:
+                    ordinals, values = self._series[symbol]
+                    ordinals = ordinals[-self.max_observations :]
+                    values = values[-self.max_observations :]
+                    count = len(ordinals)
+                    block = (ordinals.tobytes(), values.tobytes())
+                else:
+                    source, count = self._index[symbol]
+                    start = self._data_start + source
+                    block = (self._map[start : start + count * 8],)
+                if not count:
+                    continue
+                index[symbol] = [offset, count]
+                offset += count * 8
+                layout.append(block)
+
+            header = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+            data_start = -(-(_HEADER.size + len(header)) // 8) * 8
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, len(header)))
+                f.write(header)
+                f.write(b" " * (data_start - _HEADER.size - len(header)))
+                for block in layout:
+                    for chunk in block:
+                        f.write(chunk)
+            # A mapped file cannot be replaced on Windows.
+            self._close_map()
+            try:
+                os.replace(tmp_path, self.path)
+            finally:
+                self._open_map()
+                for symbol in self._series:
+                    self._index.pop(symbol, None)
+            self._dirty = False
+        return True
+
+    def record(self, symbol, date_str, atm_iv):
+        """Record today's ATM implied volatility for ``symbol``."""
+        if not symbol or atm_iv is None or atm_iv <= 0:
+            return
+        try:
+            ordinal = date.fromisoformat(date_str).toordinal()
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            ordinals, values = self._materialize(symbol)
+            length = len(ordinals)
+            position = int(np.searchsorted(ordinals, ordinal))
+            replaced = position < length and ordinals[position] == ordinal
+            self._fold_record(symbol, values, position, replaced, float(np.float32(atm_iv)))
+            if replaced:
+                values = values.copy()
+                values[position] = atm_iv
+            else:
+                ordinals = _inserted(ordinals, position, ordinal)
+                values = _inserted(values, position, atm_iv)
+            self._series[symbol] = ordinals, values
+            self._dirty = True
+
+    def _fold_record(self, symbol, values, position, replaced, iv):
+        """Update a built window for ``iv`` landing at ``position`` of ``values``.
+
+        ``values`` is the series before the record; caller holds the lock.
+        """
+        window = self._windows.get(symbol)
+        if window is None:
+            return
+        start = len(values) - self.lookback
+        if position == len(values) - replaced:
+            if replaced:
+                window = _deleted(window, int(window.searchsorted(values[position])))
+            elif start >= 0:
+                window = _deleted(window, int(window.searchsorted(values[start])))
+            self._windows[symbol] = _inserted(window, int(window.searchsorted(iv)), iv)
+        elif not (position < start or (position == start and not replaced)):
+            del self._windows[symbol]
+
+    def observation(self, symbol, date_str):
+        """ATM IV recorded for ``symbol`` on ``date_str``, or ``None``."""
+        try:
+            ordinal = date.fromisoformat(date_str).toordinal()
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            ordinals, values = self._materialize(symbol)
+            position = int(np.searchsorted(ordinals, ordinal))
+            if position < len(ordinals) and ordinals[position] == ordinal:
+                return float(values[position])
+        return None
+
+    def observations(self, symbol):
+        with self._lock:
+            _, values = self._materialize(symbol)
+            return values[-self.lookback :].tolist()
+
+    def _window(self, symbol):
+        """The sorted float64 window of ``symbol``; caller holds the lock."""
+        window = self._windows.get(symbol)
+        if window is None:
+            _, values = self._materialize(symbol)
+            window = self._windows[symbol] = np.sort(values[-self.lookback :].astype(float))
+        return window
+
+    def _stats(self, symbol, current_iv):
+        ranked = self._window(symbol)
+        if not len(ranked):
+            return 0, None, None, 0
+        below = int(np.searchsorted(ranked, current_iv))
+        return len(ranked), float(ranked[0]), float(ranked[-1]), below
+
+    def symbols(self):
+        with self._lock:
+            return sorted(self._series.keys() | self._index.keys())
+
+    def series(self, symbol):
+        """``{date: atm_iv}`` of ``symbol`` in date order, like the JSON store."""
+        with self._lock:
+            ordinals, values = self._materialize(symbol)
+            return {
+                date.fromordinal(ordinal).isoformat(): iv
+                for ordinal, iv in zip(ordinals.tolist(), values.tolist())
+            }
+
+
+def migrate_json(json_path=DEFAULT_JSON_PATH, path=DEFAULT_COLUMNAR_PATH):
+    """Write the JSON history at ``json_path`` as a columnar file at ``path``."""
+    source = IVHistoryStore(json_path).load()
+    store = ColumnarIVHistoryStore(path)
+    for symbol, series in source._data.items():
+        parsed = []
+        for date_str, iv in series.items():
+            try:
+                ordinal = date.fromisoformat(date_str).toordinal()
+            except ValueError:
+                continue
+            if iv > 0:
+                parsed.append((ordinal, iv))
+        if parsed:
+            parsed.sort()
+            ordinals, values = zip(*parsed)
+            store._series[symbol] = (
+                np.array(ordinals, dtype=_ORDINAL_DTYPE),
+                np.array(values, dtype=_VALUE_DTYPE),
+            )
+    store._dirty = True
+    store.save()
+    return store
+
+
+def open_iv_history_store(json_path=DEFAULT_JSON_PATH, columnar_path=DEFAULT_COLUMNAR_PATH):
+    """The columnar store if ``columnar_path`` exists, else the JSON one."""
+    if columnar_path and os.path.exists(columnar_path):
+        return ColumnarIVHistoryStore(columnar_path).load()
+    return IVHistoryStore(json_path).load()
 
 
 def extract_atm_iv(contracts, spot, target_dte=30, now_dt=None, dte_fn=None):
@@ -158,3 +534,22 @@ def extract_atm_iv(contracts, spot, target_dte=30, now_dt=None, dte_fn=None):
 
     _, _, _, atm_iv = min(usable, key=lambda item: abs(item[2] - spot))
     return atm_iv
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the OptionsWheel ATM IV history.")
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--json", default=DEFAULT_JSON_PATH, help="JSON history to convert.")
+    parser.add_argument("--out", default=DEFAULT_COLUMNAR_PATH, help="Columnar file to write.")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.json):
+        parser.error(f"{args.json} does not exist")
+    store = migrate_json(args.json, args.out)
+    symbols = store.symbols()
+    observations = sum(len(store.series(symbol)) for symbol in symbols)
+    print(f"Wrote {len(symbols)} series ({observations} observations) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,12 @@ Two probability measures are used on purpose:
   above the volatility that is actually realised, and that only shows up when
   the payoff is evaluated with a realistic volatility instead of the option's
   own implied volatility.
+
+The option maths comes in two forms. The ``*_array`` functions accept scalars
+or NumPy arrays, broadcast ``spot``/``strike``/``sigma``/``t_years`` against
+each other and return float arrays with NaN wherever the inputs are invalid, so
+a whole chain is priced in one call. The scalar functions are thin wrappers
+that map NaN back to ``None``.
 """
 
 from __future__ import annotations
@@ -21,9 +27,21 @@ from __future__ import annotations
 import math
 from datetime import datetime, timezone
 
+import numpy as np
+
 SECONDS_PER_YEAR = 365.0 * 24.0 * 60.0 * 60.0
 MIN_YEARS = 1.0 / (365.0 * 24.0 * 60.0)
 CONTRACT_MULTIPLIER = 100.0
+# Volatility bracket of the implied-volatility solver.
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+
+# math.erf lifted to a ufunc: NumPy has no erf, and going through math.erf keeps
+# the array functions bit-identical to ``normal_cdf``. It is not vectorised: each
+# element is still one Python call (about 0.1 us, so a few microseconds per
+# chain). A polynomial erf would be faster but would no longer match the scalar
+# functions exactly.
+_ERF = np.frompyfunc(math.erf, 1, 1)
 
 
 def normal_cdf(x):
@@ -31,6 +49,22 @@ def normal_cdf(x):
     return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
 
 
+def normal_cdf_array(x):
+    """Element-wise :func:`normal_cdf`; NaN stays NaN."""
+    x = np.asarray(x, dtype=float)
+    return 0.5 * (1.0 + np.asarray(_ERF(x / math.sqrt(2.0)), dtype=float))
+
+
+def _floats(*values):
+    # ``None`` becomes NaN, so it fails every validity comparison below.
+    return [np.asarray(value, dtype=float) for value in values]
+
+
+def _scalar(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
 def years_to_expiration(expiration_dt, now_dt):
     """Year fraction between ``now_dt`` and the 20:00 UTC close on expiry day."""
     if expiration_dt is None or now_dt is None:
@@ -67,43 +101,245 @@ def d1_d2(spot, strike, sigma, t_years, drift):
     underlying, i.e. ``E[S_T] = spot * exp(drift * t_years)``. Passing
     ``r - q`` gives the risk-neutral values.
     """
-    if (
-        spot is None
-        or strike is None
-        or sigma is None
-        or t_years is None
-        or spot <= 0
-        or strike <= 0
-        or sigma <= 0
-        or t_years <= 0
-    ):
-        return None, None
-
-    sigma_sqrt_t = sigma * math.sqrt(t_years)
-    d2 = (math.log(spot / strike) + (drift - 0.5 * sigma**2) * t_years) / sigma_sqrt_t
-    return d2 + sigma_sqrt_t, d2
+    d1, d2 = d1_d2_array(spot, strike, sigma, t_years, drift)
+    return _scalar(d1), _scalar(d2)
+
+
+def d1_d2_array(spot, strike, sigma, t_years, drift):
+    """Array form of :func:`d1_d2`; NaN unless spot, strike, sigma and t are > 0."""
+    spot, strike, sigma, t_years, drift = _floats(spot, strike, sigma, t_years, drift)
+    valid = (spot > 0) & (strike > 0) & (sigma > 0) & (t_years > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma_sqrt_t = sigma * np.sqrt(t_years)
+        d2 = (np.log(spot / strike) + (drift - 0.5 * sigma**2) * t_years) / sigma_sqrt_t
+        d1 = d2 + sigma_sqrt_t
+    return np.where(valid, d1, np.nan), np.where(valid, d2, np.nan)
 
 
 def option_delta(spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type="put"):
     """Black-Scholes delta (negative for puts)."""
-    d1, _ = d1_d2(spot, strike, sigma, t_years, risk_free_rate - dividend_yield)
-    if d1 is None:
+    return _scalar(
+        option_delta_array(
+            spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type=option_type
+        )
+    )
+
+
+def option_delta_array(
+    spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type="put"
+):
+    """Array form of :func:`option_delta`."""
+    d1, _ = d1_d2_array(spot, strike, sigma, t_years, np.subtract(risk_free_rate, dividend_yield))
+    with np.errstate(invalid="ignore"):
+        discount = np.exp(-np.asarray(dividend_yield, dtype=float) * np.asarray(t_years, dtype=float))
+    if option_type == "call":
+        return discount * normal_cdf_array(d1)
+    return -discount * normal_cdf_array(-d1)
+
+
+def option_delta_range(
+    spot, strike, sigma_low, sigma_high, t_years, risk_free_rate, dividend_yield, option_type="put"
+):
+    """``(min, max)`` of ``|delta|`` for any volatility in ``[sigma_low, sigma_high]``.
+
+    With ``x = sigma * sqrt(t)`` and ``b = ln(S/K) + (r - q) t``, ``d1 = b/x + x/2``
+    rises with ``x`` when ``b <= 0`` and is convex with its minimum at
+    ``x = sqrt(2b)`` otherwise, so its extremes over the interval lie among the
+    two ends and that point. ``None`` for invalid inputs.
+    """
+    if spot is None or strike is None or t_years is None or sigma_low is None or sigma_high is None:
+        return None
+    if spot <= 0 or strike <= 0 or t_years <= 0 or not 0 < sigma_low <= sigma_high:
         return None
 
+    sqrt_t = math.sqrt(t_years)
+    b = math.log(spot / strike) + (risk_free_rate - dividend_yield) * t_years
+    low, high = sigma_low * sqrt_t, sigma_high * sqrt_t
+    points = [low, high]
+    if b > 0:
+        points.append(min(max(math.sqrt(2.0 * b), low), high))
+    d1 = [b / x + 0.5 * x for x in points]
     discount = math.exp(-dividend_yield * t_years)
     if option_type == "call":
-        return discount * normal_cdf(d1)
-    return -discount * normal_cdf(-d1)
+        return discount * normal_cdf(min(d1)), discount * normal_cdf(max(d1))
+    return discount * normal_cdf(-max(d1)), discount * normal_cdf(-min(d1))
+
+
+def option_price(spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type="put"):
+    """Black-Scholes value per share."""
+    return _scalar(
+        option_price_array(
+            spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type=option_type
+        )
+    )
+
+
+def _discounted(spot, strike, t_years, risk_free_rate, dividend_yield):
+    spot, strike, t_years, risk_free_rate, dividend_yield = _floats(
+        spot, strike, t_years, risk_free_rate, dividend_yield
+    )
+    with np.errstate(invalid="ignore", over="ignore"):
+        return spot * np.exp(-dividend_yield * t_years), strike * np.exp(-risk_free_rate * t_years)
+
+
+def option_price_array(
+    spot, strike, sigma, t_years, risk_free_rate, dividend_yield, option_type="put"
+):
+    """Array form of :func:`option_price`."""
+    d1, d2 = d1_d2_array(spot, strike, sigma, t_years, np.subtract(risk_free_rate, dividend_yield))
+    spot, strike = _discounted(spot, strike, t_years, risk_free_rate, dividend_yield)
+    if option_type == "call":
+        return spot * normal_cdf_array(d1) - strike * normal_cdf_array(d2)
+    return strike * normal_cdf_array(-d2) - spot * normal_cdf_array(-d1)
+
+
+def option_vega_array(spot, strike, sigma, t_years, risk_free_rate, dividend_yield):
+    """Black-Scholes vega per share and unit of volatility (same for puts and calls)."""
+    d1, _ = d1_d2_array(spot, strike, sigma, t_years, np.subtract(risk_free_rate, dividend_yield))
+    spot, _ = _discounted(spot, strike, t_years, risk_free_rate, dividend_yield)
+    with np.errstate(invalid="ignore"):
+        return spot * np.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi) * np.sqrt(t_years)
+
+
+def implied_volatility(
+    price, spot, strike, t_years, risk_free_rate, dividend_yield, option_type="put"
+):
+    """Black-Scholes volatility that reproduces ``price``; ``None`` if there is none."""
+    return _scalar(
+        implied_volatility_array(
+            price, spot, strike, t_years, risk_free_rate, dividend_yield, option_type=option_type
+        )
+    )
+
+
+def implied_volatility_array(
+    price,
+    spot,
+    strike,
+    t_years,
+    risk_free_rate,
+    dividend_yield,
+    option_type="put",
+    tolerance=1e-8,
+    newton_steps=12,
+):
+    """Array form of :func:`implied_volatility`.
+
+    NaN where ``price`` is not strictly between the option's no-arbitrage
+    bounds or would need a volatility outside ``[IV_LOWER, IV_UPPER]``. All
+    contracts take Newton steps together, each inside its own bracket: a step
+    leaving the bracket (or a vanishing vega, deep in or out of the money) is
+    replaced by bisection. The few still above ``tolerance`` (a price error,
+    per share) after ``newton_steps`` are finished with Brent's method.
+    """
+    price, spot, strike, t_years = np.broadcast_arrays(*_floats(price, spot, strike, t_years))
+    shape = price.shape
+    price, spot, strike, t_years = (a.ravel() for a in (price, spot, strike, t_years))
+    sigma = np.full(price.shape, np.nan)
+
+    with np.errstate(invalid="ignore"):
+        spot_pv, strike_pv = _discounted(spot, strike, t_years, risk_free_rate, dividend_yield)
+        if option_type == "call":
+            lower, upper = np.maximum(spot_pv - strike_pv, 0.0), spot_pv
+        else:
+            lower, upper = np.maximum(strike_pv - spot_pv, 0.0), strike_pv
+        solvable = (spot > 0) & (strike > 0) & (t_years > 0) & (price > lower) & (price < upper)
+    active = np.flatnonzero(solvable)
+
+    def pricing_error(index, vol):
+        return (
+            option_price_array(
+                spot[index], strike[index], vol, t_years[index], risk_free_rate,
+                dividend_yield, option_type=option_type,
+            )
+            - price[index]
+        )
+
+    if len(active):
+        reachable = pricing_error(active, IV_UPPER) >= 0
+        active = active[reachable]
+    low = np.full(len(active), IV_LOWER)
+    high = np.full(len(active), IV_UPPER)
+    # Brenner-Subrahmanyam: the at-the-money approximation as a first guess.
+    guess = np.sqrt(2.0 * math.pi / t_years[active]) * price[active] / spot[active]
+    guess = np.clip(guess, IV_LOWER * 2.0, IV_UPPER / 2.0)
+
+    for _ in range(newton_steps):
+        if not len(active):
+            break
+        error = pricing_error(active, guess)
+        done = np.abs(error) <= tolerance
+        sigma[active[done]] = guess[done]
+        keep = ~done
+        active, guess, error, low, high = active[keep], guess[keep], error[keep], low[keep], high[keep]
+        low = np.where(error < 0, guess, low)
+        high = np.where(error > 0, guess, high)
+        vega = option_vega_array(
+            spot[active], strike[active], guess, t_years[active], risk_free_rate, dividend_yield
+        )
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            step = guess - error / vega
+        inside = np.isfinite(step) & (step > low) & (step < high)
+        guess = np.where(inside, step, 0.5 * (low + high))
+
+    for i, a, b in zip(active.tolist(), low.tolist(), high.tolist()):
+        sigma[i] = _brent(
+            lambda vol, i=i: float(pricing_error(i, vol)), a, b, tolerance
+        )
+    return sigma.reshape(shape)
+
+
+def _brent(f, a, b, tolerance, max_iterations=100):
+    """Root of ``f`` in ``[a, b]`` by Brent's method; NaN unless ``f`` changes sign."""
+    fa, fb = f(a), f(b)
+    if fa * fb > 0:
+        return math.nan
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc, d = a, fa, a
+    bisected = True
+    for _ in range(max_iterations):
+        if abs(fb) <= tolerance or abs(b - a) <= 1e-12:
+            break
+        if fa != fc and fb != fc:
+            # Inverse quadratic interpolation.
+            s = (
+                a * fb * fc / ((fa - fb) * (fa - fc))
+                + b * fa * fc / ((fb - fa) * (fb - fc))
+                + c * fa * fb / ((fc - fa) * (fc - fb))
+            )
+        else:
+            s = b - fb * (b - a) / (fb - fa)
+        previous = abs(b - c) if bisected else abs(c - d)
+        if not min((3 * a + b) / 4, b) < s < max((3 * a + b) / 4, b) or (
+            abs(s - b) >= previous / 2 or previous < 1e-12
+        ):
+            s = 0.5 * (a + b)
+            bisected = True
+        else:
+            bisected = False
+        fs = f(s)
+        d, c, fc = c, b, fb
+        if fa * fs < 0:
+            b, fb = s, fs
+        else:
+            a, fa = s, fs
+        if abs(fa) < abs(fb):
+            a, b, fa, fb = b, a, fb, fa
+    return b
 
 
 def probability_otm(spot, strike, sigma, t_years, drift, option_type="put"):
     """Probability that the short option expires worthless (no assignment)."""
-    _, d2 = d1_d2(spot, strike, sigma, t_years, drift)
-    if d2 is None:
-        return None
+    return _scalar(probability_otm_array(spot, strike, sigma, t_years, drift, option_type=option_type))
+
+
+def probability_otm_array(spot, strike, sigma, t_years, drift, option_type="put"):
+    """Array form of :func:`probability_otm`."""
+    _, d2 = d1_d2_array(spot, strike, sigma, t_years, drift)
     if option_type == "call":
-        return normal_cdf(-d2)
-    return normal_cdf(d2)
+        return normal_cdf_array(-d2)
+    return normal_cdf_array(d2)
 
 
 def expected_itm_payoff(spot, strike, sigma, t_years, drift, option_type="put"):
@@ -111,30 +347,51 @@ def expected_itm_payoff(spot, strike, sigma, t_years, drift, option_type="put"):
 
     Undiscounted, per share, under a lognormal with the supplied ``drift``.
     """
-    d1, d2 = d1_d2(spot, strike, sigma, t_years, drift)
-    if d1 is None:
-        return None
+    return _scalar(
+        expected_itm_payoff_array(spot, strike, sigma, t_years, drift, option_type=option_type)
+    )
 
-    forward = spot * math.exp(drift * t_years)
-    if option_type == "call":
-        return max(forward * normal_cdf(d1) - strike * normal_cdf(d2), 0.0)
-    return max(strike * normal_cdf(-d2) - forward * normal_cdf(-d1), 0.0)
+
+def expected_itm_payoff_array(spot, strike, sigma, t_years, drift, option_type="put"):
+    """Array form of :func:`expected_itm_payoff`."""
+    d1, d2 = d1_d2_array(spot, strike, sigma, t_years, drift)
+    spot, strike, t_years, drift = _floats(spot, strike, t_years, drift)
+    with np.errstate(invalid="ignore", over="ignore"):
+        forward = spot * np.exp(drift * t_years)
+        if option_type == "call":
+            payoff = forward * normal_cdf_array(d1) - strike * normal_cdf_array(d2)
+        else:
+            payoff = strike * normal_cdf_array(-d2) - forward * normal_cdf_array(-d1)
+    # np.maximum propagates NaN, so invalid inputs stay NaN.
+    return np.maximum(payoff, 0.0)
 
 
 def probability_of_profit(spot, strike, sigma, t_years, drift, net_premium, option_type="put"):
     """Probability that the trade is profitable at expiry (breakeven based)."""
-    if net_premium is None or net_premium <= 0:
-        return None
+    return _scalar(
+        probability_of_profit_array(
+            spot, strike, sigma, t_years, drift, net_premium, option_type=option_type
+        )
+    )
+
+
+def probability_of_profit_array(
+    spot, strike, sigma, t_years, drift, net_premium, option_type="put"
+):
+    """Array form of :func:`probability_of_profit`.
+
+    NaN without a positive credit; 1 for a put whose breakeven is at or below 0.
+    """
+    strike, net_premium = _floats(strike, net_premium)
+    credited = net_premium > 0
     if option_type == "call":
-        breakeven = strike + net_premium
-        _, d2 = d1_d2(spot, breakeven, sigma, t_years, drift)
-        return normal_cdf(-d2) if d2 is not None else None
+        _, d2 = d1_d2_array(spot, strike + net_premium, sigma, t_years, drift)
+        return np.where(credited, normal_cdf_array(-d2), np.nan)
 
     breakeven = strike - net_premium
-    if breakeven <= 0:
-        return 1.0
-    _, d2 = d1_d2(spot, breakeven, sigma, t_years, drift)
-    return normal_cdf(d2) if d2 is not None else None
+    _, d2 = d1_d2_array(spot, breakeven, sigma, t_years, drift)
+    pop = np.where(breakeven <= 0, 1.0, normal_cdf_array(d2))
+    return np.where(credited, pop, np.nan)
 
 
 def forecast_volatility(implied_vol, hv_short, hv_long, hv_weight=0.5, iv_haircut=0.85):
@@ -182,16 +439,40 @@ def net_credit(
     subtract broker commissions (doubled when the position is expected to be
     bought back rather than held to expiry).
     """
-    if bid is None or ask is None or bid <= 0 or ask < bid:
-        return None, None, None
+    mid, net, spread_pct = net_credit_array(
+        bid,
+        ask,
+        commission_per_contract=commission_per_contract,
+        slippage_pct_of_spread=slippage_pct_of_spread,
+        round_trip=round_trip,
+        multiplier=multiplier,
+    )
+    return _scalar(mid), _scalar(net), _scalar(spread_pct)
+
 
-    mid = (bid + ask) / 2.0
-    half_spread = (ask - bid) / 2.0
-    slippage = half_spread * (max(slippage_pct_of_spread, 0.0) / 100.0)
-    fees = commission_per_contract * (2 if round_trip else 1) / multiplier
-    net = mid - slippage - fees
-    spread_pct = ((ask - bid) / mid * 100.0) if mid > 0 else None
-    return mid, net, spread_pct
+def net_credit_array(
+    bid,
+    ask,
+    commission_per_contract=0.0,
+    slippage_pct_of_spread=0.0,
+    round_trip=False,
+    multiplier=CONTRACT_MULTIPLIER,
+):
+    """Array form of :func:`net_credit`; NaN unless ``0 < bid <= ask``."""
+    bid, ask = _floats(bid, ask)
+    valid = (bid > 0) & (ask >= bid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mid = (bid + ask) / 2.0
+        half_spread = (ask - bid) / 2.0
+        slippage = half_spread * (max(slippage_pct_of_spread, 0.0) / 100.0)
+        fees = commission_per_contract * (2 if round_trip else 1) / multiplier
+        net = mid - slippage - fees
+        spread_pct = (ask - bid) / mid * 100.0
+    return (
+        np.where(valid, mid, np.nan),
+        np.where(valid, net, np.nan),
+        np.where(valid & (mid > 0), spread_pct, np.nan),
+    )
 
 
 def collateral_per_share(strike, spot, net_premium, option_type="put"):
@@ -214,10 +495,20 @@ def simple_yields(net_premium, collateral, dte):
     same premium, which systematically flatters short-dated, high-gamma,
     commission-heavy contracts. Simple scaling keeps DTEs comparable.
     """
-    if not net_premium or not collateral or not dte or collateral <= 0 or dte <= 0:
-        return None, None
-    period_return = net_premium / collateral
-    return period_return * (30.0 / dte) * 100.0, period_return * (365.0 / dte) * 100.0
+    monthly, annualized = simple_yields_array(net_premium, collateral, dte)
+    return _scalar(monthly), _scalar(annualized)
+
+
+def simple_yields_array(net_premium, collateral, dte):
+    """Array form of :func:`simple_yields`; NaN for a zero credit or a
+    non-positive collateral or DTE."""
+    net_premium, collateral, dte = _floats(net_premium, collateral, dte)
+    valid = (net_premium != 0) & ~np.isnan(net_premium) & (collateral > 0) & (dte > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        period_return = net_premium / collateral
+        monthly = period_return * (30.0 / dte) * 100.0
+        annualized = period_return * (365.0 / dte) * 100.0
+    return np.where(valid, monthly, np.nan), np.where(valid, annualized, np.nan)
 
 
 def sigma_distance(spot, strike, sigma, t_years, option_type="put"):
@@ -226,18 +517,16 @@ def sigma_distance(spot, strike, sigma, t_years, option_type="put"):
     Unlike a raw OTM percentage this is comparable across tickers: 5% OTM on a
     utility is far safer than 5% OTM on a biotech.
     """
-    if (
-        not spot
-        or not strike
-        or not sigma
-        or not t_years
-        or spot <= 0
-        or strike <= 0
-        or sigma <= 0
-        or t_years <= 0
-    ):
-        return None
-    z = math.log(strike / spot) / (sigma * math.sqrt(t_years))
+    return _scalar(sigma_distance_array(spot, strike, sigma, t_years, option_type=option_type))
+
+
+def sigma_distance_array(spot, strike, sigma, t_years, option_type="put"):
+    """Array form of :func:`sigma_distance`."""
+    spot, strike, sigma, t_years = _floats(spot, strike, sigma, t_years)
+    valid = (spot > 0) & (strike > 0) & (sigma > 0) & (t_years > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = np.log(strike / spot) / (sigma * np.sqrt(t_years))
+    z = np.where(valid, z, np.nan)
     return z if option_type == "call" else -z
 
 
@@ -270,21 +559,40 @@ def max_monthly_yield_for_delta(abs_delta, dte, implied_vol, risk_free_rate=0.04
     return monthly
 
 
+def max_monthly_yield_for_delta_array(abs_delta, dte, implied_vol, risk_free_rate=0.045):
+    """Array form of :func:`max_monthly_yield_for_delta`; NaN where it is ``None``."""
+    abs_delta, dte, implied_vol, risk_free_rate = _floats(abs_delta, dte, implied_vol, risk_free_rate)
+    valid = (abs_delta > 0) & (abs_delta < 1) & (dte > 0) & (implied_vol > 0)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        t_years = dte / 365.0
+        sigma_sqrt_t = implied_vol * np.sqrt(t_years)
+        d1 = -_inverse_normal_cdf_array(np.where(valid, abs_delta, 0.5))
+        strike = 100.0 * np.exp(-d1 * sigma_sqrt_t + (risk_free_rate + 0.5 * implied_vol**2) * t_years)
+        premium = expected_itm_payoff_array(100.0, strike, implied_vol, t_years, risk_free_rate, "put")
+        premium = premium * np.exp(-risk_free_rate * t_years)
+    monthly, _ = simple_yields_array(premium, strike, dte)
+    return np.where(valid, monthly, np.nan)
+
+
+# Acklam's coefficients: central rational function (A/B) and tails (C/D).
+_ACKLAM_A = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+             1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+_ACKLAM_B = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+             6.680131188771972e01, -1.328068155288572e01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+             -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+             3.754408661907416e00)
+_ACKLAM_P_LOW = 0.02425
+
+
 def _inverse_normal_cdf(p):
     """Acklam's rational approximation of the standard normal quantile."""
     if p <= 0.0 or p >= 1.0:
         raise ValueError("p must be in (0, 1)")
 
-    a = [-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
-         1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00]
-    b = [-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
-         6.680131188771972e01, -1.328068155288572e01]
-    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
-         -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00]
-    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
-         3.754408661907416e00]
-
-    p_low, p_high = 0.02425, 1 - 0.02425
+    a, b, c, d = _ACKLAM_A, _ACKLAM_B, _ACKLAM_C, _ACKLAM_D
+    p_low, p_high = _ACKLAM_P_LOW, 1 - _ACKLAM_P_LOW
     if p < p_low:
         q = math.sqrt(-2 * math.log(p))
         return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / (
@@ -300,3 +608,23 @@ def _inverse_normal_cdf(p):
     return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / (
         ((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1
     )
+
+
+def _inverse_normal_cdf_array(p):
+    """Element-wise :func:`_inverse_normal_cdf` for ``p`` in (0, 1)."""
+    a, b, c, d = _ACKLAM_A, _ACKLAM_B, _ACKLAM_C, _ACKLAM_D
+    p = np.asarray(p, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tail = np.minimum(p, 1 - p)
+        q = np.sqrt(-2 * np.log(tail))
+        tails = (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / (
+            (((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1
+        )
+        q = p - 0.5
+        r = q * q
+        central = (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / (
+            ((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1
+        )
+    return np.where(
+        p < _ACKLAM_P_LOW, tails, np.where(p > 1 - _ACKLAM_P_LOW, -tails, central)
+    )
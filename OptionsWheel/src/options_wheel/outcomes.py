@@ -106,13 +106,9 @@ def _extreme_close(quotes, start_date, end_date, kind="min"):
 
 
 def _fetch_history(symbol, from_date, to_date):
-    from .analysis import HIST_URL, safe_get  # local import avoids a cycle
+    from .analysis import load_daily_bars  # local import avoids a cycle
 
-    url = f"{HIST_URL}?ticker={symbol}&from={from_date}&to={to_date}&interval=1d"
-    data = safe_get(url)
-    if isinstance(data, dict):
-        data = data.get("quotes") or data.get("prices") or []
-    return data if isinstance(data, list) else []
+    return load_daily_bars(symbol, from_date, to_date)
 
 
 def grade_trade(row, scan_date, quotes, option_type="put"):
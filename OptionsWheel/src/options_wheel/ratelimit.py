@@ -0,0 +1,261 @@
+"""Token-bucket rate limiter shared by worker threads and the asyncio engine.
+
+The screener used to pace requests with module globals (next request time,
+next slot time, minimum interval) behind one lock, and callers waiting out a
+cooldown polled the clock every 0.25 s. This limiter keeps the same adaptive
+behaviour in one object per API endpoint:
+
+* requests draw tokens from a bucket refilled at ``rate`` tokens per second;
+* every success raises the rate additively and every rate-limit response
+  (429, or an edge "Too Many Requests" 500) cuts it multiplicatively (AIMD),
+  never below what the server's ``Retry-After`` implies;
+* ``pause`` blocks the endpoint for a cooldown without dropping queued callers;
+* an optional ``parent`` bucket (one per host) is drawn from after the
+  endpoint's own, so the endpoints together never exceed the host budget.
+  Success and rate-limit feedback also reach the parent; pauses stay local.
+
+Waiters queue in FIFO order and only the head of the queue waits on the clock,
+with a timeout equal to the exact time its token becomes available. Threads
+sleep on their own ``threading.Condition`` and coroutines on a future woken with
+``call_soon_threadsafe``, so both engines can share one limiter and nobody
+polls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+DEFAULT_RATE = 1 / 0.35
+MIN_RATE = 0.2
+MAX_RATE = 1 / 0.12
+ADDITIVE_INCREASE = 0.02
+MULTIPLICATIVE_DECREASE = 1 / 1.4
+
+
+class _ThreadWaiter:
+    def __init__(self, lock):
+        self._cond = threading.Condition(lock)
+
+    def wait(self, timeout):
+        # Called with the limiter lock held; releases it while sleeping.
+        self._cond.wait(timeout)
+
+    def wake(self):
+        self._cond.notify()
+
+
+class _AsyncWaiter:
+    def __init__(self, loop):
+        self.loop = loop
+        self.future = None
+
+    def arm(self):
+        self.future = self.loop.create_future()
+        return self.future
+
+    def wake(self):
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TokenBucketLimiter:
+    """AIMD token bucket; ``acquire`` and ``acquire_async`` block until a token is free."""
+
+    def __init__(
+        self,
+        name="default",
+        parent=None,
+        rate=DEFAULT_RATE,
+        burst=1.0,
+        min_rate=MIN_RATE,
+        max_rate=MAX_RATE,
+        increase=ADDITIVE_INCREASE,
+        decrease=MULTIPLICATIVE_DECREASE,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.parent = parent
+        self.burst = max(float(burst), 1.0)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rate = min(max(float(rate), min_rate), max_rate)
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._queue = deque()
+        self._stats = {
+            "acquired": 0,
+            "waited_seconds": 0.0,
+            "max_queue_depth": 0,
+            "successes": 0,
+            "rate_limited": 0,
+            "pauses": 0,
+        }
+
+    # -- bucket arithmetic (lock held) -------------------------------------
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+            self._updated = now
+
+    def _delay_for(self, waiter, now):
+        """Take a token for ``waiter`` and return 0, or return the wait in
+        seconds (``None`` while another waiter is ahead in the queue)."""
+        if self._queue[0] is not waiter:
+            return None
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._refill(now)
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+
+    def _enqueue(self, waiter):
+        self._queue.append(waiter)
+        depth = len(self._queue)
+        if depth > self._stats["max_queue_depth"]:
+            self._stats["max_queue_depth"] = depth
+
+    def _leave(self, waiter, started, acquired):
+        head = self._queue[0] is waiter
+        self._queue.remove(waiter)
+        if acquired:
+            self._stats["acquired"] += 1
+            self._stats["waited_seconds"] += self._clock() - started
+        if head:
+            self._wake_head()
+
+    def _wake_head(self):
+        if self._queue:
+            self._queue[0].wake()
+
+    # -- acquisition --------------------------------------------------------
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        with self._lock:
+            waiter = _ThreadWaiter(self._lock)
+            started = self._clock()
+            self._enqueue(waiter)
+            acquired = False
+            try:
+                while True:
+                    delay = self._delay_for(waiter, self._clock())
+                    if delay == 0.0:
+                        acquired = True
+                        break
+                    waiter.wait(delay)
+            finally:
+                self._leave(waiter, started, acquired)
+        if self.parent is not None:
+            self.parent.acquire()
+
+    async def acquire_async(self):
+        """Coroutine counterpart of ``acquire``; does not hold a thread while waiting."""
+        loop = asyncio.get_running_loop()
+        waiter = _AsyncWaiter(loop)
+        with self._lock:
+            started = self._clock()
+            self._enqueue(waiter)
+        acquired = False
+        try:
+            while True:
+                with self._lock:
+                    delay = self._delay_for(waiter, self._clock())
+                    if delay == 0.0:
+                        acquired = True
+                        break
+                    # Armed under the lock so a wake from another thread
+                    # between here and the await is not lost.
+                    future = waiter.arm()
+                timer = loop.call_later(delay, _resolve, future) if delay is not None else None
+                try:
+                    await future
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+        finally:
+            with self._lock:
+                self._leave(waiter, started, acquired)
+        if self.parent is not None:
+            await self.parent.acquire_async()
+
+    # -- feedback -----------------------------------------------------------
+
+    def on_success(self):
+        with self._lock:
+            self._stats["successes"] += 1
+            self._refill(self._clock())
+            rate = min(self.max_rate, self._rate + self.increase)
+            if rate != self._rate:
+                self._rate = rate
+                self._wake_head()
+        if self.parent is not None:
+            self.parent.on_success()
+
+    def on_rate_limited(self, retry_after=0.0):
+        """Cut the rate after a rate-limit response, honouring ``retry_after``."""
+        with self._lock:
+            self._stats["rate_limited"] += 1
+            self._refill(self._clock())
+            rate = self._rate * self.decrease
+            if retry_after and retry_after > 0:
+                rate = min(rate, 1.0 / max(0.25, retry_after))
+            self._rate = max(self.min_rate, rate)
+        if self.parent is not None:
+            self.parent.on_rate_limited(retry_after)
+
+    def pause(self, seconds):
+        """Hold every request for ``seconds`` and spread them out afterwards."""
+        seconds = max(0.0, float(seconds))
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            self._stats["pauses"] += 1
+            self._rate = max(self.min_rate, min(self._rate, 1.0 / min(5.0, seconds)))
+            until = now + seconds
+            if until > self._blocked_until:
+                self._refill(now)
+                self._blocked_until = until
+                # One request may go at the end of the pause, the rest are paced.
+                self._tokens = 1.0
+                self._updated = until
+
+    # -- metrics ------------------------------------------------------------
+
+    @property
+    def rate(self):
+        with self._lock:
+            return self._rate
+
+    @property
+    def queue_depth(self):
+        with self._lock:
+            return len(self._queue)
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                name=self.name,
+                rate=self._rate,
+                queue_depth=len(self._queue),
+                cooldown_remaining=max(0.0, self._blocked_until - self._clock()),
+            )
+        return stats
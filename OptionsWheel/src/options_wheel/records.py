@@ -0,0 +1,119 @@
+"""Compact record of one evaluated option contract.
+
+A scan holds every first-pass survivor until it is ranked, written and
+archived. As a plain dict each row carried ~50 string keys in its own hash
+table, most of them ``None`` until the second pass filled them in.
+:class:`ContractRecord` keeps the same fields in ``__slots__``: one fixed array
+of references per row, with the key names shared by the class.
+
+Analysis code uses the attributes (``row.monthly_yield_pct``). The record is
+also a :class:`~collections.abc.Mapping` under the output column names
+(``row["MonthlyYieldPct"]``, ``row.get("Score")``) whose existing columns can be
+assigned (``row["Score"] = ...``); new keys cannot be added. ``build_portfolio``,
+``archive_scan`` and the shard merge therefore accept records and rows loaded
+back from JSON alike. :meth:`ContractRecord.to_dict` produces the output schema
+at the boundary, where rows are printed or serialised.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+# (output column, attribute) in output column order.
+CONTRACT_FIELDS = (
+    ("Symbol", "symbol"),
+    ("Name", "name"),
+    ("Price", "price"),
+    ("EMA50", "ema50"),
+    ("ADX", "adx"),
+    ("RSI", "rsi"),
+    ("RVI", "rvi"),
+    ("MACD", "macd"),
+    ("Signal", "signal"),
+    ("DiffPct", "diff_pct"),
+    ("Status", "status"),
+    ("Failed Criterion", "failed_criterion"),
+    ("Strike", "strike"),
+    ("Expiration", "expiration"),
+    ("ExDividendDate", "ex_dividend_date"),
+    ("ExDivRisk", "ex_div_risk"),
+    ("NextEarnings", "next_earnings"),
+    ("EarningsBeforeExpiry", "earnings_before_expiry"),
+    ("DTE", "dte"),
+    ("Premium", "premium"),
+    ("NetPremium", "net_premium"),
+    ("PricingSource", "pricing_source"),
+    ("Bid", "bid"),
+    ("Ask", "ask"),
+    ("SpreadAbs", "spread_abs"),
+    ("SpreadPct", "spread_pct"),
+    ("MonthlyYieldPct", "monthly_yield_pct"),
+    ("AnnualizedYieldPct", "annualized_yield_pct"),
+    ("OTMPct", "otm_pct"),
+    ("OpenInterest", "open_interest"),
+    ("Volume", "volume"),
+    ("Delta", "delta"),
+    ("ImpliedVolatility", "implied_volatility"),
+    ("ForecastVol", "forecast_vol"),
+    ("VRPRatio", "vrp_ratio"),
+    ("SigmaDistance", "sigma_distance"),
+    ("CreditRiskRatio", "credit_risk_ratio"),
+    ("PoP", "pop"),
+    ("EV", "ev"),
+    ("ExpectedAssignmentLoss", "expected_assignment_loss"),
+    ("Score", "score"),
+    ("IVHVPercentile", "iv_hv_percentile"),
+    ("ATMImpliedVolatility", "atm_implied_volatility"),
+    ("IVRank", "iv_rank"),
+    ("IVPercentile", "iv_percentile"),
+    ("IVRankObservationCount", "iv_rank_observation_count"),
+)
+
+_KEYS = tuple(key for key, _ in CONTRACT_FIELDS)
+_ATTRS = dict(CONTRACT_FIELDS)
+_DEFAULTS = {"pricing_source": "mid", "score": 0.0}
+
+
+class ContractRecord(Mapping):
+    """One contract row; fields not given start as ``None``."""
+
+    __slots__ = tuple(attr for _, attr in CONTRACT_FIELDS)
+
+    def __init__(self, **fields):
+        for attr in self.__slots__:
+            setattr(self, attr, fields.pop(attr, _DEFAULTS.get(attr)))
+        if fields:
+            raise TypeError(f"Unknown contract fields: {', '.join(sorted(fields))}")
+
+    def __getitem__(self, key):
+        try:
+            attr = _ATTRS[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        return getattr(self, attr)
+
+    def __setitem__(self, key, value):
+        if key not in _ATTRS:
+            raise KeyError(key)
+        setattr(self, _ATTRS[key], value)
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self):
+        return len(_KEYS)
+
+    def __contains__(self, key):
+        return key in _ATTRS
+
+    def __repr__(self):
+        return f"ContractRecord({self.to_dict()!r})"
+
+    def to_dict(self):
+        """The row in the output schema (column name -> value)."""
+        return {key: getattr(self, attr) for key, attr in CONTRACT_FIELDS}
+
+
+def as_dicts(rows):
+    """``rows`` with every :class:`ContractRecord` converted by ``to_dict``."""
+    return [row.to_dict() if isinstance(row, ContractRecord) else row for row in rows]
@@ -0,0 +1,147 @@
+"""Deterministic ticker sharding and the merge step that reassembles a scan.
+
+One process scanning the whole put universe is bounded by a single rate-limited
+client. ``--shard-index/--shard-count`` splits the tickers by a stable hash of
+the symbol (the same symbol always lands in the same shard, whatever order or
+subset of the ticker file is used) and each shard writes its rows to
+``data/shards`` instead of the final results.
+
+Each shard file also carries the position of its symbols in the unsharded
+ticker list and the ATM IV observed for them, so the merge can rebuild exactly
+what a single process would have produced:
+
+    python -m options_wheel.shards merge --type put
+
+The merge re-sorts the combined rows the way ``main`` does, rebuilds the
+portfolio, then writes ``<type>_results.json``, the IV history and the scan
+archive once.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import re
+import zlib
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(MODULE_DIR, "..", ".."))
+DEFAULT_SHARD_DIR = os.environ.get("OW_SHARD_DIR", os.path.join(PROJECT_ROOT, "data", "shards"))
+
+_SHARD_FILE_RE = re.compile(r"^(put|call)_shard-(\d+)-of-(\d+)\.json$")
+
+
+def shard_of(symbol, shard_count):
+    """Shard owning ``symbol``; crc32 is stable across processes and Python versions."""
+    return zlib.crc32(symbol.upper().encode("utf-8")) % shard_count
+
+
+def select_shard(tickers, shard_index, shard_count):
+    return [ticker for ticker in tickers if shard_of(ticker, shard_count) == shard_index]
+
+
+def shard_path(option_type, shard_index, shard_count, directory=DEFAULT_SHARD_DIR):
+    return os.path.join(directory, f"{option_type}_shard-{shard_index}-of-{shard_count}.json")
+
+
+def write_shard(path, payload, encoder=None):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, cls=encoder)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_shards(option_type, directory=DEFAULT_SHARD_DIR):
+    """Shard payloads of ``option_type`` found in ``directory``, by shard index."""
+    shards = {}
+    for path in sorted(glob.glob(os.path.join(directory, f"{option_type}_shard-*.json"))):
+        match = _SHARD_FILE_RE.match(os.path.basename(path))
+        if not match:
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            shards[int(match.group(2))] = json.load(f)
+    return shards
+
+
+def check_shards(shards, allow_partial=False):
+    """Return the common ``(scan_date, config_hash, shard_count)`` or raise ``ValueError``."""
+    if not shards:
+        raise ValueError("no shard results found")
+    keys = {
+        (payload["scan_date"], payload["config_hash"], payload["shard_count"])
+        for payload in shards.values()
+    }
+    if len(keys) != 1:
+        raise ValueError(f"shards come from different scans: {sorted(keys)}")
+    scan_date, digest, shard_count = keys.pop()
+    missing = sorted(set(range(shard_count)) - set(shards))
+    if missing and not allow_partial:
+        raise ValueError(f"missing shard(s) {missing} of {shard_count}")
+    return scan_date, digest, shard_count
+
+
+def merge_rows(shards):
+    """Rows of every shard in the order a single process would have produced them
+    before the final sort: PASS rows then NEAR rows, each in ticker order."""
+    rows = []
+    order = {}
+    for index in sorted(shards):
+        rows.extend(shards[index]["rows"])
+        order.update(shards[index]["ticker_order"])
+    unknown = len(order)
+    # sorted() is stable, so the rows of one symbol keep their relative order.
+    return sorted(
+        rows,
+        key=lambda row: (row.get("Status") != "PASS", order.get(row.get("Symbol"), unknown)),
+    )
+
+
+def merge(option_type, directory=DEFAULT_SHARD_DIR, allow_partial=False):
+    """Combine the shard results of ``option_type`` into the final scan outputs."""
+    from . import analysis  # local import avoids a cycle
+
+    shards = load_shards(option_type, directory)
+    scan_date, _, shard_count = check_shards(shards, allow_partial=allow_partial)
+    first = shards[min(shards)]
+    for payload in shards.values():
+        for key, atm_iv in payload.get("iv_observations", {}).items():
+            analysis.IV_HISTORY_STORE.record(key, scan_date, atm_iv)
+    print(f"Merging {len(shards)}/{shard_count} {option_type.upper()} shards from {scan_date}")
+    return analysis.save_scan_results(
+        option_type,
+        merge_rows(shards),
+        first["screening_config"],
+        total_tickers=sum(p["total_tickers"] for p in shards.values()),
+        candidates_count=sum(p["candidates"] for p in shards.values()),
+        scan_date=scan_date,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge sharded OptionsWheel scans.")
+    parser.add_argument("command", choices=["merge"])
+    parser.add_argument("--type", dest="option_type", choices=["put", "call", "both"], default="put")
+    parser.add_argument("--dir", default=DEFAULT_SHARD_DIR, help="Shard results directory.")
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help="Merge even when some shards are missing.",
+    )
+    args = parser.parse_args()
+
+    option_types = ["call", "put"] if args.option_type == "both" else [args.option_type]
+    for option_type in option_types:
+        try:
+            merge(option_type, directory=args.dir, allow_partial=args.allow_partial)
+        except ValueError as e:
+            parser.error(f"{option_type}: {e}")
+
+
+if __name__ == "__main__":
+    main()
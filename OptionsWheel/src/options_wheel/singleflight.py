@@ -0,0 +1,95 @@
+"""Coalesce concurrent calls for the same key into one in-flight call.
+
+The response cache is only written once a response arrives, so two callers
+asking for the same URL at the same moment (the put and call scans sharing a
+process, the outcomes grader and the check_option skill, two pipelines needing
+the same history) both missed the cache and both went to the network. A
+``SingleFlight`` lets the first caller (the leader) run the call while later
+callers for the same key wait for its result.
+
+The shared result lives in a ``concurrent.futures.Future`` so waiting works
+the same from worker threads (``result()``) and from the asyncio engine
+(``asyncio.wrap_future``), whichever side started the call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import CancelledError, Future
+
+
+class SingleFlight:
+    """``key -> in-flight call`` registry; ``do`` returns ``(value, shared)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self):
+        """Number of calls answered by another caller's in-flight request."""
+        with self._lock:
+            return self._coalesced
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def _claim(self, key):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key, future, value=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is None:
+            future.set_result(value)
+        elif isinstance(error, (CancelledError, asyncio.CancelledError)):
+            future.cancel()
+        else:
+            future.set_exception(error)
+
+    def do(self, key, fn):
+        """Run ``fn()`` unless a call for ``key`` is already in flight, then
+        return ``(value, shared)`` where ``shared`` means another caller ran it."""
+        future, leader = self._claim(key)
+        if not leader:
+            try:
+                return future.result(), True
+            except CancelledError:
+                # The leader was cancelled: make the call ourselves.
+                return self.do(key, fn)
+        try:
+            value = fn()
+        except BaseException as error:
+            self._finish(key, future, error=error)
+            raise
+        self._finish(key, future, value)
+        return value, False
+
+    async def do_async(self, key, fn):
+        """Coroutine counterpart of ``do``; ``fn()`` must return an awaitable."""
+        future, leader = self._claim(key)
+        if not leader:
+            try:
+                return await asyncio.wrap_future(future), True
+            except (CancelledError, asyncio.CancelledError):
+                if not future.cancelled():
+                    raise
+                return await self.do_async(key, fn)
+        try:
+            value = await fn()
+        except BaseException as error:
+            self._finish(key, future, error=error)
+            raise
+        self._finish(key, future, value)
+        return value, False
@@ -0,0 +1,255 @@
+"""Two-stage scan engine: I/O threads feed a bounded queue of CPU work.
+
+A symbol pipeline (``analysis._symbol_analysis_steps``) is a generator that
+yields HTTP requests as ``(url, timeout, max_retries)`` tuples and its CPU-heavy
+steps (option-chain evaluation, contract scoring) as :class:`CpuTask` objects.
+``run_steps`` and ``run_steps_async`` simply run the tasks inline. ``run_staged``
+splits them off: I/O worker threads drive each pipeline only until its next
+CPU task, which joins a bounded FIFO queue. A separate CPU executor (a process
+pool, so the work does not contend for the GIL with the I/O threads) drains the
+queue, and the result is sent back into the pipeline by the next I/O segment.
+
+No new pipeline starts while the queue is full, so a slow CPU stage slows
+fetching down instead of piling up decoded payloads in memory.
+:class:`StageMetrics` records the queue depth and the time spent in each stage,
+which shows whether I/O or CPU is the bottleneck.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class CpuTask:
+    """``fn(*args)`` yielded by a pipeline to run in the CPU stage.
+
+    ``fn`` must be a module-level function and ``args`` picklable, so the task
+    can be sent to a worker process.
+    """
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+
+    def run(self):
+        return self.fn(*self.args)
+
+
+# Set in worker processes: returns (and clears) whatever per-process state the
+# parent has to merge after each task, e.g. error counters.
+_worker_collector = None
+
+
+def set_worker_collector(collector):
+    """Install the collector :func:`timed_run` reports after each task."""
+    global _worker_collector
+    _worker_collector = collector
+
+
+def timed_run(task):
+    """``(result, seconds, collected)`` of a task; the CPU executor's entry point."""
+    start = time.perf_counter()
+    value = task.run()
+    seconds = time.perf_counter() - start
+    return value, seconds, _worker_collector() if _worker_collector is not None else None
+
+
+class StageMetrics:
+    """Thread-safe counters of a staged run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stats = {
+                "io_segments": 0,
+                "io_seconds": 0.0,
+                "cpu_tasks": 0,
+                "cpu_seconds": 0.0,
+                "queue_wait_seconds": 0.0,
+                "max_queue_wait_seconds": 0.0,
+                "depth_samples": 0,
+                "depth_total": 0,
+                "max_queue_depth": 0,
+                "full_queue_stalls": 0,
+                "wall_seconds": 0.0,
+            }
+
+    def record_io(self, seconds):
+        with self._lock:
+            self._stats["io_segments"] += 1
+            self._stats["io_seconds"] += seconds
+
+    def record_cpu(self, seconds, queue_wait):
+        with self._lock:
+            stats = self._stats
+            stats["cpu_tasks"] += 1
+            stats["cpu_seconds"] += seconds
+            stats["queue_wait_seconds"] += queue_wait
+            stats["max_queue_wait_seconds"] = max(stats["max_queue_wait_seconds"], queue_wait)
+
+    def record_depth(self, depth, stalled=False):
+        with self._lock:
+            stats = self._stats
+            stats["depth_samples"] += 1
+            stats["depth_total"] += depth
+            stats["max_queue_depth"] = max(stats["max_queue_depth"], depth)
+            stats["full_queue_stalls"] += bool(stalled)
+
+    def record_wall(self, seconds):
+        with self._lock:
+            self._stats["wall_seconds"] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self._stats)
+        samples = stats["depth_samples"]
+        stats["avg_queue_depth"] = stats["depth_total"] / samples if samples else 0.0
+        return stats
+
+    def summary_lines(self):
+        """Human-readable lines for the end-of-run summary; empty if nothing ran."""
+        stats = self.snapshot()
+        if not stats["io_segments"]:
+            return []
+        io_avg = stats["io_seconds"] / stats["io_segments"] * 1000.0
+        lines = [f"- I/O stage: {stats['io_segments']} segments, avg {io_avg:.1f} ms"]
+        if stats["cpu_tasks"]:
+            cpu_avg = stats["cpu_seconds"] / stats["cpu_tasks"] * 1000.0
+            wait_avg = stats["queue_wait_seconds"] / stats["cpu_tasks"] * 1000.0
+            lines.append(
+                f"- CPU stage: {stats['cpu_tasks']} tasks, avg {cpu_avg:.1f} ms "
+                f"(queue wait avg {wait_avg:.1f} ms, max "
+                f"{stats['max_queue_wait_seconds'] * 1000.0:.1f} ms)"
+            )
+        lines.append(
+            f"- CPU queue depth: avg {stats['avg_queue_depth']:.1f}, max "
+            f"{stats['max_queue_depth']}, full-queue stalls {stats['full_queue_stalls']}"
+        )
+        if stats["full_queue_stalls"]:
+            lines.append("- Bottleneck: CPU stage (I/O waited on a full queue)")
+        elif stats["cpu_tasks"]:
+            lines.append("- Bottleneck: I/O stage (CPU queue never filled)")
+        return lines
+
+
+def _io_segment(steps, value, start, fetch):
+    """Drive ``steps`` until its next CPU task: ``("cpu", task)`` or ``("done", result)``."""
+    began = time.perf_counter()
+    try:
+        request = next(steps) if start else steps.send(value)
+        while not isinstance(request, CpuTask):
+            request = steps.send(fetch(*request))
+    except StopIteration as stop:
+        return "done", stop.value, time.perf_counter() - began
+    return "cpu", request, time.perf_counter() - began
+
+
+def run_staged(
+    jobs,
+    fetch,
+    cpu_executor,
+    on_result,
+    io_workers=4,
+    cpu_slots=1,
+    queue_size=16,
+    metrics=None,
+    merge=None,
+):
+    """Run pipeline generators with separate I/O and CPU stages.
+
+    ``jobs`` is an iterable of ``(key, steps)``. ``fetch(url, timeout,
+    max_retries)`` answers HTTP requests on ``io_workers`` threads and CPU tasks
+    go to ``cpu_executor`` through a FIFO queue of at most ``queue_size`` tasks,
+    ``cpu_slots`` of them submitted at a time. ``on_result(key, value, error)``
+    is called on the calling thread as each pipeline finishes; it may return
+    more ``(key, steps)`` jobs, which run ahead of the remaining ones.
+
+    Tasks run through :func:`timed_run`; what a worker process's collector
+    returns is passed to ``merge``.
+    """
+    metrics = metrics if metrics is not None else StageMetrics()
+    started = time.perf_counter()
+    jobs = iter(jobs)
+    pushed = deque()  # jobs returned by on_result
+    resumable = deque()  # (key, steps, value) ready for their next I/O segment
+    queue = deque()  # (key, steps, task, enqueued_at)
+    io_in_flight = cpu_in_flight = 0
+    pending = {}
+
+    def finish(key, value, error, steps=None):
+        if steps is not None:
+            steps.close()
+        more = on_result(key, value, error)
+        if more:
+            pushed.extend(more)
+
+    def next_io():
+        if resumable:
+            key, steps, value = resumable.popleft()
+            return key, steps, value, False
+        job = pushed.popleft() if pushed else next(jobs, None)
+        if job is None:
+            return None
+        return job[0], job[1], None, True
+
+    with ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="ow-io") as io_pool:
+        while True:
+            # A full queue holds back new segments until the CPU stage catches up.
+            stalled = False
+            while io_in_flight < io_workers:
+                if len(queue) >= queue_size:
+                    stalled = True
+                    break
+                item = next_io()
+                if item is None:
+                    break
+                key, steps, value, first = item
+                future = io_pool.submit(_io_segment, steps, value, first, fetch)
+                pending[future] = ("io", key, steps, None)
+                io_in_flight += 1
+
+            while cpu_in_flight < cpu_slots and queue:
+                key, steps, task, enqueued_at = queue.popleft()
+                future = cpu_executor.submit(timed_run, task)
+                pending[future] = ("cpu", key, steps, enqueued_at)
+                cpu_in_flight += 1
+            metrics.record_depth(len(queue), stalled)
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, key, steps, enqueued_at = pending.pop(future)
+                if kind == "io":
+                    io_in_flight -= 1
+                    try:
+                        state, value, seconds = future.result()
+                    except Exception as e:
+                        finish(key, None, e, steps)
+                        continue
+                    metrics.record_io(seconds)
+                    if state == "cpu":
+                        queue.append((key, steps, value, time.perf_counter()))
+                    else:
+                        finish(key, value, None)
+                else:
+                    cpu_in_flight -= 1
+                    try:
+                        value, seconds, collected = future.result()
+                    except Exception as e:
+                        finish(key, None, e, steps)
+                        continue
+                    if collected and merge is not None:
+                        merge(collected)
+                    metrics.record_cpu(seconds, max(time.perf_counter() - enqueued_at - seconds, 0.0))
+                    resumable.append((key, steps, value))
+    metrics.record_wall(time.perf_counter() - started)
+    return metrics
@@ -0,0 +1,68 @@
+from options_wheel.bar_store import DailyBarStore
+
+
+def _quotes(dates):
+    return [{"date": f"{d}T00:00:00", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10} for d in dates]
+
+
+def test_bar_store_only_fetches_new_bars(tmp_path):
+    store = DailyBarStore(str(tmp_path / "bars.sqlite3"))
+    calls = []
+
+    def fetch(fetch_from, fetch_to):
+        calls.append((fetch_from, fetch_to))
+        days = ["2026-03-02", "2026-03-03", "2026-03-04", "2026-03-05", "2026-03-06"]
+        return _quotes(d for d in days if fetch_from <= d <= fetch_to)
+
+    bars = store.load("AAA", "2026-03-01", "2026-03-05", fetch, today="2026-03-05")
+    assert calls == [("2026-03-01", "2026-03-05")]
+    assert [bar["date"] for bar in bars] == ["2026-03-02", "2026-03-03", "2026-03-04", "2026-03-05"]
+    # Today's bar is returned but not persisted.
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-04")
+
+    bars = store.load("AAA", "2026-03-01", "2026-03-06", fetch, today="2026-03-06")
+    assert calls[-1] == ("2026-03-05", "2026-03-06")
+    assert [bar["date"] for bar in bars][-2:] == ["2026-03-05", "2026-03-06"]
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-05")
+
+    assert store.load("AAA", "2026-03-02", "2026-03-04", fetch, today="2026-03-06")[0]["close"] == 1.5
+    assert len(calls) == 2
+    store.close()
+
+
+def test_bar_store_failed_fetch_keeps_coverage(tmp_path):
+    store = DailyBarStore(str(tmp_path / "bars.sqlite3"))
+    bars = store.load("AAA", "2026-03-01", "2026-03-05", lambda f, t: None, today="2026-03-05")
+    assert bars == []
+    assert store.coverage("AAA") is None
+    store.close()
+
+
+def test_bar_store_covers_only_the_bars_it_received(tmp_path):
+    store = DailyBarStore(str(tmp_path / "bars.sqlite3"))
+    calls = []
+    published = {"2026-03-02", "2026-03-03"}
+
+    def fetch(fetch_from, fetch_to):
+        calls.append((fetch_from, fetch_to))
+        return _quotes(d for d in sorted(published) if fetch_from <= d <= fetch_to)
+
+    store.load("AAA", "2026-03-01", "2026-03-05", fetch, today="2026-03-05")
+    # The 2026-03-04 bar was not published yet, so it is asked for again.
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-03")
+    published.add("2026-03-04")
+    bars = store.load("AAA", "2026-03-01", "2026-03-05", fetch, today="2026-03-05")
+    assert calls[-1] == ("2026-03-04", "2026-03-05")
+    assert [bar["date"] for bar in bars][-1] == "2026-03-04"
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-04")
+
+    # An empty answer leaves the coverage where it was.
+    store.load("AAA", "2026-03-01", "2026-03-09", lambda f, t: [], today="2026-03-09")
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-04")
+    assert store.missing_range("AAA", "2026-03-01", "2026-03-09") == ("2026-03-05", "2026-03-09")
+
+    # A disjoint fetch of older bars does not replace newer coverage.
+    older = _quotes(["2026-02-02"])
+    store.merge("AAA", "2026-02-01", "2026-02-10", older, ("2026-02-01", "2026-02-10"), today="2026-03-09")
+    assert store.coverage("AAA") == ("2026-03-01", "2026-03-04")
+    store.close()
@@ -0,0 +1,111 @@
+import threading
+
+from options_wheel.cache import ResponseCache
+
+
+def test_response_cache_freshness_and_purge(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    cache.put("https://api/quotes?symbols=AAA", [{"symbol": "AAA"}], endpoint="quotes", ttl=60, now=1000.0)
+    cache.put("https://api/history?ticker=AAA", {"quotes": []}, endpoint="history", ttl=10, now=1000.0)
+
+    assert cache.get("https://api/quotes?symbols=AAA", max_age=60, now=1030.0) == [{"symbol": "AAA"}]
+    assert cache.get("https://api/quotes?symbols=AAA", max_age=20, now=1030.0) is None
+    assert cache.get("https://api/missing", max_age=60, now=1030.0) is None
+
+    stats = cache.stats(now=1030.0)
+    assert stats["entries"] == 2
+    assert stats["expired"] == 1
+    assert stats["by_endpoint"]["history"]["expired"] == 1
+
+    assert cache.purge(now=1030.0) == 1
+    assert cache.stats(now=1030.0)["entries"] == 1
+    assert cache.purge(expired_only=False) == 1
+    cache.close()
+
+
+def test_response_cache_is_shared_across_threads(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path)
+
+    def writer(worker):
+        for i in range(25):
+            cache.put(f"https://api/options?ticker=T{worker}-{i}", {"n": i}, endpoint="options", ttl=600)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = ResponseCache(path)
+    assert reopened.stats()["entries"] == 100
+    assert reopened.get("https://api/options?ticker=T3-24", max_age=600) == {"n": 24}
+    reopened.close()
+
+
+def test_response_cache_compresses_and_evicts_least_recently_used(tmp_path):
+    payload = {"options": [{"strike": float(k), "bid": 1.0, "ask": 1.1} for k in range(400)]}
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), max_bytes=10_000)
+
+    for i in range(20):
+        cache.put(f"https://api/options?ticker=T{i}", payload, endpoint="options", ttl=600, now=1000.0 + i)
+        # Keep T0 hot: it must survive eviction even though it was written first.
+        assert cache.get("https://api/options?ticker=T0", max_age=600, now=1000.5 + i) == payload
+
+    stats = cache.stats(now=1100.0)
+    run = cache.run_stats()
+    assert stats["payload_bytes"] <= 10_000
+    assert stats["payload_bytes"] < stats["raw_bytes"]
+    assert run["bytes_saved"] > 0
+    assert run["evictions"] > 0
+    assert cache.get("https://api/options?ticker=T1", max_age=600, now=1100.0) is None
+    cache.close()
+
+
+def test_cache_ttl_policy_by_endpoint(monkeypatch):
+    from options_wheel import analysis
+
+    monkeypatch.setattr(analysis, "CACHE_TTL_SECONDS", 3600.0)
+    monkeypatch.setattr(
+        analysis, "CACHE_TTL_BY_ENDPOINT", {"quotes": 30.0, "options": 600.0, "history": 3600.0}
+    )
+    monkeypatch.setattr(analysis, "CACHE_TTL_HISTORY_CLOSED", 86400.0)
+
+    assert analysis._cache_ttl(f"{analysis.BASE_URL}?symbols=AAA,BBB") == 30.0
+    assert analysis._cache_ttl(f"{analysis.OPTIONS_URL}?ticker=AAA&filter=puts") == 600.0
+    assert analysis._cache_ttl(f"{analysis.HIST_URL}?ticker=AAA&from=2020-01-01&to=2020-12-31") == 86400.0
+    assert analysis._cache_ttl(f"{analysis.HIST_URL}?ticker=AAA&from=2020-01-01&to=2999-12-31") == 3600.0
+    assert analysis._cache_ttl("https://elsewhere/api?x=1") == 3600.0
+
+    monkeypatch.setattr(analysis, "CACHE_TTL_SECONDS", 0.0)
+    assert analysis._cache_ttl(f"{analysis.BASE_URL}?symbols=AAA") == 0.0
+
+
+def test_pinned_run_shares_payloads_with_the_cache_disabled(monkeypatch):
+    from options_wheel import analysis
+
+    url = f"{analysis.OPTIONS_URL}?ticker=AAA"
+    monkeypatch.setattr(analysis, "CACHE_TTL_SECONDS", 0.0)
+    monkeypatch.setattr(analysis, "PINNED_PAYLOADS", {})
+    monkeypatch.setattr(analysis, "CACHE_PINNED_SINCE", None)
+    analysis._write_cache(url, {"options": []})
+    assert analysis._read_cache(url) is None
+
+    monkeypatch.setattr(analysis, "CACHE_PINNED_SINCE", 0.0)
+    analysis._write_cache(url, {"options": []})
+    assert analysis._read_cache(url) == {"options": []}
+
+
+def test_negative_entries_expire_and_purge(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    cache.put_negative("https://api/options?ticker=GONE", "HTTP 404", ttl=60, now=1000.0)
+    cache.put_negative("quote:OLD", "missing from quote batch", ttl=10, now=1000.0)
+
+    assert cache.get_negative("https://api/options?ticker=GONE", now=1030.0) == "HTTP 404"
+    assert cache.get_negative("quote:OLD", now=1030.0) is None
+    assert cache.stats(now=1030.0)["negative"] == 1
+    assert cache.run_stats()["negative_hits"] == 1
+
+    cache.purge(expired_only=False)
+    assert cache.get_negative("https://api/options?ticker=GONE", now=1030.0) is None
+    cache.close()
@@ -0,0 +1,309 @@
+import math
+import pickle
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from options_wheel import analysis
+from options_wheel.bar_store import DailyBarStore
+from options_wheel.cache import ResponseCache
+from options_wheel.checkpoint import ScanJournal
+from options_wheel.indicator_store import IndicatorStateStore
+from options_wheel.yield_ceiling import YieldCeilingGrid
+
+
+def _history_payload(days=260, start_price=100.0):
+    start = datetime.now() - timedelta(days=days)
+    quotes = []
+    for i in range(days):
+        close = start_price * (1.0 + 0.02 * math.sin(i / 7.0)) + i * 0.01
+        quotes.append(
+            {
+                "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+                "open": close,
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": 1_000_000,
+            }
+        )
+    return {"quotes": quotes}
+
+
+def _options_payload(price):
+    expiry = datetime.now(timezone.utc) + timedelta(days=30)
+    puts = []
+    for strike in range(int(price * 0.7), int(price * 1.05)):
+        distance = max(price - strike, 0.5)
+        bid = round(max(3.0 - distance * 0.12, 0.05), 2)
+        puts.append(
+            {
+                "strike": float(strike),
+                "bid": bid,
+                "ask": round(bid + 0.04, 2),
+                "impliedVolatility": 0.55,
+                "openInterest": 800,
+                "volume": 120,
+            }
+        )
+    return {"options": [{"expirationDate": expiry.strftime("%Y-%m-%d"), "puts": puts}]}
+
+
+def _quotes_payload(url):
+    symbols = url.split("symbols=")[1].split("&")[0].split(",")
+    return [
+        {
+            "symbol": symbol,
+            "shortName": symbol,
+            "regularMarketPrice": 100.0 if symbol != "PRICEY" else 5000.0,
+            "averageDailyVolume3Month": 2_000_000,
+            "marketCap": 10_000_000_000,
+            "fiftyDayAverage": 120.0,
+        }
+        for symbol in symbols
+    ]
+
+
+def _fake_get(url, timeout=None, max_retries=None):
+    if url.startswith(analysis.BASE_URL + "?"):
+        return _quotes_payload(url)
+    symbol = url.split("ticker=")[1].split("&")[0]
+    if url.startswith(analysis.HIST_URL):
+        return _history_payload()
+    if symbol == "EMPTY":
+        return None
+    if symbol == "DELISTED":
+        return {}
+    return _options_payload(100.0)
+
+
+async def _fake_get_async(url, timeout=None, max_retries=None):
+    return _fake_get(url, timeout, max_retries)
+
+
+class _FrozenDatetime(datetime):
+    """``datetime`` whose clock stands still, so runs compare field for field."""
+
+    frozen = datetime.now(timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        value = cls.frozen.astimezone(tz)
+        return value if tz else value.replace(tzinfo=None)
+
+
+@pytest.fixture(scope="module")
+def yield_ceiling_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("yield_ceiling")
+    return str(directory), YieldCeilingGrid.load_or_build(str(directory))
+
+
+@pytest.fixture
+def candidates(monkeypatch, tmp_path, yield_ceiling_dir):
+    monkeypatch.setattr(analysis, "safe_get", _fake_get)
+    monkeypatch.setattr(analysis, "safe_get_async", _fake_get_async)
+    # Time to expiry is measured to the second; two runs must see the same clock.
+    monkeypatch.setattr(analysis, "datetime", _FrozenDatetime)
+    monkeypatch.setattr(analysis, "CURRENT_SCAN_DATE", None)
+    monkeypatch.setattr(analysis, "BAR_STORE", DailyBarStore(str(tmp_path / "bars.sqlite3")))
+    monkeypatch.setattr(
+        analysis, "INDICATOR_STATES", IndicatorStateStore(str(tmp_path / "indicators.sqlite3"))
+    )
+    monkeypatch.setattr(analysis, "RESPONSE_CACHE", ResponseCache(str(tmp_path / "responses.sqlite3")))
+    monkeypatch.setattr(analysis, "CACHE_TTL_SECONDS", 3600.0)
+    monkeypatch.setattr(analysis, "YIELD_CEILING_DIR", yield_ceiling_dir[0])
+    monkeypatch.setattr(analysis, "YIELD_CEILING", yield_ceiling_dir[1])
+    return [
+        {"symbol": symbol, "name": symbol, "price": 100.0, "fifty_day_average": 120.0}
+        for symbol in ("AAA", "EMPTY", "BBB", "CCC")
+    ]
+
+
+def test_async_engine_matches_thread_engine(candidates):
+    threaded = analysis.deep_analysis(candidates, option_type="put")
+    asynchronous = analysis.deep_analysis_async(candidates, option_type="put", concurrency=3)
+
+    assert threaded == asynchronous
+    assert threaded[0] or threaded[1]
+
+
+@pytest.mark.parametrize("cpu_workers", [0, 1])
+def test_staged_engine_matches_thread_engine(candidates, cpu_workers):
+    analysis.STAGE_METRICS.reset()
+    threaded = analysis.deep_analysis(candidates, option_type="put")
+    staged = analysis.deep_analysis_staged(
+        candidates, option_type="put", cpu_workers=cpu_workers, queue_size=2
+    )
+
+    assert staged == threaded
+    stats = analysis.STAGE_METRICS.snapshot()
+    # Every candidate trades below its 50-day average, so all four build their
+    # indicators for the downtrend filter; EMPTY has no chain, and the other
+    # three run both evaluation passes.
+    assert stats["cpu_tasks"] == 4 + 6
+    assert stats["max_queue_depth"] <= 2 + analysis.MAX_WORKERS
+
+
+def test_results_follow_candidate_order(candidates):
+    passed, near = analysis.deep_analysis_async(candidates, option_type="put", concurrency=4)
+
+    assert list(dict.fromkeys(row["Symbol"] for row in passed)) == ["AAA", "BBB", "CCC"]
+    assert "EMPTY" not in {row["Symbol"] for row in passed + near}
+
+
+def test_empty_chain_is_negative_cached(candidates, monkeypatch):
+    calls = []
+
+    def counting_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        return _fake_get(url, timeout, max_retries)
+
+    monkeypatch.setattr(analysis, "safe_get", counting_get)
+    delisted = {"symbol": "DELISTED", "name": "", "price": 100.0, "fifty_day_average": 120.0}
+    before = analysis._snapshot_error_stats()["negative_cache_skips"]
+
+    assert analysis.analyze_single_symbol_options(delisted) == ([], [])
+    fetched = len(calls)
+    assert analysis.analyze_single_symbol_options(delisted) == ([], [])
+
+    assert len(calls) == fetched
+    assert analysis._snapshot_error_stats()["negative_cache_skips"] - before == 1
+
+
+def test_both_types_share_one_unfiltered_chain(candidates, monkeypatch):
+    calls = []
+
+    def both_sides_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        data = _fake_get(url, timeout, max_retries)
+        if url.startswith(analysis.OPTIONS_URL) and "filter=" not in url:
+            for chain in data["options"]:
+                chain["calls"] = [dict(put, strike=put["strike"] + 30.0) for put in chain["puts"]]
+        return data
+
+    monkeypatch.setattr(analysis, "safe_get", both_sides_get)
+    monkeypatch.setattr(analysis, "SHARED_CHAIN_EXPIRATIONS", 3)
+    for option_type in ("put", "call"):
+        analysis.analyze_single_symbol_options(candidates[0], option_type=option_type)
+
+    chain_urls = [url for url in calls if url.startswith(analysis.OPTIONS_URL)]
+    assert len(set(chain_urls)) == 1
+    assert "filter=" not in chain_urls[0]
+
+
+def test_shared_chain_falls_back_when_a_side_is_missing(candidates, monkeypatch):
+    calls = []
+
+    def puts_only_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        return _fake_get(url, timeout, max_retries)
+
+    monkeypatch.setattr(analysis, "safe_get", puts_only_get)
+    monkeypatch.setattr(analysis, "SHARED_CHAIN_EXPIRATIONS", 3)
+    analysis.analyze_single_symbol_options(candidates[0], option_type="call")
+
+    chain_urls = [url for url in calls if url.startswith(analysis.OPTIONS_URL)]
+    assert len(chain_urls) == 2
+    assert "filter=calls" in chain_urls[1]
+
+
+def test_streaming_scan_matches_sequential_phases(candidates, monkeypatch):
+    monkeypatch.setattr(analysis, "BATCH_SIZE", 2)
+    monkeypatch.setattr(analysis, "PRICE_LIMIT", 1000.0)
+    monkeypatch.setattr(analysis, "MIN_STOCK_AVG_VOLUME", 0)
+    monkeypatch.setattr(analysis, "MIN_MARKET_CAP", 0)
+    tickers = ["AAA", "PRICEY", "EMPTY", "BBB", "CCC"]
+
+    quotes = analysis.fetch_quote_candidates(tickers)
+    sequential = analysis.deep_analysis(
+        [quote for quote in quotes if analysis._passes_price_filter(quote)]
+    )
+    threaded = analysis.screen_and_analyze(tickers)
+    asynchronous = analysis.screen_and_analyze_async(tickers, concurrency=3)
+    staged = analysis.screen_and_analyze_staged(tickers, cpu_workers=0, queue_size=1)
+
+    assert threaded == asynchronous == staged
+    assert threaded[0] == quotes
+    assert [c["symbol"] for c in threaded[1]] == ["AAA", "EMPTY", "BBB", "CCC"]
+    assert threaded[2] == sequential
+
+
+def test_resume_skips_journaled_symbols(candidates, monkeypatch, tmp_path):
+    path = str(tmp_path / "put_scan.jsonl")
+    monkeypatch.setattr(analysis, "SCAN_JOURNAL", ScanJournal(path, "2026-01-02", "put", "abc").open())
+    full = analysis.deep_analysis(candidates[:2], option_type="put")
+    analysis.SCAN_JOURNAL.close()
+
+    calls = []
+
+    def counting_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        return _fake_get(url, timeout, max_retries)
+
+    monkeypatch.setattr(analysis, "safe_get", counting_get)
+    journal = ScanJournal(path, "2026-01-02", "put", "abc").open(resume=True)
+    monkeypatch.setattr(analysis, "SCAN_JOURNAL", journal)
+    resumed = analysis.deep_analysis(candidates, option_type="put")
+    journal.close()
+
+    assert {url.split("ticker=")[1].split("&")[0] for url in calls} == {"BBB", "CCC"}
+    assert resumed[0][: len(full[0])] == full[0]
+    monkeypatch.setattr(analysis, "SCAN_JOURNAL", None)
+    assert resumed == analysis.deep_analysis(candidates, option_type="put")
+    # A different config hash starts a fresh journal.
+    assert ScanJournal(path, "2026-01-02", "put", "other").load() == {}
+
+
+def test_symbol_is_negative_cached_after_two_missing_quote_batches(candidates, monkeypatch):
+    responses = []
+
+    def partial_quotes(url, timeout=None, max_retries=None):
+        return [quote for quote in _quotes_payload(url) if quote["symbol"] not in responses[-1]]
+
+    monkeypatch.setattr(analysis, "safe_get", partial_quotes)
+
+    def scan(*missing):
+        responses.append(set(missing))
+        batches = analysis._quote_batches(["AAA", "BBB", "CCC"])
+        return [analysis.run_steps(analysis._quote_batch_steps(batch)) for batch in batches]
+
+    scan("BBB", "CCC")
+    # One partial response is not enough to drop a symbol.
+    assert analysis._read_negative("quote:BBB") is None
+    scan("CCC")
+    assert analysis._read_negative("quote:CCC") is not None
+    assert analysis._read_negative("quote:BBB") is None
+    scan("BBB")
+    # BBB came back in between, so this is its first miss again.
+    assert analysis._read_negative("quote:BBB") is None
+    assert [row["symbol"] for rows in scan() for row in rows] == ["AAA", "BBB"]
+
+
+def test_streaming_scan_analyzes_while_later_batches_are_pending(candidates, monkeypatch):
+    calls = []
+
+    def recording_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        return _fake_get(url, timeout, max_retries)
+
+    monkeypatch.setattr(analysis, "safe_get", recording_get)
+    monkeypatch.setattr(analysis, "BATCH_SIZE", 1)
+    monkeypatch.setattr(analysis, "MAX_WORKERS", 1)
+    monkeypatch.setattr(analysis, "QUOTE_BATCHES_IN_FLIGHT", 1)
+    analysis.screen_and_analyze(["AAA", "BBB", "CCC"])
+
+    quote_calls = [idx for idx, url in enumerate(calls) if url.startswith(analysis.BASE_URL + "?")]
+    first_analysis = min(idx for idx, url in enumerate(calls) if "ticker=" in url)
+    assert first_analysis < quote_calls[-1]
+
+
+def test_cpu_worker_config_leaves_run_state_behind(candidates, monkeypatch):
+    monkeypatch.setattr(analysis, "CACHE_PINNED_SINCE", 0.0)
+    monkeypatch.setattr(
+        analysis, "PINNED_PAYLOADS", {f"url-{i}": _options_payload(100.0) for i in range(200)}
+    )
+    config = analysis._cpu_worker_config()
+
+    assert set(config) == set(analysis.CPU_WORKER_SETTINGS)
+    assert "PINNED_PAYLOADS" not in config and "CACHE_PINNED_SINCE" not in config
+    assert len(pickle.dumps(config)) < 8192
@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta, timezone
 
+import pytest
+
 from options_wheel import analysis
+from options_wheel.metrics import option_price, years_to_expiration
 
 
 def _symbol_data():
@@ -52,3 +55,229 @@ def test_spread_checks_are_always_applied():
     _, failed = result
     assert any(name.startswith("Spread <= ") and name.endswith("%") for name in failed)
     assert any(name.startswith("Spread <= $") for name in failed)
+
+
+def _chain(now_dt):
+    near = now_dt + timedelta(days=30)
+    far = now_dt + timedelta(days=75)
+    contracts = []
+    for expiration_dt in (near, far, now_dt - timedelta(days=1)):
+        for strike in range(70, 131):
+            distance = max(abs(100.0 - strike), 0.5)
+            bid = round(max(3.0 - distance * 0.12, 0.05), 2)
+            contracts.append(
+                (
+                    expiration_dt,
+                    _option(
+                        strike=float(strike),
+                        bid=bid,
+                        ask=round(bid + 0.04 + (strike % 7) * 0.05, 2),
+                        impliedVolatility=0.30 + (strike % 5) * 0.08,
+                        openInterest=(strike % 4) * 40,
+                        volume=str((strike % 3) * 10),
+                    ),
+                )
+            )
+    contracts.append((near, _option(strike=None)))
+    contracts.append((near, _option(strike=91.0, bid=None)))
+    contracts.append((near, _option(strike=92.0, bid=1.5, ask=1.0)))
+    contracts.append((near, _option(strike=93.0, impliedVolatility=None)))
+    contracts.append((near, _option(strike=94.0, delta=-0.12)))
+    contracts.append((near, _option(strike=95.0, delta="bad", openInterest="7.9")))
+    contracts.append((None, _option(strike=89.0, expiration=near.strftime("%Y-%m-%d"))))
+    return contracts
+
+
+def _scalar_first_pass(symbol_data, contracts, now_dt, option_type):
+    spread_keys = {
+        f"Spread <= {analysis.MAX_SPREAD_PCT}%",
+        f"Spread <= ${analysis.MAX_SPREAD_ABS:.2f}",
+    }
+    kept = []
+    for expiration_dt, option in contracts:
+        evaluated = analysis._evaluate_contract(
+            symbol_data, expiration_dt, option, now_dt, option_type=option_type
+        )
+        if evaluated and len(evaluated[1]) <= 1 and not spread_keys.intersection(evaluated[1]):
+            kept.append(evaluated)
+    return kept
+
+
+@pytest.mark.parametrize("option_type", ["put", "call"])
+def test_vectorized_chain_matches_scalar_evaluation(monkeypatch, option_type):
+    monkeypatch.setattr(analysis, "MIN_OPEN_INTEREST", 50)
+    monkeypatch.setattr(analysis, "MIN_VOLUME", 5)
+    monkeypatch.setattr(analysis, "MIN_OTM_PCT", 2.0)
+    monkeypatch.setattr(analysis, "EXCLUDE_EARNINGS_BEFORE_EXPIRY", True)
+    now_dt = datetime.now(timezone.utc)
+    symbol_data = {
+        **_symbol_data(),
+        "dividend_yield": 0.02,
+        "ex_dividend_date_dt": now_dt + timedelta(days=10),
+        "trailing_annual_dividend_rate": 2.0,
+        "next_earnings_dt": now_dt + timedelta(days=50),
+    }
+    contracts = _chain(now_dt)
+
+    before = analysis._snapshot_error_stats()
+    scalar = _scalar_first_pass(symbol_data, contracts, now_dt, option_type)
+    after_scalar = analysis._snapshot_error_stats()
+    vectorized = analysis._evaluate_chain(symbol_data, contracts, now_dt, option_type=option_type)
+    after_vectorized = analysis._snapshot_error_stats()
+
+    for key in ("contracts_excluded_missing_quote", "contracts_excluded_earnings"):
+        assert after_scalar[key] - before[key] == after_vectorized[key] - after_scalar[key]
+    assert after_scalar["contracts_excluded_earnings"] > before["contracts_excluded_earnings"]
+    assert len(vectorized) == len(scalar) > 0
+    for (row, failed, _), (expected_row, expected_failed) in zip(vectorized, scalar):
+        assert failed == expected_failed
+        assert row.keys() == expected_row.keys()
+        for key, expected in expected_row.items():
+            if isinstance(expected, float):
+                assert row[key] == pytest.approx(expected, abs=1e-9), key
+            else:
+                assert row[key] == expected, key
+
+
+def test_vectorized_chain_rejects_everything_without_a_price():
+    now_dt = datetime.now(timezone.utc)
+    symbol_data = {**_symbol_data(), "price": None}
+    assert analysis._evaluate_chain(symbol_data, _chain(now_dt), now_dt) == []
+
+
+def test_contracts_of_one_expiration_share_a_context():
+    now_dt = datetime.now(timezone.utc)
+    symbol_data = {
+        **_symbol_data(),
+        "dividend_yield": 0.02,
+        "ex_dividend_date_dt": now_dt + timedelta(days=10),
+        "next_earnings_dt": now_dt + timedelta(days=50),
+    }
+    contracts = _chain(now_dt)
+    contexts = analysis._expiration_contexts(symbol_data, contracts, now_dt)
+
+    # The string-dated contract resolves to the same expiry as the datetime ones.
+    assert len({id(context) for context in contexts}) == 4
+    near, far = contexts[0], contexts[61]
+    assert contexts[-1].expiration.date() == near.expiration.date()
+    assert near.dte == 30 and far.dte == 75
+    assert near.ex_dividend_before_expiry and near.ex_dividend_date is not None
+    assert not near.earnings_before_expiry and far.earnings_before_expiry
+    assert near.dividend_amount == pytest.approx(100.0 * 0.02 / 4)
+
+    survivors = analysis._evaluate_chain(symbol_data, contracts, now_dt)
+    by_expiry = {}
+    for row, _, context in survivors:
+        assert by_expiry.setdefault(row["Expiration"], context) is context
+    assert by_expiry
+
+
+def _skewed_chain_payload(now_dt, price=100.0, api_delta=None, far_iv_scale=1.0):
+    chains = []
+    for days in (10, 30, 45):
+        expiry = now_dt + timedelta(days=days)
+        sides = {"puts": [], "calls": []}
+        t_years = years_to_expiration(expiry, now_dt)
+        for strike in range(50, 151):
+            # Skewed smile, within STRIKE_WINDOW_IV_MULTIPLE of ATM IV, quoted
+            # around its Black-Scholes value.
+            iv = 0.35 + 0.004 * abs(price - strike)
+            if abs(price - strike) > 20:
+                iv *= far_iv_scale
+            for side in ("puts", "calls"):
+                value = option_price(price, strike, iv, t_years, analysis.RISK_FREE_RATE, 0.0, side[:-1])
+                bid = max(round(value - 0.02, 2), 0.01)
+                sides[side].append(
+                    {
+                        "strike": float(strike),
+                        "bid": bid,
+                        "ask": round(max(value + 0.03, bid + 0.01), 2),
+                        "impliedVolatility": iv,
+                        "openInterest": 300,
+                        "volume": 40,
+                    }
+                )
+                if api_delta is not None:
+                    sides[side][-1]["delta"] = api_delta if side == "calls" else -api_delta
+        chains.append({"expirationDate": expiry.strftime("%Y-%m-%d"), **sides})
+    return {"options": chains}
+
+
+@pytest.mark.parametrize("option_type", ["put", "call"])
+@pytest.mark.parametrize("min_abs_delta", [0.0, 0.03])
+@pytest.mark.parametrize(
+    "chain",
+    [
+        {},
+        # The API's delta is used as is, whatever the strike.
+        {"api_delta": 0.10},
+        # Wings quoted far outside the IV band around ATM IV.
+        {"far_iv_scale": 4.0},
+    ],
+)
+def test_strike_window_pruning_keeps_every_candidate(monkeypatch, option_type, min_abs_delta, chain):
+    monkeypatch.setattr(analysis, "EXCLUDE_EARNINGS_BEFORE_EXPIRY", False)
+    monkeypatch.setattr(analysis, "MIN_OTM_PCT", 5.0)
+    monkeypatch.setattr(analysis, "MIN_ABS_DELTA", min_abs_delta)
+    monkeypatch.setattr(analysis, "MAX_ABS_DELTA", 0.25)
+    monkeypatch.setattr(analysis, "MAX_EXPIRATIONS_PER_SYMBOL", 3)
+    monkeypatch.setattr(analysis, "MIN_DTE", 20)
+    monkeypatch.setattr(analysis, "MAX_DTE", 40)
+    now_dt = datetime.now(timezone.utc)
+    symbol_data = _symbol_data()
+    payload = _skewed_chain_payload(now_dt, **chain)
+
+    monkeypatch.setattr(analysis, "STRIKE_WINDOW_IV_MULTIPLE", 0.0)
+    count, atm_iv, unpruned = analysis._first_pass(symbol_data, payload, now_dt, option_type)
+    monkeypatch.setattr(analysis, "STRIKE_WINDOW_IV_MULTIPLE", 3.0)
+    before = analysis._snapshot_error_stats()["contracts_pruned_strike_window"]
+    _, _, pruned = analysis._first_pass(symbol_data, payload, now_dt, option_type)
+    pruned_count = analysis._snapshot_error_stats()["contracts_pruned_strike_window"] - before
+
+    statuses = {row.status for row, _, _ in unpruned}
+    assert statuses == {"PASS", "NEAR"}
+    assert [(row.to_dict(), failed) for row, failed, _ in pruned] == [
+        (row.to_dict(), failed) for row, failed, _ in unpruned
+    ]
+    if not chain:
+        # The in-the-money half of every chain, and more of the two expiries
+        # outside the DTE window, never reach the evaluator.
+        assert count * 0.5 < pruned_count < count
+    else:
+        # At least the in-the-money strikes of the expiries outside the window.
+        assert count / 6 < pruned_count < count
+
+    _, contexts, dropped = analysis._prune_strike_window(symbol_data, [], now_dt, atm_iv, option_type)
+    assert (contexts, dropped) == ([], 0)
+
+
+def test_missing_and_stale_ivs_are_solved_from_the_mid(monkeypatch):
+    monkeypatch.setattr(analysis, "SOLVE_STALE_IV", True)
+    now_dt = datetime.now(timezone.utc)
+    expiry = now_dt + timedelta(days=30)
+    t_years = years_to_expiration(expiry, now_dt)
+    rate = analysis.RISK_FREE_RATE
+    value = option_price(100.0, 90.0, 0.40, t_years, rate, 0.0)
+    quote = {"bid": round(value - 0.02, 2), "ask": round(value + 0.02, 2)}
+    contracts = [
+        (expiry, _option(strike=90.0, impliedVolatility=0.40, **quote)),
+        (expiry, _option(strike=90.0, impliedVolatility=None, **quote)),
+        (expiry, _option(strike=90.0, impliedVolatility=0.00001, **quote)),
+        (expiry, _option(strike=90.0, impliedVolatility=0.90, **quote)),
+        (expiry, _option(strike=90.0, impliedVolatility=None, bid=None)),
+    ]
+    contexts = analysis._expiration_contexts(_symbol_data(), contracts, now_dt)
+
+    repaired, solved = analysis._solve_stale_ivs(_symbol_data(), contracts, contexts)
+
+    assert solved == 3
+    assert repaired[0] is contracts[0] and repaired[4] is contracts[4]
+    mid = (quote["bid"] + quote["ask"]) / 2
+    for _, option in repaired[1:4]:
+        iv = option["impliedVolatility"]
+        assert option_price(100.0, 90.0, iv, t_years, rate, 0.0) == pytest.approx(mid, abs=1e-6)
+        assert iv == pytest.approx(0.40, abs=0.01)
+    assert contracts[1][1]["impliedVolatility"] is None
+
+    monkeypatch.setattr(analysis, "SOLVE_STALE_IV", False)
+    assert analysis._solve_stale_ivs(_symbol_data(), contracts, contexts) == (contracts, 0)
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from options_wheel import analysis
+from options_wheel.bar_store import DailyBarStore
+from options_wheel.indicator_store import (
+    IndicatorStateStore,
+    continues,
+    sessions_missing,
+    split_suspected,
+)
+from options_wheel.indicators import IndicatorState
+
+
+def _bars(days=200, split_at=None):
+    start = datetime.now() - timedelta(days=days)
+    bars = []
+    for i in range(days):
+        close = 100.0 + (i % 9) - (i % 4) * 0.7 + i * 0.05
+        if split_at is not None and i >= split_at:
+            close /= 4.0
+        bars.append(
+            {
+                "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+                "open": close,
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": 1000,
+            }
+        )
+    return bars
+
+
+@pytest.fixture
+def history(monkeypatch, tmp_path):
+    payload = {"bars": _bars()}
+    calls = []
+
+    def fake_get(url, timeout=None, max_retries=None):
+        calls.append(url)
+        query = dict(part.split("=") for part in url.split("?")[1].split("&"))
+        return [bar for bar in payload["bars"] if query["from"] <= bar["date"] <= query["to"]]
+
+    monkeypatch.setattr(analysis, "safe_get", fake_get)
+    monkeypatch.setattr(analysis, "BAR_STORE", DailyBarStore(str(tmp_path / "bars.sqlite3")))
+    monkeypatch.setattr(
+        analysis, "INDICATOR_STATES", IndicatorStateStore(str(tmp_path / "indicators.sqlite3"))
+    )
+    return payload, calls
+
+
+def test_second_run_only_applies_bars_after_the_saved_state(history):
+    payload, calls = history
+    first = analysis.fetch_historical_indicators("AAA")
+    state = analysis.INDICATOR_STATES.load("AAA")
+    yesterday = payload["bars"][-1]["date"]
+    assert state.last_date == yesterday
+
+    before = analysis._snapshot_error_stats()["indicator_state_updates"]
+    second = analysis.fetch_historical_indicators("AAA")
+    assert second == first
+    # Only today's still-open bar had to be downloaded.
+    assert f"from={datetime.now():%Y-%m-%d}" in calls[-1]
+    assert analysis._snapshot_error_stats()["indicator_state_updates"] == before + 1
+
+
+def test_state_is_rebuilt_when_it_no_longer_matches_the_bars(history):
+    _, calls = history
+    first = analysis.fetch_historical_indicators("AAA")
+    state = analysis.INDICATOR_STATES.load("AAA")
+    state.last_bar = (1.0, 1.0, 1.0)
+    analysis.INDICATOR_STATES.save("AAA", state)
+
+    before = analysis._snapshot_error_stats()["indicator_state_rebuilds"]
+    assert analysis.fetch_historical_indicators("AAA") == first
+    assert analysis._snapshot_error_stats()["indicator_state_rebuilds"] == before + 1
+
+
+def test_split_forgets_stored_bars_and_rebuilds_from_adjusted_history(history):
+    payload, calls = history
+    analysis.fetch_historical_indicators("AAA")
+    # The vendor re-adjusts the whole history; the store still holds the old scale.
+    adjusted = _bars(split_at=0)
+    today = dict(adjusted[-1], date=f"{datetime.now():%Y-%m-%d}")
+    payload["bars"] = adjusted + [today]
+    assert split_suspected(analysis.BAR_STORE.bars("AAA", adjusted[-1]["date"], today["date"]) + [today])
+
+    before = analysis._snapshot_error_stats()["indicator_state_rebuilds"]
+    rebuilt = analysis.fetch_historical_indicators("AAA")
+    expected = analysis.indicators_from_history(payload["bars"])
+    assert analysis._snapshot_error_stats()["indicator_state_rebuilds"] == before + 1
+    assert rebuilt == pytest.approx(expected, rel=1e-12)
+    stored = analysis.BAR_STORE.bars("AAA", adjusted[0]["date"], adjusted[-1]["date"])
+    assert [bar["close"] for bar in stored] == [bar["close"] for bar in adjusted]
+    assert continues(analysis.INDICATOR_STATES.load("AAA"), stored[-1:])
+
+
+def test_state_is_rebuilt_when_new_bars_skip_sessions(history):
+    payload, calls = history
+    bars = payload["bars"]
+    payload["bars"] = bars[:-10]
+    analysis.fetch_historical_indicators("AAA")
+    # Five calendar days in a row are missing from the next answer.
+    payload["bars"] = bars[:-9] + bars[-4:]
+    assert sessions_missing(payload["bars"][-6:])
+    assert not sessions_missing(bars)
+
+    before = analysis._snapshot_error_stats()["indicator_state_rebuilds"]
+    rebuilt = analysis.fetch_historical_indicators("AAA")
+    assert analysis._snapshot_error_stats()["indicator_state_rebuilds"] == before + 1
+    assert rebuilt == pytest.approx(analysis.indicators_from_history(payload["bars"]), rel=1e-12)
+    # The whole window was downloaded again rather than advanced across the gap.
+    assert calls[-1].split("from=")[1][:10] < bars[0]["date"]
+
+
+def test_store_round_trips_and_ignores_other_versions(tmp_path):
+    store = IndicatorStateStore(str(tmp_path / "indicators.sqlite3"))
+    bars = _bars(60)
+    state = IndicatorState().advance(
+        [b["high"] for b in bars],
+        [b["low"] for b in bars],
+        [b["close"] for b in bars],
+        dates=[b["date"] for b in bars],
+    )
+    store.save("AAA", state)
+    assert store.load("AAA").indicators() == state.indicators()
+    assert store.load("BBB") is None
+
+    state.VERSION = 0
+    store.save("AAA", state)
+    assert store.load("AAA") is None
+    store.close()
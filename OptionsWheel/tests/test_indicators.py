@@ -0,0 +1,99 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_wheel import analysis
+from options_wheel.indicators import IndicatorState, bar_arrays, compute_indicators
+
+
+def _pandas_indicators(high, low, close):
+    """The DataFrame pipeline indicators_from_history used before the engine."""
+    df = pd.DataFrame({"high": high, "low": low, "close": close})
+    close = df["close"]
+    macd_line, signal_line = analysis.calculate_macd(close)
+    log_returns = np.log(close / close.shift(1)).dropna()
+    hv_current = log_returns[-20:].std() * np.sqrt(252)
+    return {
+        "ema50": analysis.calculate_ema(close, 50).iloc[-1],
+        "rsi": analysis.calculate_rsi(close, 14).iloc[-1],
+        "adx": analysis.calculate_adx(df, 14).iloc[-1],
+        "rvi": analysis.calculate_rvi(close).iloc[-1],
+        "macd": macd_line.iloc[-1],
+        "signal": signal_line.iloc[-1],
+        "price": close.iloc[-1],
+        "hv_current": hv_current,
+        "hv_long": log_returns[-60:].std() * np.sqrt(252) if len(log_returns) >= 60 else hv_current,
+        "hv_high": log_returns.rolling(20).std().max() * np.sqrt(252),
+        "hv_low": log_returns.rolling(20).std().min() * np.sqrt(252),
+        "realized_drift": float(np.clip(log_returns.mean() * 252, -0.25, 0.25)),
+    }
+
+
+def _random_bars(size, seed):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, size)))
+    spread = close * rng.uniform(0.0, 0.03, size)
+    high = close + spread * rng.uniform(0.0, 1.0, size)
+    low = close - spread * rng.uniform(0.0, 1.0, size)
+    return high, low, close
+
+
+@pytest.mark.parametrize("size,seed", [(50, 1), (120, 2), (252, 3), (400, 4)])
+def test_engine_matches_pandas_indicators(size, seed):
+    bars = _random_bars(size, seed)
+    expected = _pandas_indicators(*bars)
+    actual = compute_indicators(*bars)
+
+    assert actual.keys() >= expected.keys()
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(float(value), rel=1e-9, abs=1e-9), key
+
+
+def test_engine_handles_degenerate_series_like_pandas():
+    # Never falling (RSI pinned at 100) and flat for the last 30 bars (zero
+    # true range, zero realised volatility).
+    close = np.concatenate((np.linspace(50.0, 80.0, 60), np.full(30, 80.0)))
+    high, low = close.copy(), close.copy()
+    expected = _pandas_indicators(high, low, close)
+    actual = compute_indicators(high, low, close)
+
+    assert actual["rsi"] == expected["rsi"] == 100.0
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(float(value), rel=1e-9, abs=1e-9), key
+
+
+def test_bar_arrays_normalises_keys_and_drops_bad_rows():
+    quotes = [{"High": 2.0, "Low": 1.0, "Close": "1.5"}, {"high": 3.0, "low": None, "close": 2.5}]
+    quotes.append({"high": 4.0, "low": 3.0, "close": "n/a"})
+    quotes.append({"high": 5.0, "low": 4.0, "close": 4.5, "volume": 10})
+
+    high, low, close, opens = bar_arrays(quotes)
+    assert high.tolist() == [2.0, 5.0]
+    assert close.tolist() == [1.5, 4.5]
+    assert np.isnan(opens).all()
+    assert bar_arrays([{"close": 1.0, "high": 1.0}]) is None
+    assert compute_indicators(high, low, close) is None
+
+
+def test_state_advanced_in_chunks_matches_one_pass():
+    high, low, close = _random_bars(300, 6)
+    dates = [f"d{i:04d}" for i in range(300)]
+    state = IndicatorState()
+    for start, stop in ((0, 7), (7, 180), (180, 181), (181, 300)):
+        state.advance(high[start:stop], low[start:stop], close[start:stop], dates=dates[start:stop])
+        state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+    assert state.last_date == "d0299"
+    assert state.indicators() == compute_indicators(high, low, close)
+
+
+def test_state_keeps_only_the_volatility_window():
+    high, low, close = _random_bars(120, 7)
+    dates = [f"d{i:04d}" for i in range(120)]
+    state = IndicatorState().advance(high, low, close, dates=dates, returns_from="d0040")
+
+    assert state.return_dates[0] == "d0040" and len(state.returns) == 80
+    volatility = compute_indicators(high[39:], low[39:], close[39:])
+    for key in ("hv_current", "hv_long", "hv_high", "hv_low", "realized_drift"):
+        assert state.indicators()[key] == pytest.approx(volatility[key], rel=1e-12), key
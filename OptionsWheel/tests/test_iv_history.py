@@ -1,8 +1,17 @@
+import json
 import os
+import random
+from datetime import date, timedelta
 
 import pytest
 
-from options_wheel.iv_history import IVHistoryStore, extract_atm_iv
+from options_wheel.iv_history import (
+    ColumnarIVHistoryStore,
+    IVHistoryStore,
+    extract_atm_iv,
+    migrate_json,
+    open_iv_history_store,
+)
 
 
 def test_iv_history_store_rank_and_persistence():
@@ -46,3 +55,123 @@ def test_extract_atm_iv_prefers_expiry_nearest_target_dte():
     )
 
     assert atm_iv == 0.22
+
+
+def _json_history(tmp_path):
+    path = tmp_path / "iv_history.json"
+    series = {f"2026-01-{day:02d}": 0.20 + day * 0.01 for day in range(1, 31)}
+    path.write_text(
+        json.dumps(
+            {
+                "ABC|put": series,
+                "XYZ|call": {"2026-02-01": 0.5, "not-a-date": 0.4, "2026-02-02": 0.0},
+                "EMPTY|put": {},
+            }
+        )
+    )
+    return str(path)
+
+
+def test_columnar_store_migrates_and_matches_json_store(tmp_path):
+    json_path = _json_history(tmp_path)
+    columnar_path = str(tmp_path / "iv_history.ivh")
+    assert isinstance(open_iv_history_store(json_path, columnar_path), IVHistoryStore)
+
+    migrate_json(json_path, columnar_path)
+    json_store = IVHistoryStore(json_path, min_observations=3).load()
+    store = open_iv_history_store(json_path, columnar_path)
+    store.min_observations = 3
+
+    assert isinstance(store, ColumnarIVHistoryStore)
+    assert store.symbols() == ["ABC|put", "XYZ|call"]
+    assert store.series("XYZ|call") == {"2026-02-01": 0.5}
+    assert store.observation("ABC|put", "2026-01-10") == pytest.approx(0.30)
+    assert store.observation("ABC|put", "2026-02-10") is None
+    assert store.observations("ABC|put") == pytest.approx(json_store.observations("ABC|put"))
+    for current_iv in (0.1, 0.355, 0.9):
+        assert store.rank("ABC|put", current_iv) == pytest.approx(json_store.rank("ABC|put", current_iv))
+    assert store.rank("NEW|put", 0.3) == (None, None, 0)
+
+
+def test_columnar_store_loads_lazily_and_saves_untouched_series_verbatim(tmp_path):
+    columnar_path = str(tmp_path / "iv_history.ivh")
+    migrate_json(_json_history(tmp_path), columnar_path)
+
+    store = ColumnarIVHistoryStore(columnar_path, max_observations=25).load()
+    assert store._series == {}
+    store.record("XYZ|call", "2026-01-15", 0.45)
+    store.record("XYZ|call", "2026-02-01", 0.55)
+    store.record("NEW|put", "2026-02-03", 0.33)
+    store.record("NEW|put", "bad-date", 0.33)
+    assert set(store._series) == {"XYZ|call", "NEW|put"}
+    assert store.save() and not store.save()
+
+    reloaded = ColumnarIVHistoryStore(columnar_path).load()
+    assert reloaded.series("XYZ|call") == pytest.approx({"2026-01-15": 0.45, "2026-02-01": 0.55})
+    assert reloaded.series("NEW|put") == pytest.approx({"2026-02-03": 0.33})
+    # ABC was never read, so it was copied as is and then trimmed on reload.
+    abc = reloaded.series("ABC|put")
+    assert list(abc)[0] == "2026-01-06" and len(abc) == 25
+
+    # Records made after a save are kept by the next one.
+    store.record("ABC|put", "2026-02-05", 0.61)
+    assert store.save()
+    reloaded = ColumnarIVHistoryStore(columnar_path).load()
+    assert reloaded.observation("ABC|put", "2026-02-05") == pytest.approx(0.61)
+
+
+def test_columnar_store_ignores_missing_or_foreign_files(tmp_path):
+    missing = ColumnarIVHistoryStore(str(tmp_path / "missing.ivh")).load()
+    assert missing.symbols() == [] and missing.observations("ABC|put") == []
+
+    foreign = tmp_path / "foreign.ivh"
+    foreign.write_bytes(b"not a columnar file at all")
+    store = ColumnarIVHistoryStore(str(foreign)).load()
+    assert store.symbols() == []
+    store.record("ABC|put", "2026-01-01", 0.2)
+    assert store.save()
+    assert ColumnarIVHistoryStore(str(foreign)).load().symbols() == ["ABC|put"]
+
+
+def _brute_force_rank(series, current_iv, lookback, min_observations):
+    values = [iv for _, iv in sorted(series.items())[-lookback:]]
+    if len(values) < min_observations or max(values) <= min(values):
+        return None, None, len(values)
+    iv_rank = max(0.0, min(1.0, (current_iv - min(values)) / (max(values) - min(values))))
+    return iv_rank, sum(1 for v in values if v < current_iv) / len(values), len(values)
+
+
+@pytest.mark.parametrize("store_cls", [IVHistoryStore, ColumnarIVHistoryStore])
+def test_incremental_rank_windows_match_a_full_recount(tmp_path, store_cls):
+    rng = random.Random(17)
+    store = store_cls(str(tmp_path / "history"), lookback=20, min_observations=5).load()
+    reference = {}
+    start = date(2026, 1, 1)
+    latest = {}
+    for step in range(600):
+        symbol = f"S{rng.randrange(4)}"
+        day = latest.get(symbol, 0)
+        roll = rng.random()
+        if roll < 0.1:
+            day = rng.randrange(max(day, 1))  # out of order, or a correction
+        elif roll < 0.8:
+            day += 1
+        latest[symbol] = max(latest.get(symbol, 0), day)
+        # Quarter-point IVs are exact in float32, so both stores agree exactly.
+        atm_iv = rng.randrange(1, 40) / 4.0
+        date_str = (start + timedelta(days=day)).isoformat()
+        store.record(symbol, date_str, atm_iv)
+        reference.setdefault(symbol, {})[date_str] = atm_iv
+
+        current_iv = rng.randrange(1, 40) / 4.0 + rng.choice([0.0, 0.1])
+        expected = _brute_force_rank(reference[symbol], current_iv, 20, 5)
+        assert store.rank(symbol, current_iv) == pytest.approx(expected)
+        assert store.observations(symbol) == [iv for _, iv in sorted(reference[symbol].items())[-20:]]
+
+    current = {symbol: 4.1 for symbol in reference}
+    current["UNKNOWN"] = 4.1
+    current["S0"] = None
+    ranked = store.rank_many(current)
+    assert ranked["S0"] == (None, None, 0) and ranked["UNKNOWN"] == (None, None, 0)
+    for symbol in ("S1", "S2", "S3"):
+        assert ranked[symbol] == store.rank(symbol, 4.1)
@@ -1,18 +1,32 @@
 import math
 from datetime import datetime, timezone
 
+import numpy as np
 import pytest
 
 from options_wheel.metrics import (
     credit_risk_ratio,
+    d1_d2_array,
     expected_itm_payoff,
+    expected_itm_payoff_array,
     forecast_volatility,
+    implied_volatility,
+    implied_volatility_array,
     net_credit,
+    net_credit_array,
     option_delta,
+    option_delta_array,
+    option_delta_range,
+    option_price,
+    option_price_array,
     probability_of_profit,
+    probability_of_profit_array,
     probability_otm,
+    probability_otm_array,
     sigma_distance,
+    sigma_distance_array,
     simple_yields,
+    simple_yields_array,
     variance_risk_premium,
     years_to_expiration,
 )
@@ -33,6 +47,59 @@ def test_option_delta_and_probability_sanity():
     assert prob_otm is not None and 0.0 < prob_otm < 1.0
 
 
+@pytest.mark.parametrize("option_type", ["put", "call"])
+@pytest.mark.parametrize("strike", [60.0, 90.0, 99.0, 100.5, 110.0, 160.0])
+def test_option_delta_range_brackets_every_volatility_in_the_band(option_type, strike):
+    t_years = 40.0 / 365.0
+    sigmas = np.linspace(0.1, 1.2, 2001)
+    deltas = np.abs(option_delta_array(100.0, strike, sigmas, t_years, 0.045, 0.02, option_type))
+
+    low, high = option_delta_range(100.0, strike, 0.1, 1.2, t_years, 0.045, 0.02, option_type)
+
+    assert low <= deltas.min() + 1e-12 and deltas.max() <= high + 1e-12
+    assert low == pytest.approx(deltas.min(), abs=1e-6)
+    assert high == pytest.approx(deltas.max(), abs=1e-6)
+    assert option_delta_range(100.0, strike, 0.5, 0.2, t_years, 0.045, 0.0) is None
+
+
+@pytest.mark.parametrize("option_type", ["put", "call"])
+@pytest.mark.parametrize("newton_steps", [12, 0])
+def test_implied_volatility_recovers_the_pricing_volatility(option_type, newton_steps):
+    rng = np.random.default_rng(3)
+    strikes = rng.uniform(60.0, 150.0, 300)
+    t_years = rng.uniform(5.0, 400.0, 300) / 365.0
+    sigmas = rng.uniform(0.08, 1.8, 300)
+    prices = option_price_array(100.0, strikes, sigmas, t_years, 0.045, 0.01, option_type)
+
+    # newton_steps=0 leaves every contract to the Brent fallback.
+    solved = implied_volatility_array(
+        prices, 100.0, strikes, t_years, 0.045, 0.01, option_type, newton_steps=newton_steps
+    )
+
+    spot_pv, strike_pv = 100.0 * np.exp(-0.01 * t_years), strikes * np.exp(-0.045 * t_years)
+    intrinsic = np.maximum(spot_pv - strike_pv if option_type == "call" else strike_pv - spot_pv, 0)
+    priced = prices - intrinsic > 1e-4
+    assert np.isfinite(solved[priced]).all()
+    repriced = option_price_array(100.0, strikes, solved, t_years, 0.045, 0.01, option_type)
+    assert np.nanmax(np.abs(repriced - prices)) < 1e-6
+    # Volatility is only pinned down where the price depends on it.
+    sensitive = priced & (np.abs(np.log(strikes / 100.0)) < sigmas * np.sqrt(t_years))
+    np.testing.assert_allclose(solved[sensitive], sigmas[sensitive], atol=1e-5)
+
+
+def test_implied_volatility_rejects_prices_outside_the_arbitrage_bounds():
+    t_years = 30.0 / 365.0
+    put = option_price(100.0, 95.0, 0.3, t_years, 0.045, 0.0)
+    assert implied_volatility(put, 100.0, 95.0, t_years, 0.045, 0.0) == pytest.approx(0.3)
+    # Below intrinsic value, above the strike, beyond IV_UPPER, invalid inputs.
+    assert implied_volatility(4.0, 100.0, 105.0, t_years, 0.045, 0.0) is None
+    assert implied_volatility(96.0, 100.0, 95.0, t_years, 0.045, 0.0) is None
+    assert implied_volatility(60.0, 100.0, 95.0, t_years, 0.045, 0.0) is None
+    assert implied_volatility(None, 100.0, 95.0, t_years, 0.045, 0.0) is None
+    assert implied_volatility(put, 100.0, 95.0, 0.0, 0.045, 0.0) is None
+    assert implied_volatility_array([], 100.0, 95.0, t_years, 0.045, 0.0).shape == (0,)
+
+
 def test_expected_itm_payoff_matches_discounted_black_scholes_call_value():
     spot = 100.0
     strike = 105.0
@@ -90,3 +157,133 @@ def test_forecast_vol_vrp_and_sigma_distance():
     call_sigma = sigma_distance(100.0, 110.0, 0.25, t_years, option_type="call")
     assert put_sigma is not None and put_sigma > 0
     assert call_sigma is not None and call_sigma > 0
+
+
+# Straight-line scalar formulas the array API is checked against.
+def _cdf(x):
+    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+
+
+def _ref_d1_d2(spot, strike, sigma, t, drift):
+    if None in (spot, strike, sigma, t) or spot <= 0 or strike <= 0 or sigma <= 0 or t <= 0:
+        return None, None
+    sigma_sqrt_t = sigma * math.sqrt(t)
+    d2 = (math.log(spot / strike) + (drift - 0.5 * sigma**2) * t) / sigma_sqrt_t
+    return d2 + sigma_sqrt_t, d2
+
+
+def _ref_delta(spot, strike, sigma, t, r, q, option_type):
+    d1, _ = _ref_d1_d2(spot, strike, sigma, t, r - q)
+    if d1 is None:
+        return None
+    discount = math.exp(-q * t)
+    return discount * _cdf(d1) if option_type == "call" else -discount * _cdf(-d1)
+
+
+def _ref_payoff(spot, strike, sigma, t, drift, option_type):
+    d1, d2 = _ref_d1_d2(spot, strike, sigma, t, drift)
+    if d1 is None:
+        return None
+    forward = spot * math.exp(drift * t)
+    if option_type == "call":
+        return max(forward * _cdf(d1) - strike * _cdf(d2), 0.0)
+    return max(strike * _cdf(-d2) - forward * _cdf(-d1), 0.0)
+
+
+def _ref_pop(spot, strike, sigma, t, drift, net, option_type):
+    if net is None or strike is None or net <= 0:
+        return None
+    breakeven = strike + net if option_type == "call" else strike - net
+    if option_type != "call" and breakeven <= 0:
+        return 1.0
+    _, d2 = _ref_d1_d2(spot, breakeven, sigma, t, drift)
+    if d2 is None:
+        return None
+    return _cdf(-d2) if option_type == "call" else _cdf(d2)
+
+
+def _ref_sigma_distance(spot, strike, sigma, t, option_type):
+    if None in (spot, strike, sigma, t) or spot <= 0 or strike <= 0 or sigma <= 0 or t <= 0:
+        return None
+    z = math.log(strike / spot) / (sigma * math.sqrt(t))
+    return z if option_type == "call" else -z
+
+
+def _random_inputs(size=400, seed=7):
+    rng = np.random.default_rng(seed)
+    spot = rng.uniform(5.0, 500.0, size)
+    strike = spot * rng.uniform(0.5, 1.5, size)
+    sigma = rng.uniform(0.05, 1.5, size)
+    t = rng.uniform(1.0 / 365.0, 2.0, size)
+    net = rng.uniform(0.01, 20.0, size)
+    # Sprinkle invalid inputs, which must come back as NaN.
+    for column in (spot, strike, sigma, t, net):
+        column[rng.choice(size, size // 20, replace=False)] = rng.choice([0.0, -1.0, np.nan])
+    return spot, strike, sigma, t, net
+
+
+def _assert_matches(actual, expected):
+    assert actual.shape == (len(expected),)
+    for value, reference in zip(actual.tolist(), expected):
+        if reference is None:
+            assert math.isnan(value)
+        else:
+            assert value == pytest.approx(reference, rel=1e-12, abs=1e-12)
+
+
+def _rows(*columns):
+    return [[None if math.isnan(v) else v for v in row] for row in zip(*(c.tolist() for c in columns))]
+
+
+@pytest.mark.parametrize("option_type", ["put", "call"])
+def test_array_metrics_match_scalar_formulas(option_type):
+    spot, strike, sigma, t, net = _random_inputs()
+    rows = _rows(spot, strike, sigma, t, net)
+
+    _assert_matches(
+        option_delta_array(spot, strike, sigma, t, 0.045, 0.01, option_type=option_type),
+        [_ref_delta(*row[:4], 0.045, 0.01, option_type) for row in rows],
+    )
+    _assert_matches(
+        expected_itm_payoff_array(spot, strike, sigma, t, 0.03, option_type=option_type),
+        [_ref_payoff(*row[:4], 0.03, option_type) for row in rows],
+    )
+    _assert_matches(
+        probability_of_profit_array(spot, strike, sigma, t, 0.03, net, option_type=option_type),
+        [_ref_pop(*row[:4], 0.03, row[4], option_type) for row in rows],
+    )
+    _assert_matches(
+        sigma_distance_array(spot, strike, sigma, t, option_type=option_type),
+        [_ref_sigma_distance(*row[:4], option_type) for row in rows],
+    )
+    d2 = [_ref_d1_d2(*row[:4], 0.03)[1] for row in rows]
+    _assert_matches(
+        probability_otm_array(spot, strike, sigma, t, 0.03, option_type=option_type),
+        [None if d is None else _cdf(-d) if option_type == "call" else _cdf(d) for d in d2],
+    )
+
+
+def test_array_metrics_broadcast_and_scalar_wrappers_agree():
+    strikes = np.array([80.0, 90.0, 100.0, 0.0])
+    sigmas = np.array([[0.2], [0.4]])
+    d1, d2 = d1_d2_array(100.0, strikes, sigmas, 30.0 / 365.0, 0.0)
+    assert d1.shape == d2.shape == (2, 4)
+    assert np.isnan(d1[:, 3]).all()
+
+    deltas = option_delta_array(100.0, strikes, 0.3, 30.0 / 365.0, 0.045, 0.0)
+    for strike, delta in zip(strikes, deltas):
+        scalar = option_delta(100.0, strike, 0.3, 30.0 / 365.0, 0.045, 0.0)
+        assert (scalar is None and math.isnan(delta)) or scalar == delta
+    assert option_delta(100.0, 90.0, None, 30.0 / 365.0, 0.045, 0.0) is None
+
+    mid, net, spread_pct = net_credit_array(
+        np.array([1.0, 0.0, 1.2]), np.array([1.2, 1.0, 1.0]), commission_per_contract=0.65
+    )
+    assert mid[0] == pytest.approx(1.1) and np.isnan(mid[1:]).all()
+    assert net_credit(1.0, 1.2, commission_per_contract=0.65) == (mid[0], net[0], spread_pct[0])
+    assert net_credit(None, 1.2) == (None, None, None)
+
+    monthly, annualized = simple_yields_array(np.array([1.0, 0.0, 1.0]), 50.0, np.array([30, 30, 0]))
+    assert monthly[0] == pytest.approx(2.0) and np.isnan(monthly[1:]).all()
+    assert simple_yields(1.0, 50.0, 30) == (monthly[0], annualized[0])
+    assert simple_yields(0.0, 50.0, 30) == (None, None)
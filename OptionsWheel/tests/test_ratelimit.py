@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+
+from options_wheel.ratelimit import TokenBucketLimiter
+
+
+def test_aimd_adjusts_rate_within_bounds():
+    limiter = TokenBucketLimiter(rate=2.0, min_rate=0.2, max_rate=3.0, increase=0.5, decrease=0.5)
+    limiter.on_success()
+    assert limiter.rate == 2.5
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.rate == 3.0
+    limiter.on_rate_limited()
+    assert limiter.rate == 1.5
+    # Retry-After of 2 s caps the rate at 0.5/s.
+    limiter.on_rate_limited(retry_after=2.0)
+    assert limiter.rate == 0.5
+    for _ in range(5):
+        limiter.on_rate_limited()
+    assert limiter.rate == 0.2
+    assert limiter.snapshot()["rate_limited"] == 7
+
+
+def test_threads_are_paced_by_the_bucket():
+    limiter = TokenBucketLimiter(rate=50.0, max_rate=50.0)
+    stamps = []
+
+    def worker():
+        for _ in range(3):
+            limiter.acquire()
+            stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 12 requests, the first from the initial token, then one every 20 ms.
+    assert time.monotonic() - start >= 11 / 50.0 * 0.9
+    assert limiter.queue_depth == 0
+    snapshot = limiter.snapshot()
+    assert snapshot["acquired"] == 12
+    assert snapshot["max_queue_depth"] >= 2
+
+
+def test_pause_blocks_threads_and_coroutines_sharing_a_limiter():
+    limiter = TokenBucketLimiter(rate=100.0, max_rate=100.0)
+    limiter.acquire()
+    limiter.pause(0.15)
+    released = []
+
+    def thread_worker():
+        limiter.acquire()
+        released.append(("thread", time.monotonic()))
+
+    async def coroutine_worker():
+        await limiter.acquire_async()
+        released.append(("async", time.monotonic()))
+
+    start = time.monotonic()
+    thread = threading.Thread(target=thread_worker)
+    thread.start()
+    asyncio.run(asyncio.wait_for(coroutine_worker(), timeout=2.0))
+    thread.join(timeout=2.0)
+
+    assert sorted(kind for kind, _ in released) == ["async", "thread"]
+    assert all(stamp - start >= 0.14 for _, stamp in released)
+    assert limiter.queue_depth == 0
+
+
+def test_endpoints_sharing_a_host_bucket_stay_within_its_rate():
+    host = TokenBucketLimiter("host", rate=40.0, max_rate=40.0)
+    endpoints = [TokenBucketLimiter(name, parent=host, rate=100.0, max_rate=100.0) for name in "abc"]
+
+    def worker(limiter):
+        for _ in range(4):
+            limiter.acquire()
+
+    threads = [threading.Thread(target=worker, args=(limiter,)) for limiter in endpoints]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 12 requests at 40/s in total, not 100/s per endpoint.
+    assert time.monotonic() - start >= 11 / 40.0 * 0.9
+    assert host.snapshot()["acquired"] == 12
+
+    endpoints[0].on_rate_limited()
+    assert host.rate == 40.0 / 1.4 and endpoints[1].rate == 100.0
+    endpoints[1].pause(5.0)
+    assert host.snapshot()["cooldown_remaining"] == 0.0
@@ -0,0 +1,61 @@
+import json
+import pickle
+
+import pytest
+
+from options_wheel.outcomes import archive_scan
+from options_wheel.portfolio import build_portfolio
+from options_wheel.records import CONTRACT_FIELDS, ContractRecord, as_dicts
+
+
+def _record(**fields):
+    values = {"symbol": "AAA", "name": "AAA Corp", "price": 52.0, "strike": 50.0}
+    values.update(net_premium=1.0, monthly_yield_pct=2.0, status="PASS", expiration="2026-11-20")
+    values.update(fields)
+    return ContractRecord(**values)
+
+
+def test_record_reads_like_the_output_dict():
+    row = _record(score=90.0)
+    expected = row.to_dict()
+
+    assert list(expected) == [key for key, _ in CONTRACT_FIELDS]
+    assert expected["PricingSource"] == "mid" and expected["IVRank"] is None
+    assert row == expected and expected == row
+    assert row["Score"] == row.get("Score") == row.score == 90.0
+    assert "Failed Criterion" in row and "failed_criterion" not in row
+    assert row.get("Missing", "default") == "default"
+    with pytest.raises(KeyError):
+        row["Missing"]
+
+    row["Score"] = 91.0
+    assert row.score == 91.0
+    with pytest.raises(TypeError):
+        ContractRecord(unknown=1)
+
+
+def test_record_round_trips_and_converts_at_the_boundary():
+    row = _record(iv_rank=0.4)
+    assert pickle.loads(pickle.dumps(row)) == row
+    assert not hasattr(row, "__dict__")
+
+    loaded = json.loads(json.dumps(as_dicts([row, {"Symbol": "BBB"}])))
+    assert loaded == [row.to_dict(), {"Symbol": "BBB"}]
+
+
+def test_portfolio_and_archive_accept_records(tmp_path):
+    rows = [_record(score=90.0), _record(symbol="BBB", strike=45.0, score=80.0)]
+    config = {
+        "PORTFOLIO_MAX_POSITIONS": 5,
+        "PORTFOLIO_MAX_PER_SECTOR": 0,
+        "PORTFOLIO_COLLATERAL_BUDGET": 0.0,
+        "PORTFOLIO_MAX_PCT_PER_POSITION": 100.0,
+    }
+
+    portfolio = build_portfolio(rows, config, option_type="put", sector_map={})
+    assert portfolio == build_portfolio(as_dicts(rows), config, option_type="put", sector_map={})
+
+    path = archive_scan(rows, scan_date="2026-10-16", archive_dir=str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        archived = json.load(f)["candidates"]
+    assert [candidate["Symbol"] for candidate in archived] == ["AAA", "BBB"]
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from options_wheel import analysis, shards
+from options_wheel.iv_history import IVHistoryStore
+
+
+def _row(symbol, status, score):
+    return {"Symbol": symbol, "Status": status, "Score": score, "MonthlyYieldPct": 1.0}
+
+
+def test_shard_partition_is_stable_and_complete():
+    tickers = [f"T{i}" for i in range(200)]
+    parts = [shards.select_shard(tickers, index, 4) for index in range(4)]
+
+    assert sorted(t for part in parts for t in part) == sorted(tickers)
+    assert all(parts)
+    # Membership depends on the symbol only, not on the list it came from.
+    assert shards.select_shard(list(reversed(tickers)), 1, 4) == list(reversed(parts[1]))
+
+
+def test_merge_reproduces_single_process_ranking(tmp_path, monkeypatch):
+    tickers = ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+    rows_by_symbol = {
+        symbol: [_row(symbol, "PASS" if i % 2 else "NEAR", 5.0), _row(symbol, "PASS", 5.0)]
+        for i, symbol in enumerate(tickers)
+    }
+    # Single process: PASS rows then NEAR rows, each in candidate order.
+    single = [r for s in tickers for r in rows_by_symbol[s] if r["Status"] == "PASS"]
+    single += [r for s in tickers for r in rows_by_symbol[s] if r["Status"] != "PASS"]
+    order = {symbol: idx for idx, symbol in enumerate(tickers)}
+
+    for index in range(3):
+        owned = shards.select_shard(tickers, index, 3)
+        rows = [r for s in owned for r in rows_by_symbol[s] if r["Status"] == "PASS"]
+        rows += [r for s in owned for r in rows_by_symbol[s] if r["Status"] != "PASS"]
+        shards.write_shard(
+            shards.shard_path("put", index, 3, str(tmp_path)),
+            {
+                "scan_date": "2026-03-02",
+                "option_type": "put",
+                "shard_index": index,
+                "shard_count": 3,
+                "config_hash": "abc",
+                "screening_config": {"TARGET_MONTHLY_YIELD_PCT": 1.0},
+                "total_tickers": len(owned),
+                "candidates": len(owned),
+                "ticker_order": {s: order[s] for s in owned},
+                "iv_observations": {f"{s}|put": 0.3 for s in owned},
+                "rows": rows,
+            },
+        )
+
+    loaded = shards.load_shards("put", str(tmp_path))
+    assert shards.merge_rows(loaded) == single
+
+    store = IVHistoryStore(str(tmp_path / "iv.json"))
+    monkeypatch.setattr(analysis, "DATA_OUTPUT_DIR", str(tmp_path / "output"))
+    monkeypatch.setattr(analysis, "IV_HISTORY_STORE", store)
+    monkeypatch.setattr(analysis, "archive_scan", lambda rows, option_type, scan_date: "archive")
+    monkeypatch.setattr(analysis, "build_portfolio", lambda *a, **k: {"position_count": 0})
+    output_file = shards.merge("put", directory=str(tmp_path))
+
+    with open(output_file, encoding="utf-8") as f:
+        output = json.load(f)
+    assert output["results"] == analysis.rank_scan_results(single)
+    assert output["total_tickers_analyzed"] == len(tickers)
+    assert store.observation("AAA|put", "2026-03-02") == 0.3
+
+
+def test_merge_refuses_incomplete_or_mixed_shards():
+    payload = {"scan_date": "2026-03-02", "config_hash": "abc", "shard_count": 3}
+    with pytest.raises(ValueError, match="missing"):
+        shards.check_shards({0: payload, 2: payload})
+    assert shards.check_shards({0: payload, 2: payload}, allow_partial=True)[2] == 3
+    with pytest.raises(ValueError, match="different scans"):
+        shards.check_shards({0: payload, 1: dict(payload, config_hash="xyz")})
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from options_wheel import analysis
+from options_wheel.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=2.0)
+        return {"quotes": [1, 2, 3]}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "url", fetch) for _ in range(5)]
+        while flight.coalesced < 4:
+            threading.Event().wait(0.005)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(value == {"quotes": [1, 2, 3]} for value, _ in results)
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.in_flight() == 0
+
+
+def test_async_callers_join_a_thread_leader():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(timeout=2.0)
+        return "payload"
+
+    leader = threading.Thread(target=flight.do, args=("url", fetch))
+    leader.start()
+    started.wait(timeout=2.0)
+
+    async def follower():
+        async def never_called():
+            raise AssertionError("follower must not fetch")
+
+        return await flight.do_async("url", never_called)
+
+    async def main():
+        task = asyncio.ensure_future(follower())
+        await asyncio.sleep(0.01)
+        release.set()
+        return await task
+
+    assert asyncio.run(main()) == ("payload", True)
+    leader.join()
+
+
+def test_safe_get_counts_coalesced_requests(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_fetch(url, timeout, max_retries):
+        calls.append(url)
+        release.wait(timeout=2.0)
+        return {"ok": True}
+
+    monkeypatch.setattr(analysis, "_read_cache", lambda url: None)
+    monkeypatch.setattr(analysis, "_read_negative", lambda key: None)
+    monkeypatch.setattr(analysis, "_fetch", fake_fetch)
+    monkeypatch.setattr(analysis, "IN_FLIGHT", SingleFlight())
+    before = analysis._snapshot_error_stats()["coalesced_requests"]
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(analysis.safe_get, "https://api/history?ticker=AAA") for _ in range(3)]
+        while analysis.IN_FLIGHT.coalesced < 2:
+            threading.Event().wait(0.005)
+        release.set()
+        assert [future.result() for future in futures] == [{"ok": True}] * 3
+
+    assert len(calls) == 1
+    assert analysis._snapshot_error_stats()["coalesced_requests"] - before == 2
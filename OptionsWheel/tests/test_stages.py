@@ -0,0 +1,100 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from options_wheel import stages
+from options_wheel.stages import CpuTask, StageMetrics, run_staged
+
+
+def _square(value):
+    return value * value
+
+
+def _pipeline(name, fail=False):
+    fetched = yield f"url/{name}", 1, 1
+    squared = yield CpuTask(_square, len(fetched))
+    if fail:
+        raise ValueError(name)
+    doubled = yield CpuTask(_square, squared)
+    return fetched, squared, doubled
+
+
+def _fetch(url, timeout, max_retries):
+    return url.upper()
+
+
+def test_run_staged_drives_io_and_cpu_steps():
+    results = {}
+
+    def on_result(key, value, error):
+        results[key] = error if error is not None else value
+
+    jobs = [(name, _pipeline(name, fail=name == "bad")) for name in ("a", "bb", "bad")]
+    with ThreadPoolExecutor(max_workers=1) as cpu:
+        metrics = run_staged(jobs, _fetch, cpu, on_result, io_workers=2, queue_size=1)
+
+    assert results["a"] == ("URL/A", 25, 625)
+    assert results["bb"] == ("URL/BB", 36, 1296)
+    assert isinstance(results["bad"], ValueError)
+    stats = metrics.snapshot()
+    # Three segments per pipeline, less the one that raised.
+    assert stats["cpu_tasks"] == 5 and stats["io_segments"] == 8 - 1
+
+
+def test_results_can_queue_more_jobs():
+    seen = []
+
+    def on_result(key, value, error):
+        seen.append(key)
+        if key == "first":
+            return [("second", _pipeline("second"))]
+        return None
+
+    with ThreadPoolExecutor(max_workers=1) as cpu:
+        run_staged([("first", _pipeline("first"))], _fetch, cpu, on_result)
+    assert seen == ["first", "second"]
+
+
+def test_full_queue_holds_back_new_pipelines():
+    release = threading.Event()
+    depths = []
+
+    def slow_square(value):
+        release.wait(5)
+        return value
+
+    def pipeline():
+        yield "url", 1, 1
+        return (yield CpuTask(slow_square, 1))
+
+    class Recorder(StageMetrics):
+        def record_depth(self, depth, stalled=False):
+            depths.append(depth)
+            if stalled:
+                release.set()
+            super().record_depth(depth, stalled)
+
+    metrics = Recorder()
+    with ThreadPoolExecutor(max_workers=1) as cpu:
+        run_staged(
+            [(i, pipeline()) for i in range(10)],
+            _fetch,
+            cpu,
+            lambda *_: None,
+            io_workers=2,
+            queue_size=2,
+            metrics=metrics,
+        )
+
+    stats = metrics.snapshot()
+    assert stats["full_queue_stalls"] >= 1
+    assert max(depths) <= 2 + 2
+    assert "Bottleneck: CPU stage" in "\n".join(metrics.summary_lines())
+
+
+def test_timed_run_reports_worker_state(monkeypatch):
+    monkeypatch.setattr(stages, "_worker_collector", None)
+    value, seconds, collected = stages.timed_run(CpuTask(_square, 3))
+    assert (value, collected) == (9, None) and seconds >= 0
+
+    stages.set_worker_collector(lambda: {"bumped": 1})
+    assert stages.timed_run(CpuTask(_square, 2))[2] == {"bumped": 1}
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from options_wheel.metrics import forecast_volatility
+from options_wheel.volatility import WINDOWS, VolatilityProfile, realized_volatility
+
+
+def _random_bars(size, seed):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, size)))
+    opens = close * np.exp(rng.normal(0.0, 0.01, size))
+    high = np.maximum(close, opens) * np.exp(rng.uniform(0.0, 0.02, size))
+    low = np.minimum(close, opens) * np.exp(-rng.uniform(0.0, 0.02, size))
+    return opens, high, low, close
+
+
+@pytest.mark.parametrize("size,seed", [(30, 1), (75, 2), (253, 3), (600, 4)])
+def test_close_to_close_windows_match_pandas(size, seed):
+    _, _, _, close = _random_bars(size, seed)
+    returns = pd.Series(np.log(close[1:] / close[:-1]))
+    profile = realized_volatility(returns.to_numpy())
+    scale = math.sqrt(252)
+
+    for window in WINDOWS:
+        expected = returns[-window:].std() * scale
+        assert profile.close_to_close[window] == pytest.approx(expected, rel=1e-9), window
+    rolling = returns.rolling(20).std()
+    assert profile.hv_high == pytest.approx(rolling.max() * scale, rel=1e-9)
+    assert profile.hv_low == pytest.approx(rolling.min() * scale, rel=1e-9)
+    expected_long = returns[-60:].std() * scale if len(returns) >= 60 else returns[-20:].std() * scale
+    assert profile.hv_long == pytest.approx(expected_long, rel=1e-9)
+
+
+def test_range_estimators_use_the_last_twenty_bars():
+    opens, high, low, close = _random_bars(80, 5)
+    ranges, bodies = np.log(high / low), np.log(close / opens)
+    profile = realized_volatility(np.log(close[1:] / close[:-1]), ranges, bodies)
+
+    hl, co = ranges[-20:], bodies[-20:]
+    parkinson = math.sqrt(252 * np.mean(hl**2) / (4 * math.log(2)))
+    garman_klass = math.sqrt(252 * np.mean(0.5 * hl**2 - (2 * math.log(2) - 1) * co**2))
+    assert profile.parkinson == pytest.approx(parkinson, rel=1e-12)
+    assert profile.garman_klass == pytest.approx(garman_klass, rel=1e-12)
+
+    # Without opens only Parkinson is available.
+    no_opens = realized_volatility(np.log(close[1:] / close[:-1]), ranges)
+    assert no_opens.parkinson == profile.parkinson and no_opens.garman_klass is None
+
+
+def test_profile_handles_short_and_invalid_input():
+    empty = realized_volatility([])
+    assert empty.as_indicators() == {**dict.fromkeys(empty.as_indicators()), "hv_observations": 0}
+
+    profile = realized_volatility([0.01, math.nan, -0.02, math.inf, 0.015])
+    assert profile.observations == 3
+    assert profile.hv_high is None and profile.close_to_close[252] == profile.hv_short
+    assert profile.hv_short == pytest.approx(np.std([0.01, -0.02, 0.015], ddof=1) * math.sqrt(252))
+
+
+def test_profile_forecast_matches_metrics():
+    _, _, _, close = _random_bars(120, 6)
+    profile = realized_volatility(np.log(close[1:] / close[:-1]))
+    assert profile.forecast(0.4, hv_weight=0.3, iv_haircut=0.9) == forecast_volatility(
+        0.4, profile.hv_short, profile.hv_long, hv_weight=0.3, iv_haircut=0.9
+    )
+
+
+@pytest.mark.parametrize("size", [40, 300])
+def test_profile_round_trips_through_the_indicator_dict(size):
+    opens, high, low, close = _random_bars(size, 7)
+    profile = realized_volatility(
+        np.log(close[1:] / close[:-1]), np.log(high / low), np.log(close / opens)
+    )
+    indicators = profile.as_indicators()
+    assert indicators["hv_parkinson"] == profile.parkinson
+    assert indicators["hv_garman_klass"] == profile.garman_klass
+
+    rebuilt = VolatilityProfile.from_indicators(indicators)
+    assert rebuilt.as_indicators() == indicators
+    assert rebuilt.forecast(0.4) == profile.forecast(0.4)
+    assert VolatilityProfile.from_indicators(None).forecast(0.4) == forecast_volatility(0.4, None, None)
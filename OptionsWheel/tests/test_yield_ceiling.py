@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pytest
+
+from options_wheel import analysis
+from options_wheel.metrics import max_monthly_yield_for_delta, max_monthly_yield_for_delta_array
+from options_wheel.yield_ceiling import DEFAULT_AXES, YieldCeilingGrid, grid_key, grid_path
+
+
+@pytest.fixture(scope="module")
+def grid():
+    return YieldCeilingGrid.build()
+
+
+def test_array_ceiling_matches_scalar_formula():
+    rng = np.random.default_rng(3)
+    delta = rng.uniform(0.01, 0.6, 300)
+    dte = rng.uniform(1.0, 365.0, 300)
+    iv = rng.uniform(0.05, 2.5, 300)
+    rate = rng.uniform(-0.05, 0.25, 300)
+    delta[:3] = (0.0, 1.0, 0.3)
+    iv[2] = 0.0
+
+    actual = max_monthly_yield_for_delta_array(delta, dte, iv, rate)
+    for value, args in zip(actual, zip(delta, dte, iv, rate)):
+        expected = max_monthly_yield_for_delta(*map(float, args))
+        if expected is None:
+            assert np.isnan(value)
+        else:
+            assert value == pytest.approx(expected, rel=1e-12)
+
+
+def test_grid_interpolates_within_one_and_a_half_percent(grid):
+    rng = np.random.default_rng(5)
+    for _ in range(500):
+        args = (
+            rng.uniform(0.02, 0.55),
+            rng.uniform(5.0, 200.0),
+            rng.uniform(0.08, 2.0),
+            rng.uniform(-0.05, 0.25),
+        )
+        assert grid.ceiling(*args) == pytest.approx(max_monthly_yield_for_delta(*args), rel=0.015)
+
+
+def test_grid_nodes_are_exact_and_edges_clamp(grid):
+    (d0, _, _), (s0, s1, _), (v0, _, _), (r0, _, _) = DEFAULT_AXES
+    dte = (s0 + grid._steps[1] * 3) ** 2
+    exact = max_monthly_yield_for_delta(d0, dte, v0, r0)
+    assert grid.ceiling(d0, dte, v0, r0) == pytest.approx(exact, rel=1e-6)
+    assert grid.ceiling(0.001, dte, 0.01, -1.0) == grid.ceiling(d0, dte, v0, r0)
+    assert grid.ceiling(0.3, 10_000, 1.0) == pytest.approx(grid.ceiling(0.3, s1**2, 1.0))
+
+    for args in ((0.0, 30, 0.4), (1.0, 30, 0.4), (0.3, 0, 0.4), (0.3, 30, 0.0), (None, 30, 0.4)):
+        assert grid.ceiling(*args) is None
+
+
+def test_grid_is_cached_and_keyed_by_axes(tmp_path, monkeypatch):
+    built = YieldCeilingGrid.load_or_build(str(tmp_path))
+    assert os.path.exists(grid_path(str(tmp_path)))
+
+    def no_build(cls, axes=DEFAULT_AXES):
+        raise AssertionError("cached grid was rebuilt")
+
+    monkeypatch.setattr(YieldCeilingGrid, "build", classmethod(no_build))
+    loaded = YieldCeilingGrid.load_or_build(str(tmp_path))
+    assert loaded.axes == built.axes
+    assert np.array_equal(loaded.values, built.values)
+    assert loaded.ceiling(0.3, 30, 0.4) == built.ceiling(0.3, 30, 0.4)
+
+    smaller = ((0.01, 0.6, 10),) + DEFAULT_AXES[1:]
+    assert grid_key(smaller) != grid_key()
+    with pytest.raises(ValueError):
+        YieldCeilingGrid(built.values, smaller)
+
+
+def test_symbols_whose_iv_cannot_reach_the_target_are_counted(grid, monkeypatch):
+    monkeypatch.setattr(analysis, "YIELD_CEILING", grid)
+    monkeypatch.setattr(analysis, "MAX_ABS_DELTA", 0.30)
+    monkeypatch.setattr(analysis, "MIN_DTE", 7)
+    monkeypatch.setattr(analysis, "TARGET_MONTHLY_YIELD_PCT", 2.0)
+    before = analysis._snapshot_error_stats()["symbols_above_yield_ceiling"]
+
+    assert analysis._flag_yield_ceiling("LOW", 0.10)
+    assert not analysis._flag_yield_ceiling("HIGH", 0.90)
+    assert not analysis._flag_yield_ceiling("NONE", None)
+    assert analysis._snapshot_error_stats()["symbols_above_yield_ceiling"] - before == 1